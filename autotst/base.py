@@ -37,11 +37,14 @@ import os.path
 import logging
 import codecs
 import numpy
-from copy import deepcopy
+from collections import Counter
+import scipy.sparse
+import scipy.stats
+from scipy.sparse.linalg import lsqr
+from copy import copy
 from numpy import array
-from cclib.io import ccread
-from ase.io.gaussian import read_gaussian_out
-from rmgpy.data.base import Database, Entry, makeLogicNode, LogicNode, DatabaseError
+from autotst.calculators.log_parser import read_gaussian_log, HARTREE_TO_EV
+from rmgpy.data.base import Database, Entry, makeLogicNode, LogicNode, DatabaseError, getAllCombinations
 
 from rmgpy.quantity import Quantity, constants
 from rmgpy.reaction import Reaction, ReactionError
@@ -51,6 +54,7 @@ from rmgpy.species import Species
 from rmgpy.data.kinetics.common import KineticsError, saveEntry
 
 from rmgpy.molecule import Molecule, Atom, getElement
+from rmgpy.molecule.atomtype import atomTypes
 from rmgpy.species import Species, TransitionState
 from rmgpy.reaction import Reaction
 from rmgpy.kinetics import Arrhenius, Eckart
@@ -60,6 +64,60 @@ from rmgpy.cantherm.kinetics import KineticsJob
 
 ################################################################################
 
+# The elements whose atom types a group atom can be narrowed down to
+GROUP_ELEMENTS = [element for element in ['H', 'He', 'C', 'N', 'O', 'Ne', 'Si', 'S', 'Cl', 'Ar']
+                  if element in atomTypes]
+
+
+def getGroupAtomElement(groupAtom):
+    """
+    Returns the symbol of the element that every atom type of `groupAtom` is a
+    case of, or None if it could be more than one element (eg. `R!H`).
+    """
+    elements = set()
+    for atomType in groupAtom.atomType:
+        for element in GROUP_ELEMENTS:
+            if atomType.isSpecificCaseOf(atomTypes[element]):
+                elements.add(element)
+                break
+        else:
+            return None
+    if len(elements) == 1:
+        return elements.pop()
+    return None
+
+
+def solveSparseLeastSquares(A, b, x0=None):
+    """
+    Solve the least squares problem Ax=b for a sparse `A` and every column of
+    `b` with LSQR, which only works with the nonzeros of `A`. Starting from
+    zero, LSQR finds the minimum norm solution, like `numpy.linalg.lstsq`.
+
+    If a previous solution `x0` is given, LSQR only solves for the correction
+    to it (from the residuals b - A x0), which takes far fewer iterations when
+    `x0` is close, eg. after adding a few rows to `A`.
+
+    A warning is logged if LSQR stops at its iteration limit or finds `A` too
+    ill-conditioned, since the solution may then be inaccurate.
+    """
+    if x0 is None:
+        x = numpy.zeros((A.shape[1], b.shape[1]))
+    else:
+        x = numpy.array(x0, numpy.float64)
+        b = b - A.dot(x)
+    for t in range(b.shape[1]):
+        result = lsqr(A, b[:, t], atol=1e-10, btol=1e-10,
+                      iter_lim=10 * A.shape[1])
+        istop, itn = result[1], result[2]
+        if istop == 7:
+            logging.warning("LSQR reached its iteration limit ({0}) before converging "
+                            "for column {1} of b".format(itn, t))
+        elif istop in (3, 6):
+            logging.warning("LSQR stopped after {0} iterations for column {1} of b "
+                            "because A is too ill-conditioned (istop={2})".format(itn, t, istop))
+        x[:, t] += result[0]
+    return x
+
 
 class QMData():
     """
@@ -76,6 +134,7 @@ class QMData():
                  rotationalConstants=([], "cm^-1"),
                  atomCoords=([[]], "angstrom"),
                  frequencies=([], "cm^-1"),
+                 zeroPointEnergy=(0, "eV/molecule"),
                  source=None,
                  method=None,
                  label=""):
@@ -89,6 +148,7 @@ class QMData():
         self.rotationalConstants = rotationalConstants
         self.atomCoords = atomCoords
         self.frequencies = frequencies
+        self.zeroPointEnergy = zeroPointEnergy
         self.source = source
         self.method = method
         self.label = label
@@ -113,56 +173,106 @@ class QMData():
             self.atomCoords).replace("\n", "").replace(" ", ""))
         string += "frequencies={0}, ".format("{0}".format(
             self.frequencies).replace("\n", "").replace(" ", ""))
+        string += "zeroPointEnergy={0!r}, ".format(self.zeroPointEnergy)
         string += "source={0!r}, ".format(self.source)
         string = string[:-2] + ')'
         return string
 
     def get_qmdata(self, file_path=None):
-        "A helper function to fill in the qmdata using CCLib"
+        "A helper function to fill in the qmdata from a (memoized) parse of the log file"
 
-        parser = ccread(file_path)
-        atoms = read_gaussian_out(file_path)
+        parser = read_gaussian_log(file_path)
 
         self.groundStateDegeneracy = parser.mult
-        self.atomNumbers = atoms.numbers
-        self.atomCoords = (atoms.arrays["positions"], "angstrom")
+        self.atomNumbers = parser.atomnos
+        self.atomCoords = (parser.atomcoords[-1], "angstrom")
         self.stericEnergy = None  # Need to fix this
         self.molecularMass = (parser.atommasses.sum(), "amu")
-        self.energy = (atoms.get_potential_energy(), "eV/molecule")
+        self.energy = (parser.scfenergies[-1], "eV/molecule")
         self.atomicNumbers = parser.atomnos
-        self.rotationalConstants = ([], "cm^-1")  # Need to fix this
+        if len(parser.rotconsts):
+            # GHz to cm^-1
+            self.rotationalConstants = (
+                parser.rotconsts[-1] * 1e9 / constants.c / 100, "cm^-1")
+        else:
+            self.rotationalConstants = ([], "cm^-1")
         self.frequencies = (parser.vibfreqs, "cm^-1")
+        if parser.zpve is not None:
+            self.zeroPointEnergy = (parser.zpve * HARTREE_TO_EV, "eV/molecule")
         self.source = None
-        self.method = parser.metadata["functional"]
+        self.method = parser.functional
+
+        return self
+
+
+# The distances that DistanceData holds, in the order they are stored in
+DISTANCE_KEYS = ['d12', 'd13', 'd23']
+
+
+def getDistanceArray(values):
+    """
+    Returns the `values` dictionary (eg. of distances) as an array ordered like
+    DISTANCE_KEYS, or an empty array if `values` is empty.
+    """
+    if not values:
+        return numpy.zeros(0)
+    assert sorted(values.keys()) == DISTANCE_KEYS, "expected the keys {0}, but got {1!r}".format(
+        DISTANCE_KEYS, values)
+    return numpy.array([values[key] for key in DISTANCE_KEYS], numpy.float64)
 
 
-class DistanceData():
+class DistanceData(object):
     """
     A class for storing distance matrix data, for geometry estimation
+
+    The distances and uncertainties are stored as arrays ordered like
+    DISTANCE_KEYS (`distanceArray` and `uncertaintyArray`), so adding and
+    copying them is cheap. `distances` and `uncertainties` return them as
+    dictionaries.
     """
 
-    def __init__(self, distances={}, uncertainties=None, method=None):
+    def __init__(self, distances={}, uncertainties=None, method=None, comment=u''):
+        assert isinstance(distances, dict), "distances should be a dict"
         self.distances = distances
         self.uncertainties = uncertainties
         self.method = method
-        self.comment = u''
-        assert isinstance(distances, dict), "distances should be a dict"
+        self.comment = comment
         if method:
             assert isinstance(method, str), "method should be a string"
 
+    @property
+    def distances(self):
+        return dict(zip(DISTANCE_KEYS, self.distanceArray.tolist()))
+
+    @distances.setter
+    def distances(self, distances):
+        self.distanceArray = getDistanceArray(distances)
+
+    @property
+    def uncertainties(self):
+        if self.uncertaintyArray is None:
+            return None
+        return dict(zip(DISTANCE_KEYS, self.uncertaintyArray.tolist()))
+
+    @uncertainties.setter
+    def uncertainties(self, uncertainties):
+        if uncertainties is None:
+            self.uncertaintyArray = None
+        else:
+            self.uncertaintyArray = getDistanceArray(uncertainties)
+
     def __repr__(self):
         strings = ["DistanceData("]
 
         strings.append("distances={")
-        for key in sorted(self.distances.keys()):
-            strings.append("{0!r}: {1:.6f},".format(key, self.distances[key]))
+        for key, value in zip(DISTANCE_KEYS, self.distanceArray):
+            strings.append("{0!r}: {1:.6f},".format(key, value))
         strings.append("}")
 
-        if self.uncertainties is not None:
+        if self.uncertaintyArray is not None:
             strings.append(", uncertainties={")
-            for key in sorted(self.uncertainties.keys()):
-                strings.append("{0!r}: {1:.6f},".format(
-                    key, self.uncertainties[key]))
+            for key, value in zip(DISTANCE_KEYS, self.uncertaintyArray):
+                strings.append("{0!r}: {1:.6f},".format(key, value))
             strings.append("}")
 
         if self.method:
@@ -174,18 +284,23 @@ class DistanceData():
 
     def add(self, other):
         """Adds the `other` distances to these."""
-        assert len(self.distances) == len(
-            other.distances), "self and other must have the same size dictionary of distances, but self={0!r} and other={1!r}".format(self, other)
-        for key, value in other.distances.iteritems():
-            self.distances[key] += value
-        if self.uncertainties and other.uncertainties:
-            for key, value in other.uncertainties.iteritems():
-                self.uncertainties[key] += value
+        assert self.distanceArray.size == other.distanceArray.size, "self and other must have the same size dictionary of distances, but self={0!r} and other={1!r}".format(self, other)
+        self.distanceArray += other.distanceArray
+        if self.uncertaintyArray is not None and self.uncertaintyArray.size and \
+                other.uncertaintyArray is not None and other.uncertaintyArray.size:
+            self.uncertaintyArray += other.uncertaintyArray
         else:
-            self.uncertainties = None
+            self.uncertaintyArray = None
 
     def __copy__(self):
-        return DistanceData(distances=self.distances.copy(), uncertainties=self.uncertainties.copy(), method=self.method)
+        other = DistanceData(method=self.method, comment=self.comment)
+        other.distanceArray = self.distanceArray.copy()
+        if self.uncertaintyArray is not None:
+            other.uncertaintyArray = self.uncertaintyArray.copy()
+        return other
+
+    def __deepcopy__(self, memo):
+        return self.__copy__()
 
 
 class TransitionStates(Database):
@@ -236,6 +351,61 @@ class TransitionStates(Database):
         # Should check depository first, but for now just go straight to group additive estimate:
         return self.groups.estimateDistancesUsingGroupAdditivity(reaction)
 
+    def estimateDistancesBatch(self, reactions):
+        """
+        Estimate the distances of every reaction in `reactions` at once, using
+        group additivity like `estimateDistances`.
+
+        Each reaction's contributing groups (the top node and the nearest
+        fitted node for each group in its template) become a row of a sparse
+        matrix, and the estimates are found with one matrix product with the
+        group values.
+
+        :returns:
+        distances: (array) The estimated distances, one row per reaction, in
+        the order of DISTANCE_KEYS
+        uncertainties: (array) The uncertainties of the distances, NaN where
+        one of the contributing groups has none
+        """
+        groups = self.groups
+        columns = {groups.top[0]: 0}
+        contributors = [groups.top[0]]
+        rows = []
+        rowColumns = []
+        for index, reaction in enumerate(reactions):
+            template = reaction.template
+            if not template:
+                template = [entry.label for entry in groups.getReactionTemplate(reaction)]
+            rows.append(index)
+            rowColumns.append(0)
+            for label in template:
+                entry = groups.getContributingEntry(label)
+                if entry is None:
+                    continue
+                if entry not in columns:
+                    columns[entry] = len(contributors)
+                    contributors.append(entry)
+                rows.append(index)
+                rowColumns.append(columns[entry])
+
+        M = scipy.sparse.csr_matrix((numpy.ones(len(rows)), (rows, rowColumns)),
+                                    shape=(len(reactions), len(contributors)))
+
+        values = numpy.zeros((len(contributors), len(DISTANCE_KEYS)))
+        uncertainties = numpy.zeros((len(contributors), len(DISTANCE_KEYS)))
+        missing = numpy.zeros(len(contributors))
+        for column, entry in enumerate(contributors):
+            values[column] = entry.data.distanceArray
+            if entry.data.uncertaintyArray is not None and entry.data.uncertaintyArray.size:
+                uncertainties[column] = entry.data.uncertaintyArray
+            else:
+                missing[column] = 1
+
+        distances = M.dot(values)
+        uncertainties = M.dot(uncertainties)
+        uncertainties[M.dot(missing) > 0] = numpy.nan
+        return distances, uncertainties
+
     def saveTransitionStateGroups(self, path, entryName='entry'):
         """
         Save the current database to the file at location `path` on disk. The
@@ -594,10 +764,116 @@ class TSGroups(Database):
                  ):
         Database.__init__(self, entries, top, label, name, shortDesc, longDesc)
         self.numReactants = 0
+        self.ancestorIndex = {}
+        self.nodeFilters = {}
+        self.distanceCache = {}
 
     def __repr__(self):
         return '<TSGroups "{0}">'.format(self.label)
 
+    def load(self, path, local_context=None, global_context=None):
+        Database.load(self, path, local_context, global_context)
+        self.indexAncestors()
+        self.compileNodeFilters()
+
+    def indexAncestors(self):
+        """
+        Walk up the tree once from every entry and store its ancestors, so that
+        `ancestors` is a dictionary lookup. Call this again if the tree changes.
+        """
+        self.ancestorIndex = {}
+        for entry in self.entries.itervalues():
+            self.ancestors(entry)
+
+    def ancestors(self, node):
+        """
+        Returns the ancestors of `node`, from its parent to the top of the tree.
+        The lists are memoized in `ancestorIndex` and shared, so don't modify them.
+        """
+        try:
+            return self.ancestorIndex[node]
+        except KeyError:
+            pass
+        if node.parent is None:
+            ancestors = []
+        else:
+            ancestors = [node.parent] + self.ancestors(node.parent)
+        self.ancestorIndex[node] = ancestors
+        return ancestors
+
+    def compileNodeFilters(self):
+        """
+        Work out the prefilter of every entry up front (see `getNodeFilter`).
+        Call this again if the groups change.
+        """
+        self.nodeFilters = {}
+        for entry in self.entries.itervalues():
+            self.getNodeFilter(entry)
+
+    def getNodeFilter(self, node):
+        """
+        Returns the cheap properties that any structure matching `node` must
+        have, as a tuple of the number of atoms, the count of each element, the
+        number of radical electrons, and the (degree, allowed radical electrons)
+        of each labeled atom. Returns None for logic nodes, which aren't filtered.
+        """
+        try:
+            return self.nodeFilters[node]
+        except KeyError:
+            pass
+        group = node.item
+        if isinstance(group, LogicNode):
+            nodeFilter = None
+        else:
+            elementCounts = Counter()
+            radicals = 0
+            for atom in group.atoms:
+                element = getGroupAtomElement(atom)
+                if element:
+                    elementCounts[element] += 1
+                if atom.radicalElectrons:
+                    radicals += min(atom.radicalElectrons)
+            labeledAtoms = {}
+            for label, atom in group.getLabeledAtoms().iteritems():
+                if isinstance(atom, list):
+                    continue
+                labeledAtoms[label] = (len(atom.bonds), atom.radicalElectrons)
+            nodeFilter = (len(group.atoms), elementCounts, radicals, labeledAtoms)
+        self.nodeFilters[node] = nodeFilter
+        return nodeFilter
+
+    def matchNodeToStructure(self, node, structure, atoms, strict=False):
+        """
+        Like `Database.matchNodeToStructure`, but rules out nodes whose atom
+        counts, element counts, radical count or labeled atom environments
+        can't fit in `structure` before trying the subgraph isomorphism.
+        """
+        if isinstance(node, str):
+            node = self.entries[node]
+        nodeFilter = self.getNodeFilter(node)
+        if nodeFilter is not None and not getattr(structure, 'implicitHydrogens', False):
+            atomCount, elementCounts, radicals, labeledAtoms = nodeFilter
+            if atomCount > len(structure.atoms):
+                return False
+            if elementCounts:
+                structureCounts = Counter(
+                    [atom.element.symbol for atom in structure.atoms])
+                for element, count in elementCounts.iteritems():
+                    if structureCounts[element] < count:
+                        return False
+            if radicals > sum([atom.radicalElectrons for atom in structure.atoms]):
+                return False
+            structureLabels = structure.getLabeledAtoms()
+            for label, (degree, radicalElectrons) in labeledAtoms.iteritems():
+                atom = structureLabels.get(label)
+                if atom is None or isinstance(atom, list):
+                    continue
+                if len(atom.bonds) < degree:
+                    return False
+                if radicalElectrons and atom.radicalElectrons not in radicalElectrons:
+                    return False
+        return Database.matchNodeToStructure(self, node, structure, atoms, strict)
+
     def loadEntry(self, index, label, group, distances, reference=None, referenceType='', shortDesc='', longDesc=''):
         if group[0:3].upper() == 'OR{' or group[0:4].upper() == 'AND{' or group[0:7].upper() == 'NOT OR{' or group[0:8].upper() == 'NOT AND{':
             item = makeLogicNode(group)
@@ -699,28 +975,63 @@ class TSGroups(Database):
 
         return template
 
+    def getContributingEntry(self, label):
+        """
+        Returns the entry whose distances are added to the estimate for the
+        template node `label`: the node itself or its nearest ancestor with
+        distances, or None if there is no such node below the top of the tree.
+        """
+        entry = self.entries[label]
+        for entry in [entry] + self.ancestors(entry):
+            if entry in self.top:
+                return None
+            if entry.data.distanceArray.size:
+                return entry
+        return None
+
+    def clearDistanceCache(self):
+        """
+        Forget the memoized distance estimates. This must be called whenever
+        the group values change, eg. after they are refitted.
+        """
+        self.distanceCache = {}
+
     def estimateDistancesUsingGroupAdditivity(self, reaction):
         """
         Determine the appropriate transition state distances for a reaction
         with the given `template` using group additivity.
+
+        The estimate only depends on the template, so it is memoized by
+        template and a copy of it is returned.
+        """
+        key = tuple(reaction.template)
+        if key not in self.distanceCache:
+            self.distanceCache[key] = self.estimateDistancesForTemplate(
+                reaction.template)
+        return copy(self.distanceCache[key])
+
+    def estimateDistancesForTemplate(self, template):
+        """
+        Estimate the transition state distances for a reaction with the given
+        `template` (a list of node labels) using group additivity.
         """
-        template = reaction.template
         referenceDistances = self.top[0].data  # or something like that
 
         # Start with the generic distances of the top-level nodes
         # Make a copy so we don't modify the original
-        tsDistances = deepcopy(referenceDistances)
+        tsDistances = copy(referenceDistances)
 
         # Now add in more specific corrections if possible
         for node in template:
             #print node
             entry = self.entries[node]
             comment_line = "Matched node "
-            while not entry.data.distances and entry not in self.top:
+            for entry in [entry] + self.ancestors(entry):
                 # Keep climbing tree until you find a (non-top) node with distances.
+                if entry.data.distanceArray.size or entry in self.top:
+                    break
                 comment_line += "{0} >> ".format(entry.label)
-                entry = entry.parent
-            if entry.data.distances and entry not in self.top:
+            if entry.data.distanceArray.size and entry not in self.top:
                 tsDistances.add(entry.data)
                 comment_line += "{0} ({1})".format(entry.label,
                                                    entry.longDesc.split('\n')[0])
@@ -739,6 +1050,9 @@ class TSGroups(Database):
         changed significantly since the last time they were fitted, or ``False``
         otherwise.
         """
+        # The group values are about to change
+        self.clearDistanceCache()
+
         # keep track of previous values so we can detect if they change
         old_entries = dict()
         for label, entry in self.entries.items():
@@ -776,14 +1090,25 @@ class TSGroups(Database):
                 groupCounts[entry] = []
                 groupComments[entry] = set()
 
-            # Generate least-squares matrix and vector
-            A = []
+            # Generate a sparse least-squares matrix and vector
+            groupColumns = {group: i for i, group in enumerate(groupList)}
+            labelColumns = {group.label: i for i, group in enumerate(groupList)}
+            familyColumn = len(groupList)
+            rows = []
+            columns = []
             b = []
 
+            # Sparse matrices with one row per training reaction, for the residuals:
+            # the groups in each template, and those groups with their ancestors
+            templateRows = []
+            templateColumns = []
+            ancestorRows = []
+            ancestorColumns = []
+
             # ['d12', 'd13', 'd23']
             distance_keys = sorted(trainingSet[0][1].distances.keys())
             distance_data = []
-            for template, distanceData in trainingSet:
+            for index, (template, distanceData) in enumerate(trainingSet):
                 d = [distanceData.distances[key] for key in distance_keys]
                 distance_data.append(d)
 
@@ -794,79 +1119,78 @@ class TSGroups(Database):
                     # Groups from the group.py tree
                     groups.extend(self.ancestors(group))
                     combinations.append(groups)
+
+                    if group in groupColumns:
+                        templateRows.append(index)
+                        templateColumns.append(groupColumns[group])
+                    for g in groups:
+                        if g in groupColumns:
+                            ancestorRows.append(index)
+                            ancestorColumns.append(groupColumns[g])
+                templateRows.append(index)
+                templateColumns.append(familyColumn)
+                ancestorRows.append(index)
+                ancestorColumns.append(familyColumn)
+
                 combinations = getAllCombinations(combinations)
                 # Add a row to the matrix for each combination
                 for groups in combinations:
-                    Arow = [1 if group in groups else 0 for group in groupList]
-                    Arow.append(1)
-                    brow = d
-                    A.append(Arow)
-                    b.append(brow)
+                    rowColumns = set([groupColumns[group]
+                                      for group in groups if group in groupColumns])
+                    rowColumns.add(familyColumn)
+                    rows.extend([len(b)] * len(rowColumns))
+                    columns.extend(rowColumns)
+                    b.append(d)
 
                     for group in groups:
                         if isinstance(group, str):
                             group = self.entries[group]
                         groupComments[group].add("{0!s}".format(template))
 
-            if len(A) == 0:
+            if len(b) == 0:
                 logging.warning(
                     'Unable to fit kinetics groups for family "{0}"; no valid data found.'.format(self.label))
                 return
-            A = numpy.array(A)
+            A = scipy.sparse.csr_matrix((numpy.ones(len(rows)), (rows, columns)),
+                                        shape=(len(b), len(groupList) + 1))
             b = numpy.array(b)
             distance_data = numpy.array(distance_data)
 
-            x, residues, rank, s = numpy.linalg.lstsq(A, b)
-
-            for t, distance_key in enumerate(distance_keys):
-
-                # Determine error in each group
-                stdev = numpy.zeros(len(groupList)+1, numpy.float64)
-                count = numpy.zeros(len(groupList)+1, numpy.int)
-
-                for index in range(len(trainingSet)):
-                    template, distances = trainingSet[index]
-                    d = numpy.float64(distance_data[index, t])
-                    dm = x[-1, t] + sum([x[groupList.index(group), t]
-                                         for group in template if group in groupList])
-                    variance = (dm - d)**2
-                    for group in template:
-                        groups = [group]
-                        groups.extend(self.ancestors(group))
-                        for g in groups:
-                            if g.label not in [top.label for top in self.top]:
-                                ind = groupList.index(g)
-                                stdev[ind] += variance
-                                count[ind] += 1
-                    stdev[-1] += variance
-                    count[-1] += 1
-
-                import scipy.stats
-                ci = numpy.zeros(len(count))
-                for i in range(len(count)):
-                    if count[i] > 1:
-                        stdev[i] = numpy.sqrt(stdev[i] / (count[i] - 1))
-                        ci[i] = scipy.stats.t.ppf(
-                            0.975, count[i] - 1) * stdev[i]
-                    else:
-                        stdev[i] = None
-                        ci[i] = None
-                # Update dictionaries of fitted group values and uncertainties
-                for entry in groupEntries:
-                    if entry == self.top[0]:
-                        groupValues[entry].append(x[-1, t])
-                        groupUncertainties[entry].append(ci[-1])
-                        groupCounts[entry].append(count[-1])
-                    elif entry.label in [group.label for group in groupList]:
-                        index = [group.label for group in groupList].index(
-                            entry.label)
-                        groupValues[entry].append(x[index, t])
-                        groupUncertainties[entry].append(ci[index])
-                        groupCounts[entry].append(count[index])
-                    else:
-                        groupValues[entry] = None
-                        groupUncertainties[entry] = None
-                        groupCounts[entry] = None
+            x = solveSparseLeastSquares(A, b)
+
+            # Determine error in each group from the residuals of the training reactions
+            T = scipy.sparse.csr_matrix((numpy.ones(len(templateRows)), (templateRows, templateColumns)),
+                                        shape=(len(trainingSet), len(groupList) + 1))
+            G = scipy.sparse.csr_matrix((numpy.ones(len(ancestorRows)), (ancestorRows, ancestorColumns)),
+                                        shape=(len(trainingSet), len(groupList) + 1))
+            residuals = T.dot(x) - distance_data
+            variance = G.T.dot(residuals**2)
+            count = numpy.rint(G.T.dot(numpy.ones(len(trainingSet)))).astype(numpy.int)
+
+            stdev = numpy.zeros(variance.shape)
+            ci = numpy.zeros(variance.shape)
+            stdev[:] = numpy.nan
+            ci[:] = numpy.nan
+            fitted = count > 1
+            stdev[fitted] = numpy.sqrt(
+                variance[fitted] / (count[fitted] - 1)[:, numpy.newaxis])
+            ci[fitted] = scipy.stats.t.ppf(
+                0.975, count[fitted] - 1)[:, numpy.newaxis] * stdev[fitted]
+
+            # Update dictionaries of fitted group values and uncertainties
+            for entry in groupEntries:
+                if entry == self.top[0]:
+                    index = -1
+                elif entry.label in labelColumns:
+                    index = labelColumns[entry.label]
+                else:
+                    groupValues[entry] = None
+                    groupUncertainties[entry] = None
+                    groupCounts[entry] = None
+                    continue
+                groupValues[entry] = list(x[index])
+                groupUncertainties[entry] = list(ci[index])
+                groupCounts[entry] = [count[index]] * len(distance_keys)
 
             # Store the fitted group values and uncertainties on the associated entries
             for entry in groupEntries:
@@ -880,7 +1204,7 @@ class TSGroups(Database):
                     # should be entry.*
                     shortDesc = "Fitted to {0} distances.\n".format(
                         groupCounts[entry][0])
-                    longDesc = "\n".join(groupComments[entry.label])
+                    longDesc = "\n".join(groupComments[entry])
                     distances_dict = {key: distance for key, distance in zip(
                         distance_keys, groupValues[entry])}
                     uncertainties_dict = {key: distance for key, distance in zip(
@@ -0,0 +1,276 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+################################################################################
+#
+#   AutoTST - Automated Transition State Theory
+#
+#   Copyright (c) 2015-2018 Prof. Richard H. West (r.west@northeastern.edu)
+#
+#   Permission is hereby granted, free of charge, to any person obtaining a
+#   copy of this software and associated documentation files (the 'Software'),
+#   to deal in the Software without restriction, including without limitation
+#   the rights to use, copy, modify, merge, publish, distribute, sublicense,
+#   and/or sell copies of the Software, and to permit persons to whom the
+#   Software is furnished to do so, subject to the following conditions:
+#
+#   The above copyright notice and this permission notice shall be included in
+#   all copies or substantial portions of the Software.
+#
+#   THE SOFTWARE IS PROVIDED 'AS IS', WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#   IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#   FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#   AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#   LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+#   FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+#   DEALINGS IN THE SOFTWARE.
+#
+################################################################################
+
+
+import os
+import unittest
+import numpy
+from copy import copy, deepcopy
+import scipy.sparse
+
+from rmgpy.data.base import Database, Entry
+from rmgpy.data.kinetics.family import TemplateReaction
+from rmgpy.molecule import Molecule
+from autotst import settings
+from autotst.base import solveSparseLeastSquares, DistanceData, TSGroups, TransitionStates
+
+DATABASE_DIRECTORY = os.path.join(
+    os.path.dirname(settings["autotst_path"]), "database")
+
+# Labeled reactants of H_Abstraction: X_H (*1 and *2) and Y_rad (*3)
+ADJACENCY_LISTS = [
+    """
+    1 *1 C u0 p0 c0 {2,S} {3,S} {4,S} {5,S}
+    2 *2 H u0 p0 c0 {1,S}
+    3    H u0 p0 c0 {1,S}
+    4    H u0 p0 c0 {1,S}
+    5    H u0 p0 c0 {1,S}
+    """,
+    """
+    1    C u0 p0 c0 {2,S} {4,S} {5,S} {6,S}
+    2    C u0 p0 c0 {1,S} {3,S} {7,S} {8,S}
+    3 *1 O u0 p2 c0 {2,S} {9,S}
+    4    H u0 p0 c0 {1,S}
+    5    H u0 p0 c0 {1,S}
+    6    H u0 p0 c0 {1,S}
+    7    H u0 p0 c0 {2,S}
+    8    H u0 p0 c0 {2,S}
+    9 *2 H u0 p0 c0 {3,S}
+    """,
+    """
+    1    C u0 p0 c0 {2,D} {4,S} {5,S}
+    2    C u0 p0 c0 {1,D} {3,S} {6,S}
+    3 *1 C u0 p0 c0 {2,S} {7,S} {8,S} {9,S}
+    4    H u0 p0 c0 {1,S}
+    5    H u0 p0 c0 {1,S}
+    6    H u0 p0 c0 {2,S}
+    7 *2 H u0 p0 c0 {3,S}
+    8    H u0 p0 c0 {3,S}
+    9    H u0 p0 c0 {3,S}
+    """,
+    """
+    1 *1 H u0 p0 c0 {2,S}
+    2 *2 H u0 p0 c0 {1,S}
+    """,
+    """
+    multiplicity 2
+    1 *3 O u1 p2 c0 {2,S}
+    2    H u0 p0 c0 {1,S}
+    """,
+    """
+    multiplicity 2
+    1 *3 O u1 p2 c0 {2,S}
+    2    O u0 p2 c0 {1,S} {3,S}
+    3    H u0 p0 c0 {2,S}
+    """,
+    """
+    multiplicity 2
+    1 *3 C u1 p0 c0 {2,S} {3,S} {4,S}
+    2    H u0 p0 c0 {1,S}
+    3    H u0 p0 c0 {1,S}
+    4    H u0 p0 c0 {1,S}
+    """,
+    """
+    multiplicity 2
+    1 *3 C u1 p0 c0 {2,D} {3,S}
+    2    C u0 p0 c0 {1,D} {4,S} {5,S}
+    3    H u0 p0 c0 {1,S}
+    4    H u0 p0 c0 {2,S}
+    5    H u0 p0 c0 {2,S}
+    """,
+    """
+    multiplicity 2
+    1 *3 H u1 p0 c0
+    """,
+]
+
+
+class TestSolveSparseLeastSquares(unittest.TestCase):
+
+    def setUp(self):
+        random = numpy.random.RandomState(0)
+        # Rows of ones like the group additivity matrices, with the family column
+        dense = (random.rand(60, 12) < 0.3).astype(numpy.float64)
+        dense[:, -1] = 1
+        self.A = scipy.sparse.csr_matrix(dense)
+        self.b = random.rand(60, 3)
+
+    def test_matches_dense_lstsq(self):
+        "The sparse fit should match numpy.linalg.lstsq"
+        x = solveSparseLeastSquares(self.A, self.b)
+        expected = numpy.linalg.lstsq(self.A.toarray(), self.b)[0]
+        self.assertTrue(numpy.allclose(x, expected, atol=1e-7))
+
+    def test_minimum_norm(self):
+        "A rank deficient fit should give the minimum norm solution, like numpy.linalg.lstsq"
+        dense = self.A.toarray()
+        A = scipy.sparse.csr_matrix(numpy.hstack([dense, dense[:, :1]]))
+        x = solveSparseLeastSquares(A, self.b)
+        expected = numpy.linalg.lstsq(A.toarray(), self.b)[0]
+        self.assertTrue(numpy.allclose(x, expected, atol=1e-7))
+
+    def test_warm_start(self):
+        "Starting from the fit of some of the rows should give the same fit"
+        x0 = solveSparseLeastSquares(self.A[:50], self.b[:50])
+        x = solveSparseLeastSquares(self.A, self.b, x0=x0)
+        expected = numpy.linalg.lstsq(self.A.toarray(), self.b)[0]
+        self.assertTrue(numpy.allclose(x, expected, atol=1e-7))
+
+
+class TestDistanceData(unittest.TestCase):
+
+    def setUp(self):
+        self.distanceData = DistanceData(
+            distances={'d12': 1.25, 'd13': 2.5, 'd23': 1.375},
+            uncertainties={'d12': 0.125, 'd13': 0.0625, 'd23': 0.25},
+            method='m062x/6-311+g(2df,2p)',
+            comment=u'Matched node C_methane (Top node)\n')
+
+    def assertSameDistanceData(self, distanceData, other):
+        self.assertEqual(distanceData.distances, other.distances)
+        self.assertEqual(distanceData.uncertainties, other.uncertainties)
+        self.assertEqual(distanceData.method, other.method)
+        self.assertEqual(distanceData.comment, other.comment)
+
+    def test_repr(self):
+        "Evaluating the repr should give back the same DistanceData"
+        for distanceData in [self.distanceData, DistanceData(), DistanceData(
+                distances={'d12': 1.0, 'd13': 2.0, 'd23': 1.5})]:
+            other = eval(repr(distanceData), {'DistanceData': DistanceData})
+            self.assertSameDistanceData(distanceData, other)
+
+    def test_copy(self):
+        "Copies should be equal, but not share their arrays"
+        for other in [copy(self.distanceData), deepcopy(self.distanceData)]:
+            self.assertSameDistanceData(self.distanceData, other)
+            other.add(self.distanceData)
+            self.assertEqual(other.distances['d12'], 2.5)
+            self.assertEqual(self.distanceData.distances['d12'], 1.25)
+            self.assertEqual(self.distanceData.uncertainties['d12'], 0.125)
+
+
+class TestTSGroups(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.groups = TSGroups(label='H_Abstraction/TS_groups')
+        cls.groups.load(os.path.join(DATABASE_DIRECTORY, 'H_Abstraction', 'TS_groups.py'),
+                        {'DistanceData': DistanceData}, {'__builtins__': None})
+        cls.molecules = [Molecule().fromAdjacencyList(adjlist)
+                         for adjlist in ADJACENCY_LISTS]
+
+    def test_match_node_to_structure(self):
+        "The prefilter should never rule out a node that matches"
+        for molecule in self.molecules:
+            atoms = molecule.getLabeledAtoms()
+            for entry in self.groups.entries.itervalues():
+                self.assertEqual(
+                    self.groups.matchNodeToStructure(entry, molecule, atoms),
+                    Database.matchNodeToStructure(self.groups, entry, molecule, atoms),
+                    "{0} and {1}".format(entry, molecule))
+
+    def test_descend_tree(self):
+        "descendTree should find the same node with and without the prefilter"
+        filtered = []
+        for molecule in self.molecules:
+            atoms = molecule.getLabeledAtoms()
+            filtered.append([self.groups.descendTree(molecule, atoms, root=top)
+                             for top in self.groups.top])
+
+        # Without any node filters every node goes to the subgraph isomorphism
+        nodeFilters = self.groups.nodeFilters
+        self.groups.nodeFilters = dict.fromkeys(self.groups.entries.itervalues())
+        try:
+            unfiltered = []
+            for molecule in self.molecules:
+                atoms = molecule.getLabeledAtoms()
+                unfiltered.append([self.groups.descendTree(molecule, atoms, root=top)
+                                   for top in self.groups.top])
+        finally:
+            self.groups.nodeFilters = nodeFilters
+
+        self.assertEqual(filtered, unfiltered)
+        for nodes in filtered:
+            self.assertEqual(len([node for node in nodes if node is not None]), 1)
+
+
+class TestTransitionStates(unittest.TestCase):
+
+    def setUp(self):
+        """
+        A small two-tree TSGroups: X1 and Y1 have uncertainties, X2 doesn't,
+        and X3, X31 and Y2 have no distances of their own.
+        """
+        data = {
+            'X': DistanceData(distances={'d12': 1.0, 'd13': 2.0, 'd23': 1.5},
+                              uncertainties={'d12': 0.5, 'd13': 0.5, 'd23': 0.5}),
+            'X1': DistanceData(distances={'d12': 0.125, 'd13': -0.25, 'd23': 0.0625},
+                               uncertainties={'d12': 0.25, 'd13': 0.125, 'd23': 0.0625}),
+            'X2': DistanceData(distances={'d12': -0.5, 'd13': 0.25, 'd23': 0.375}),
+            'Y1': DistanceData(distances={'d12': 0.0625, 'd13': 0.5, 'd23': -0.125},
+                               uncertainties={'d12': 0.125, 'd13': 0.25, 'd23': 0.5}),
+        }
+        parents = [('X', None), ('X1', 'X'), ('X2', 'X'), ('X3', 'X'), ('X31', 'X3'),
+                   ('Y', None), ('Y1', 'Y'), ('Y2', 'Y')]
+
+        groups = TSGroups(label='synthetic')
+        for index, (label, parent) in enumerate(parents):
+            entry = Entry(index=index, label=label, data=data.get(label, DistanceData()))
+            if parent is None:
+                groups.top.append(entry)
+            else:
+                entry.parent = groups.entries[parent]
+                entry.parent.children.append(entry)
+            groups.entries[label] = entry
+
+        self.database = TransitionStates()
+        self.database.groups = groups
+
+    def test_estimate_distances_batch(self):
+        "Each row should match the group additivity estimate of its template"
+        templates = [['X1', 'Y1'], ['X2', 'Y1'], ['X31', 'Y2'], ['X', 'Y'], ['X1', 'Y2']]
+        reactions = [TemplateReaction(template=template) for template in templates]
+        distances, uncertainties = self.database.estimateDistancesBatch(reactions)
+        self.assertEqual(distances.shape, (len(reactions), 3))
+
+        for reaction, row, uncertaintyRow in zip(reactions, distances, uncertainties):
+            expected = self.database.groups.estimateDistancesUsingGroupAdditivity(reaction)
+            self.assertTrue(numpy.allclose(row, expected.distanceArray))
+            if expected.uncertaintyArray is None:
+                self.assertTrue(numpy.isnan(uncertaintyRow).all(), reaction.template)
+            else:
+                self.assertTrue(numpy.allclose(uncertaintyRow, expected.uncertaintyArray))
+
+        # X2 has no uncertainties, so neither does its estimate
+        self.assertTrue(numpy.isnan(uncertainties[1]).all())
+        self.assertFalse(numpy.isnan(uncertainties[0]).any())
+
+
+if __name__ == "__main__":
+    unittest.main(testRunner=unittest.TextTestRunner(verbosity=2))
@@ -28,7 +28,6 @@
 ################################################################################
 
 import os
-import itertools
 import logging
 import numpy
 
@@ -36,32 +35,66 @@ import autotst
 from autotst.reaction import AutoTST_Reaction, AutoTST_TS
 from autotst.molecule import AutoTST_Molecule
 from autotst.calculators.vibrational_analysis import Vibrational_Analysis
+from autotst.calculators.result_store import get_result_store, ts_context, kinetics_context
+from autotst.calculators.species_keys import get_canonical_smiles
 from autotst.base import QMData
 import rmgpy
 from rmgpy.molecule import Molecule, Atom, getElement
-from rmgpy.species import Species, TransitionState
-from rmgpy.reaction import Reaction
-from rmgpy.kinetics import Arrhenius, Eckart
-from rmgpy.statmech import Conformer, IdealGasTranslation, NonlinearRotor, HarmonicOscillator, LinearRotor
 
 
-def get_possible_names(reactants, products):
+_legacy_files = {}
 
-    joinedReactOrders = ['+'.join(order)
-                         for order in itertools.permutations(reactants)]
-    joinedProdOrders = ['+'.join(order)
-                        for order in itertools.permutations(products)]
-    fileNames = ['_'.join((rJO, pJO)) for rJO in joinedReactOrders for pJO in joinedProdOrders] + [
-        '_'.join((pJO, rJO)) for rJO in joinedReactOrders for pJO in joinedProdOrders]
 
-    return fileNames
+def get_reaction_sides(label):
+    """
+    Splits a reaction label of the form `r1+r2_p1+p2` into its reactant and
+    product sides, each with canonical SMILES in sorted order.
+    """
+    reactants, products = label.split("_")
+    return ('+'.join(sorted(get_canonical_smiles(smiles) for smiles in reactants.split("+"))),
+            '+'.join(sorted(get_canonical_smiles(smiles) for smiles in products.split("+"))))
+
+
+def get_reaction_key(label):
+    """
+    Returns the canonical key of the reaction `label`. The key doesn't depend
+    on the order of the species within a side or on the SMILES used for them,
+    but it does keep the direction: the reactants always come first, so a
+    reaction and its reverse have different keys.
+    """
+    return '_'.join(get_reaction_sides(label))
+
+
+def get_legacy_files(directory, extension):
+    """
+    Returns a dictionary from reaction key to the path of every old style
+    result file with `extension` in `directory`. The directory is listed
+    once per extension rather than probing a file name for every ordering of
+    every reaction.
+    """
+    directory = os.path.abspath(directory)
+    if (directory, extension) not in _legacy_files:
+        files = {}
+        if os.path.isdir(directory):
+            for file_name in os.listdir(directory):
+                if not file_name.endswith(extension):
+                    continue
+                label = file_name[:-len(extension)]
+                if label.count("_") != 1:
+                    continue
+                try:
+                    files[get_reaction_key(label)] = os.path.join(directory, file_name)
+                except Exception:
+                    logging.info("Couldn't get a reaction key for {}".format(file_name))
+        _legacy_files[directory, extension] = files
+    return _legacy_files[directory, extension]
 
 
 class AutoTST_Calculator():
     """
     A base class for all autotst calculators. 
-    This class is designed to deal with the 
-    input and output of `.ts` and `.kinetics` files.
+    This class is designed to deal with saving and
+    loading TS and kinetics results in the result store.
     """
 
     def __init__(self, autotst_reaction=None, save_directory="."):
@@ -76,163 +109,128 @@ class AutoTST_Calculator():
 
         return QMData().get_qmdata(file_path=file_path)
 
-    def get_ts_file_path(self, reaction):
-
-        return os.path.join(self.save_directory, reaction.label + ".ts")
-
-    def get_kinetics_file_path(self, reaction):
-
-        return os.path.join(self.save_directory, reaction.label + ".kinetics")
+    @property
+    def result_store(self):
+        return get_result_store(self.save_directory)
 
     def save_ts(self, reaction, method, qmData):
         """
         Save the generated TS data.
         """
-        file_path = self.get_ts_file_path(reaction)
-        logging.info("Saving TS result file {}".format(file_path))
-        with open(file_path, 'w') as resultFile:
-            resultFile.write('rxnLabel = "{0!s}"\n'.format(reaction.label))
-            resultFile.write('method = "{0!s}"\n'.format(method))
-            resultFile.write("qmData = {0!r}\n".format(qmData))
+        logging.info("Saving TS result for {} in {}".format(
+            reaction.label, self.result_store.path))
+        self.result_store.save_ts(get_reaction_key(reaction.label),
+                                  reaction.label, method, qmData)
 
     def save_kinetics(self, method, reaction):
-        filePath = self.get_kinetics_file_path(reaction)
         """
         Save the calculated kinetics. `reaction` is a CanTherm reaction object that
-        should include the molecular parameters.
+        should include the molecular parameters. Returns True if they were
+        saved, which they aren't unless they are Arrhenius kinetics.
         """
-        logging.info("Saving kinetics data file {}".format(filePath))
-        with open(filePath, 'w') as resultFile:
-
-            if isinstance(reaction, rmgpy.reaction.Reaction):
-                assert reaction.kinetics, "No kinetics calclated for this reaction..."
-                resultFile.write('method = "{0!s}"\n'.format(method))
+        if isinstance(reaction, autotst.reaction.AutoTST_Reaction):
+            label = reaction.label
+            reaction = reaction.rmg_reaction
+        else:
+            label = reaction.label
+        assert reaction.kinetics, "No kinetics calclated for this reaction..."
 
-                resultFile.write('reaction = {0!r}\n'.format(reaction))
-            elif isinstance(reaction, autotst.reaction.AutoTST_Reaction):
-                assert reaction.rmg_reaction.kinetics, "No kinetics calclated for this reaction..."
-                resultFile.write('method = "{0!s}"\n'.format(method))
-                resultFile.write(
-                    'reaction = {0!r}\n'.format(reaction.rmg_reaction))
+        logging.info("Saving kinetics for {} in {}".format(
+            label, self.result_store.path))
+        return self.result_store.save_kinetics(get_reaction_key(label),
+                                               label, method, reaction)
 
-    def read_ts_file(self):
+    def find_legacy_file(self, extension):
         """
-        Load the specified transition state data file and return the dictionary of its contents.
-
-        Returns `None` if the file is invalid or missing.
-
-        Checks that the returned dictionary contains at least rxnLabel, method, qmData.
+        Looks for a `.ts` or `.kinetics` file written by older versions of
+        AutoTST for this reaction, and returns its path or None.
         """
+        return get_legacy_files(self.save_directory, extension).get(
+            get_reaction_key(self.label))
 
-        r, p = self.label.split("_")
-        reacts = r.split("+")
-        prods = p.split("+")
-
-        file_names = get_possible_names(reacts, prods)
-
-        got_file = False
-        for file_name in file_names:
-            ts_file = os.path.join(self.save_directory, file_name + ".ts")
-            if os.path.exists(ts_file):
-                got_file = True
-                path = ts_file
-
-        if not got_file:
-            return None
+    def read_legacy_file(self, path, context):
+        """
+        Executes an old style result file in `context` and returns the names
+        it defines, or None if the file couldn't be read.
+        """
         try:
             with open(path) as resultFile:
-                logging.info('Reading existing ts file {0}'.format(path))
+                logging.info('Reading existing result file {0}'.format(path))
                 global_context = {'__builtins__': None}
-                local_context = {
-                    '__builtins__': None,
-                    'True': True,
-                    'False': False,
-                    'QMData': QMData,
-                    'array': numpy.array,
-                    'int32': numpy.int32,
-                }
+                local_context = dict(context)
                 exec resultFile in global_context, local_context
         except IOError, e:
-            logging.info("Couldn't read ts file {0}".format(path))
+            logging.info("Couldn't read result file {0}".format(path))
             return None
         except (NameError, TypeError, SyntaxError), e:
-            logging.error('The ts file "{0}" was invalid:'.format(path))
+            logging.error('The result file "{0}" was invalid:'.format(path))
             logging.exception(e)
             return None
-        if not 'rxnLabel' in local_context:
-            logging.error(
-                'The ts file "{0}" did not contain a rxnLabel.'.format(path))
-            return None
-        if not 'method' in local_context:
-            logging.error(
-                'The ts file "{0}" did not contain a method.'.format(path))
-            return None
-        if not 'qmData' in local_context:
-            logging.error(
-                'The ts file "{0}" did not contain thermoData.'.format(path))
-            return None
         return local_context
 
-    def read_kinetics_file(self):
+    def read_ts_file(self):
         """
-        Load the specified kinetic data file and return the dictionary of its contents.
+        Load the transition state data for this reaction from the result store
+        and return a dictionary with its rxnLabel, method and qmData.
 
-        Returns `None` if the file is invalid or missing.
-
-        Checks that the returned dictionary contains at least method, Reaction.
+        Returns `None` if there is no valid result. An old style `.ts` file is
+        read if the store has nothing, and is then added to the store.
         """
-        r, p = self.label.split("_")
-        reacts = r.split("+")
-        prods = p.split("+")
-
-        file_names = get_possible_names(reacts, prods)
-
-        got_file = False
-        for file_name in file_names:
-            ts_file = os.path.join(self.save_directory,
-                                   file_name + ".kinetics")
-            if os.path.exists(ts_file):
-                got_file = True
-                path = ts_file
+        key = get_reaction_key(self.label)
+        result = self.result_store.get_ts(key)
+        if result:
+            return result
 
-        if not got_file:
+        path = self.find_legacy_file(".ts")
+        if not path:
             return None
-        try:
-            with open(path) as resultFile:
-                logging.info('Reading existing kinetics file {0}'.format(path))
-                global_context = {'__builtins__': None}
-                local_context = {
-                    '__builtins__': None,
-                    'True': True,
-                    'False': False,
-                    'Reaction': Reaction,
-                    'Species': Species,
-                    'TransitionState': TransitionState,
-                    'Arrhenius': Arrhenius,
-                    'Eckart': Eckart,
-                    'Conformer': Conformer,
-                    'IdealGasTranslation': IdealGasTranslation,
-                    'NonlinearRotor': NonlinearRotor,
-                    'HarmonicOscillator': HarmonicOscillator,
-                    'LinearRotor': LinearRotor,
-                    'array': numpy.array,
-                    'int32': numpy.int32,
-                    'Molecule': Molecule
-                }
-                exec resultFile in global_context, local_context
-        except IOError, e:
-            logging.error("Couldn't read kinetics file {0}".format(path))
+        local_context = self.read_legacy_file(path, ts_context)
+        if local_context is None:
             return None
-        except (NameError, TypeError, SyntaxError), e:
-            logging.error('The kinetics file "{0}" was invalid:'.format(path))
-            logging.exception(e)
+        for name in ['rxnLabel', 'method', 'qmData']:
+            if not name in local_context:
+                logging.error(
+                    'The ts file "{0}" did not contain {1}.'.format(path, name))
+                return None
+
+        self.result_store.save_ts(key, local_context['rxnLabel'],
+                                  local_context['method'], local_context['qmData'])
+        return {'rxnLabel': local_context['rxnLabel'],
+                'method': local_context['method'],
+                'qmData': local_context['qmData']}
+
+    def read_kinetics_file(self):
+        """
+        Load the kinetics for this reaction from the result store and return a
+        dictionary with its method and reaction.
+
+        Returns `None` if there is no valid result. An old style `.kinetics`
+        file is read if the store has nothing, and is then added to the store
+        unless its kinetics are missing or aren't Arrhenius.
+        """
+        key = get_reaction_key(self.label)
+        result = self.result_store.get_kinetics(key)
+        if result:
+            return result
+
+        path = self.find_legacy_file(".kinetics")
+        if not path:
             return None
-        if not 'method' in local_context:
-            logging.error(
-                'The kinetics file "{0}" did not contain a method.'.format(path))
+        local_context = self.read_legacy_file(path, kinetics_context)
+        if local_context is None:
             return None
-        if not 'Reaction' in local_context:
+        for name in ['method', 'reaction']:
+            if not name in local_context:
+                logging.error(
+                    'The kinetics file "{0}" did not contain {1}.'.format(path, name))
+                return None
+
+        label = os.path.basename(path)[:-len(".kinetics")]
+        if not self.result_store.save_kinetics(key, label, local_context['method'],
+                                               local_context['reaction']):
             logging.error(
-                'The kinetics file "{0}" did not contain a reaction.'.format(path))
+                'The kinetics file "{0}" did not contain Arrhenius kinetics.'.format(path))
             return None
-        return local_context
+        return {'rxnLabel': label,
+                'method': local_context['method'],
+                'reaction': local_context['reaction']}
@@ -0,0 +1,63 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+################################################################################
+#
+#   AutoTST - Automated Transition State Theory
+#
+#   Copyright (c) 2015-2018 Prof. Richard H. West (r.west@northeastern.edu)
+#
+#   Permission is hereby granted, free of charge, to any person obtaining a
+#   copy of this software and associated documentation files (the 'Software'),
+#   to deal in the Software without restriction, including without limitation
+#   the rights to use, copy, modify, merge, publish, distribute, sublicense,
+#   and/or sell copies of the Software, and to permit persons to whom the
+#   Software is furnished to do so, subject to the following conditions:
+#
+#   The above copyright notice and this permission notice shall be included in
+#   all copies or substantial portions of the Software.
+#
+#   THE SOFTWARE IS PROVIDED 'AS IS', WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#   IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#   FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#   AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#   LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+#   FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+#   DEALINGS IN THE SOFTWARE.
+#
+################################################################################
+
+import unittest
+
+from autotst.calculators.calculator import get_reaction_key
+
+
+class TestReactionKey(unittest.TestCase):
+
+    def test_species_order(self):
+        "The order of the species within a side shouldn't change the key"
+        self.assertEqual(get_reaction_key("CC=C(C)C+[O]O_[CH2]C=C(C)C+OO"),
+                         get_reaction_key("[O]O+CC=C(C)C_OO+[CH2]C=C(C)C"))
+
+    def test_smiles_spelling(self):
+        "Different SMILES for the same species should give the same key"
+        self.assertEqual(get_reaction_key("CC=C(C)C+[O]O_[CH2]C=C(C)C+OO"),
+                         get_reaction_key("CC(C)=CC+O[O]_CC(C)=C[CH2]+OO"))
+        self.assertEqual(get_reaction_key("C+[OH]_[CH3]+O"),
+                         get_reaction_key("[CH4]+[OH]_[CH3]+[OH2]"))
+
+    def test_direction(self):
+        "A reaction and its reverse should have different keys"
+        forward = get_reaction_key("C+[OH]_[CH3]+O")
+        reverse = get_reaction_key("[CH3]+O_C+[OH]")
+        self.assertNotEqual(forward, reverse)
+        self.assertEqual(reverse, get_reaction_key("O+[CH3]_[OH]+C"))
+
+    def test_distinct_reactions(self):
+        "Different reactions should have different keys"
+        self.assertNotEqual(get_reaction_key("C+[OH]_[CH3]+O"),
+                            get_reaction_key("CC+[OH]_[CH2]C+O"))
+
+
+if __name__ == "__main__":
+    unittest.main(testRunner=unittest.TextTestRunner(verbosity=2))
@@ -1,23 +1,52 @@
 import os
+import logging
+import threading
+import multiprocessing
+from collections import Counter
 
-from rdkit import Chem
-
+from rmgpy import constants
 from rmgpy.cantherm import CanTherm, KineticsJob, StatMechJob
+from rmgpy.cantherm.statmech import applyEnergyCorrections
+from rmgpy.species import Species, TransitionState
+from rmgpy.reaction import Reaction
+from rmgpy.kinetics import Eckart
+from rmgpy.statmech import Conformer, IdealGasTranslation, NonlinearRotor, HarmonicOscillator, LinearRotor
 
 from autotst.reaction import AutoTST_Reaction, AutoTST_TS
 from autotst.molecule import AutoTST_Molecule
 from autotst.calculators.calculator import AutoTST_Calculator
+from autotst.calculators.log_parser import HARTREE_TO_EV
+from autotst.calculators.gaussian import get_rotor_label
+from autotst.calculators.species_keys import get_inchikey
+
+# CanTherm keeps the species and reactions from its input files in module
+# level dictionaries, so only one input file based job may run at a time
+cantherm_lock = threading.Lock()
+
+# The symbol of each bond order, for both string and numeric RMG bond orders
+BOND_ORDER_SYMBOLS = {
+    'S': '-', 1: '-',
+    'D': '=', 2: '=',
+    'T': '#', 3: '#',
+    'B': 'B', 1.5: 'B',
+}
+
+# The order of the elements in a bond type, eg. `C-H` rather than `H-C`, to
+# match CanTherm's bond energy corrections. Other elements come between O and H.
+ELEMENT_ORDER = {'N': 0, 'S': 1, 'C': 2, 'O': 3, 'H': 5}
+DEFAULT_ELEMENT_ORDER = 4
 
 
 class AutoTST_CanTherm(AutoTST_Calculator):
 
-    def __init__(self, reaction, scratch=".", output_directory=".", model_chemistry="M06-2X/cc-pVTZ", freq_scale_factor=0.982):
+    def __init__(self, reaction, scratch=".", output_directory=".", model_chemistry="M06-2X/cc-pVTZ", freq_scale_factor=0.982, species_cache=None):
         """
         A class to perform CanTherm calculations:
         :param: reaction: (AutoTST_Reaction) The reaction of interest
         :param: output_directory: (str) The directory where you would like output files written to
         :param: model_chemistry: (str) The supported model_chemistry described by http://reactionmechanismgenerator.github.io/RMG-Py/users/cantherm/input.html#model-chemistry
         :param: freq_scale_factor: (float) The scaling factor corresponding to the model chemistry - source:https://comp.chem.umn.edu/freqscale/version3b1.htm
+        :param: species_cache: (dict) CanTherm species already built, shared between reactions
         """
 
         self.reaction = reaction
@@ -28,97 +57,109 @@ class AutoTST_CanTherm(AutoTST_Calculator):
         self.cantherm_job.outputDirectory = self.output_directory
         self.model_chemistry = model_chemistry
         self.freq_scale_factor = freq_scale_factor
+        if species_cache is None:
+            species_cache = {}
+        self.species_cache = species_cache
 
-    def get_atoms(self, mol):
-        atom_dict = {}
+    def get_rmg_molecule(self, mol):
+        "The RMG molecule of a reactant, product or TS"
         if isinstance(mol, AutoTST_Molecule):
-            rmg_mol = mol.rmg_molecule
+            return mol.rmg_molecule
         elif isinstance(mol, AutoTST_Reaction):
-            rmg_mol = mol.ts.rmg_ts
+            return mol.ts.rmg_ts
         elif isinstance(mol, AutoTST_TS):
-            rmg_mol = mol.rmg_ts
-        for atom in rmg_mol.atoms:
-            if atom.isCarbon():
-                atom_type = "C"
-            if atom.isHydrogen():
-                atom_type = "H"
-            if atom.isOxygen():
-                atom_type = "O"
-
-            try:
-                atom_dict[atom_type] += 1
-            except KeyError:
-                atom_dict[atom_type] = 1
+            return mol.rmg_ts
 
-        return atom_dict
+    def get_atoms(self, mol):
+        "Counts the atoms of each element in `mol`"
+        return dict(Counter(atom.symbol for atom in self.get_rmg_molecule(mol).atoms))
 
     def get_bonds(self, mol):
-        bondList = []
-        if isinstance(mol, AutoTST_Molecule):
-            rmg_mol = mol.rmg_molecule
-        elif isinstance(mol, AutoTST_Reaction):
-            rmg_mol = mol.ts.rmg_ts
-        elif isinstance(mol, AutoTST_TS):
-            rmg_mol = mol.rmg_ts
-        for atom in rmg_mol.atoms:
-            for bond in atom.bonds.values():
-                bondList.append(bond)
-        bonds = list(set(bondList))
-        bondDict = {}
-        for bond in bonds:
-            if bond.isSingle():
-                if bond.atom1.symbol == 'C' and bond.atom2.symbol == 'C':
-                    bondType = 'C-C'
-                elif (bond.atom1.symbol == 'H' and bond.atom2.symbol == 'H'):
-                    bondType = 'H-H'
-                elif (bond.atom1.symbol == 'C' and bond.atom2.symbol == 'H') or (bond.atom1.symbol == 'H' and bond.atom2.symbol == 'C'):
-                    bondType = 'C-H'
-                elif (bond.atom1.symbol == 'O' and bond.atom2.symbol == 'O'):
-                    bondType = 'O-O'
-                elif (bond.atom1.symbol == 'C' and bond.atom2.symbol == 'O') or (bond.atom1.symbol == 'O' and bond.atom2.symbol == 'C'):
-                    bondType = 'C-O'
-                elif (bond.atom1.symbol == 'H' and bond.atom2.symbol == 'O') or (bond.atom1.symbol == 'O' and bond.atom2.symbol == 'H'):
-                    bondType = 'O-H'
-                elif bond.atom1.symbol == 'N' and bond.atom2.symbol == 'N':
-                    bondType = 'N-N'
-                elif (bond.atom1.symbol == 'C' and bond.atom2.symbol == 'N') or (bond.atom1.symbol == 'N' and bond.atom2.symbol == 'C'):
-                    bondType = 'N-C'
-                elif (bond.atom1.symbol == 'O' and bond.atom2.symbol == 'N') or (bond.atom1.symbol == 'N' and bond.atom2.symbol == 'O'):
-                    bondType = 'N-O'
-                elif (bond.atom1.symbol == 'H' and bond.atom2.symbol == 'N') or (bond.atom1.symbol == 'N' and bond.atom2.symbol == 'H'):
-                    bondType = 'N-H'
-                elif bond.atom1.symbol == 'S' and bond.atom2.symbol == 'S':
-                    bondType = 'S-S'
-                elif (bond.atom1.symbol == 'H' and bond.atom2.symbol == 'S') or (bond.atom1.symbol == 'S' and bond.atom2.symbol == 'H'):
-                    bondType = 'S-H'
-            elif bond.isDouble:
-                if bond.atom1.symbol == 'C' and bond.atom2.symbol == 'C':
-                    bondType = 'C=C'
-                elif (bond.atom1.symbol == 'O' and bond.atom2.symbol == 'O'):
-                    bondType = 'O=O'
-                elif (bond.atom1.symbol == 'C' and bond.atom2.symbol == 'O') or (bond.atom1.symbol == 'O' and bond.atom2.symbol == 'C'):
-                    bondType = 'C=O'
-                elif bond.atom1.symbol == 'N' and bond.atom2.symbol == 'N':
-                    bondType = 'N=N'
-                elif (bond.atom1.symbol == 'C' and bond.atom2.symbol == 'N') or (bond.atom1.symbol == 'N' and bond.atom2.symbol == 'C'):
-                    bondType = 'N=C'
-                elif (bond.atom1.symbol == 'O' and bond.atom2.symbol == 'N') or (bond.atom1.symbol == 'N' and bond.atom2.symbol == 'O'):
-                    bondType = 'N=O'
-                elif (bond.atom1.symbol == 'O' and bond.atom2.symbol == 'S') or (bond.atom1.symbol == 'S' and bond.atom2.symbol == 'O'):
-                    bondType = 'S=O'
-            elif bond.isTriple:
-                if bond.atom1.symbol == 'C' and bond.atom2.symbol == 'C':
-                    bondType = 'C#C'
-                elif bond.atom1.symbol == 'N' and bond.atom2.symbol == 'N':
-                    bondType = 'N#N'
-                elif (bond.atom1.symbol == 'C' and bond.atom2.symbol == 'N') or (bond.atom1.symbol == 'N' and bond.atom2.symbol == 'C'):
-                    bondType = 'N#C'
+        """
+        Counts the bonds of each type (eg. `C-H` or `C=O`) in `mol`, going over
+        the edge list of the molecule once. The type of a bond comes from the
+        BOND_ORDER_SYMBOLS and ELEMENT_ORDER tables, so every element is
+        handled.
+        """
+        bond_types = []
+        for bond in self.get_rmg_molecule(mol).getAllEdges():
             try:
-                bondDict[bondType] += 1
+                order = BOND_ORDER_SYMBOLS[bond.order]
             except KeyError:
-                bondDict[bondType] = 1
+                logging.info("Leaving out a bond of order {} from the bond counts".format(bond.order))
+                continue
+            symbols = sorted([bond.atom1.symbol, bond.atom2.symbol],
+                             key=lambda symbol: (ELEMENT_ORDER.get(symbol, DEFAULT_ELEMENT_ORDER), symbol))
+            bond_types.append(order.join(symbols))
+
+        return dict(Counter(bond_types))
+
+    def get_rotor_symmetry(self, rmg_mol, j, k):
+        """
+        Estimates the symmetry number of the rotor about the bond between atoms
+        `j` and `k`. A side made up of identical terminal atoms (eg. a methyl
+        group) gives a symmetry number equal to the number of those atoms.
+        """
+        symmetry = 1
+        for pivot, other in [(rmg_mol.atoms[j], rmg_mol.atoms[k]),
+                             (rmg_mol.atoms[k], rmg_mol.atoms[j])]:
+            neighbors = [atom for atom in pivot.bonds.keys() if atom is not other]
+            if len(neighbors) < 2:
+                continue
+            if len(set(atom.symbol for atom in neighbors)) != 1:
+                continue
+            if any(len(atom.bonds) != 1 for atom in neighbors):
+                continue
+            symmetry = max(symmetry, len(neighbors))
+        return symmetry
+
+    def get_rotors(self, autotst_object):
+        """
+        Finds the successful hindered rotor scans of a reactant, product or TS
+        in the scratch directory. Scans that failed verification were renamed
+        to `-failed.log`, and scans that never finished have no log, so both
+        are left out.
 
-        return bondDict
+        Returns a list of (log file name, pivots, top, symmetry), with the
+        atoms numbered from 1 as CanTherm expects.
+        """
+        if isinstance(autotst_object, AutoTST_Reaction):
+            autotst_object = autotst_object.ts
+        if isinstance(autotst_object, AutoTST_TS):
+            rmg_mol = autotst_object.rmg_ts
+        else:
+            rmg_mol = autotst_object.rmg_molecule
+
+        rotors = []
+        for torsion in getattr(autotst_object, "torsions", []):
+            log_file = get_rotor_label(autotst_object, torsion) + ".log"
+            if not os.path.exists(os.path.join(self.scratch, log_file)):
+                continue
+            i, j, k, l = torsion.indices
+            top = [index + 1 for index, in_top in enumerate(torsion.right_mask) if in_top]
+            rotors.append((log_file, [j + 1, k + 1], top,
+                           self.get_rotor_symmetry(rmg_mol, j, k)))
+        return rotors
+
+    def get_rotor_lines(self, autotst_object):
+        "The lines of a CanTherm input file that define the hindered rotors"
+        rotors = self.get_rotors(autotst_object)
+        if not rotors:
+            return ["rotors = []"]
+
+        lines = ["rotors = ["]
+        for log_file, pivots, top, symmetry in rotors:
+            lines.append("    HinderedRotor(scanLog=GaussianLog('{0}'), pivots={1}, top={2}, symmetry={3}, fit='best'),".format(
+                log_file, pivots, top, symmetry))
+        lines.append("]")
+        return lines
+
+    def has_rotors(self):
+        "True if any species or the TS of the reaction has a successful rotor scan"
+        for autotst_object in self.reaction.reactant_mols + self.reaction.product_mols + [self.reaction]:
+            if self.get_rotors(autotst_object):
+                return True
+        return False
 
     def write_cantherm_for_reacts_and_prods(self, mol):
 
@@ -140,8 +181,7 @@ class AutoTST_CanTherm(AutoTST_Calculator):
         else:
             output.append('bonds = {}')
 
-        label = Chem.rdinchi.InchiToInchiKey(
-            Chem.MolToInchi(Chem.MolFromSmiles(mol.smiles))).strip("-N")
+        label = self.get_species_label(mol)
 
         external_symmetry = mol.rmg_molecule.getSymmetryNumber()
 
@@ -156,7 +196,7 @@ class AutoTST_CanTherm(AutoTST_Calculator):
         output += [
             "frequencies = GaussianLog('{0}.log')".format(label), ""]
 
-        output += ["rotors = []"]
+        output += self.get_rotor_lines(mol)
 
         input_string = ""
 
@@ -200,7 +240,7 @@ class AutoTST_CanTherm(AutoTST_Calculator):
         output += [
             "frequencies = GaussianLog('{0}.log')".format(rxn.label), ""]
 
-        output += ["rotors = []", ""]
+        output += self.get_rotor_lines(rxn) + [""]
 
         input_string = ""
 
@@ -212,13 +252,12 @@ class AutoTST_CanTherm(AutoTST_Calculator):
 
     def write_cantherm_ts(self, rxn):
         top = ["#!/usr/bin/env python", "# -*- coding: utf-8 -*-", "", 'modelChemistry = "{0}"'.format(
-            self.model_chemistry), "frequencyScaleFactor = {0}".format(self.freq_scale_factor), "useHinderedRotors = False", "useBondCorrections = False", ""]
+            self.model_chemistry), "frequencyScaleFactor = {0}".format(self.freq_scale_factor), "useHinderedRotors = {0}".format(self.has_rotors()), "useBondCorrections = False", ""]
 
         labels = []
 
         for react in rxn.reactant_mols:
-            label = Chem.rdinchi.InchiToInchiKey(
-                Chem.MolToInchi(Chem.MolFromSmiles(react.smiles))).strip("-N")
+            label = self.get_species_label(react)
             if label in labels:
                 continue
             else:
@@ -228,8 +267,7 @@ class AutoTST_CanTherm(AutoTST_Calculator):
             top.append(line)
 
         for prod in rxn.product_mols:
-            label = Chem.rdinchi.InchiToInchiKey(
-                Chem.MolToInchi(Chem.MolFromSmiles(prod.smiles))).strip("-N")
+            label = self.get_species_label(prod)
             if label in labels:
                 continue
             else:
@@ -281,15 +319,155 @@ class AutoTST_CanTherm(AutoTST_Calculator):
         self.cantherm_job.inputFile = os.path.join(
             self.scratch, self.reaction.label + ".canth.py")
         self.cantherm_job.plot = False
-        try:
-            self.cantherm_job.execute()
-        except IOError:
-            print "There was an issue with Cairo..."
+        with cantherm_lock:
+            try:
+                self.cantherm_job.execute()
+            except IOError:
+                print "There was an issue with Cairo..."
 
         for job in self.cantherm_job.jobList:
             if isinstance(job, KineticsJob):
                 self.kinetics_job = job
 
+    def get_species_label(self, mol):
+        "The label (InChIKey) that the log file of a reactant or product is saved under"
+        return get_inchikey(mol.smiles)
+
+    def get_conformer(self, qmData, atoms, bonds, symmetry, multiplicity, linear=False):
+        """
+        Builds the CanTherm Conformer for a species or TS from its `qmData`,
+        the same way a StatMechJob builds it from an input file and log file.
+
+        Returns the conformer and the scaled imaginary frequency (None if there
+        isn't one).
+        """
+        hartree_to_j_per_mol = constants.E_h * constants.Na
+
+        E0 = qmData.energy[0] / HARTREE_TO_EV * hartree_to_j_per_mol
+        E0 = applyEnergyCorrections(E0, self.model_chemistry, atoms, bonds,
+                                    applyBondEnergyCorrections=False)
+        ZPE = qmData.zeroPointEnergy[0] / HARTREE_TO_EV * hartree_to_j_per_mol
+        E0 += ZPE * self.freq_scale_factor
+
+        modes = [IdealGasTranslation(mass=qmData.molecularMass)]
+
+        # Single atoms have no rotational constants, and like CanTherm we leave
+        # out their rotor (and their oscillator, as they have no frequencies)
+        rotational_constants = [
+            B for B in qmData.rotationalConstants[0] if B > 0]
+        if sum(atoms.values()) > 1 and rotational_constants:
+            if linear:
+                modes.append(LinearRotor(rotationalConstant=(
+                    rotational_constants[-1], "cm^-1"), symmetry=symmetry))
+            else:
+                modes.append(NonlinearRotor(rotationalConstant=(
+                    rotational_constants, "cm^-1"), symmetry=symmetry))
+
+        frequencies = qmData.frequencies[0]
+        real_frequencies = [
+            f * self.freq_scale_factor for f in frequencies if f > 0]
+        if real_frequencies:
+            modes.append(HarmonicOscillator(
+                frequencies=(real_frequencies, "cm^-1")))
+
+        imaginary = [f * self.freq_scale_factor for f in frequencies if f < 0]
+        if imaginary:
+            imaginary = imaginary[0]
+        else:
+            imaginary = None
+
+        conformer = Conformer(E0=(E0 * 0.001, "kJ/mol"),
+                              modes=modes,
+                              spinMultiplicity=multiplicity,
+                              opticalIsomers=1)
+        return conformer, imaginary
+
+    def get_species(self, mol):
+        """
+        Builds the CanTherm Species for a reactant or product from the data
+        parsed from its log file. Species are kept in `self.species_cache`, so
+        the statmech of a species is only worked out once.
+        """
+        key = (os.path.abspath(self.scratch), self.get_species_label(mol),
+               self.model_chemistry, self.freq_scale_factor)
+        if key in self.species_cache:
+            return self.species_cache[key]
+
+        qmData = self.get_qm_data(os.path.join(
+            self.scratch, self.get_species_label(mol) + ".log"))
+        conformer, _ = self.get_conformer(qmData,
+                                          self.get_atoms(mol),
+                                          self.get_bonds(mol),
+                                          mol.rmg_molecule.getSymmetryNumber(),
+                                          mol.rmg_molecule.multiplicity,
+                                          linear=mol.rmg_molecule.isLinear())
+        species = Species(label=mol.smiles, molecule=[mol.rmg_molecule])
+        species.conformer = conformer
+        self.species_cache[key] = species
+        return species
+
+    def get_transition_state(self, rxn):
+        """
+        Builds the CanTherm TransitionState for `rxn` from the data parsed from
+        the log file of its TS optimization.
+        """
+        qmData = self.get_qm_data(os.path.join(self.scratch, rxn.label + ".log"))
+        conformer, frequency = self.get_conformer(qmData,
+                                                  self.get_atoms(rxn),
+                                                  self.get_bonds(rxn),
+                                                  rxn.ts.rmg_ts.getSymmetryNumber(),
+                                                  rxn.ts.rmg_ts.multiplicity)
+        if frequency is None:
+            raise ValueError("The TS log file for {} has no imaginary frequency, so it can't "
+                             "be used as a transition state".format(rxn.label))
+        return TransitionState(label="TS",
+                               conformer=conformer,
+                               frequency=(frequency, "cm^-1"),
+                               tunneling=Eckart(frequency=None, E0_reac=None, E0_TS=None, E0_prod=None))
+
+    def get_kinetics_job(self):
+        """
+        Builds the CanTherm KineticsJob for the reaction directly, without
+        writing any input files.
+        """
+        species = {}
+        for mol in self.reaction.reactant_mols + self.reaction.product_mols:
+            if mol.smiles not in species:
+                species[mol.smiles] = self.get_species(mol)
+
+        reaction = Reaction(label=self.reaction.label,
+                            reactants=[species[mol.smiles]
+                                       for mol in self.reaction.reactant_mols],
+                            products=[species[mol.smiles]
+                                      for mol in self.reaction.product_mols],
+                            transitionState=self.get_transition_state(self.reaction))
+        set_tunneling_parameters(reaction)
+        return KineticsJob(reaction)
+
+    def run_in_memory(self):
+        """
+        Calculates the kinetics of the reaction from the log files that have
+        already been parsed, with no CanTherm input files, and sets
+        `self.kinetics_job`. Use this instead of `write_files` and `run`.
+        """
+        self.kinetics_job = self.get_kinetics_job()
+        self.kinetics_job.execute(outputFile=None, plot=False)
+        return self.kinetics_job
+
+    def calculate_kinetics(self):
+        """
+        Calculates the kinetics of the reaction and sets `self.kinetics_job`.
+        If there are hindered rotor scans, CanTherm needs its input files to
+        fit and project out the rotors, so `write_files` and `run` are used.
+        Otherwise the kinetics are calculated in memory.
+        """
+        if self.has_rotors():
+            self.write_files()
+            self.run()
+        else:
+            self.run_in_memory()
+        return self.kinetics_job
+
     def set_reactants_and_products(self):
 
         for reactant in self.reaction.rmg_reaction.reactants:
@@ -305,3 +483,89 @@ class AutoTST_CanTherm(AutoTST_Calculator):
         self.reaction.rmg_reaction = self.kinetics_job.reaction
 
         return self.reaction
+
+
+def set_tunneling_parameters(reaction):
+    """
+    Fills in the Eckart tunneling parameters of a CanTherm `reaction` from its
+    transition state and the conformers of its reactants and products, as
+    CanTherm's KineticsJob would. Setting them here means the reaction has
+    them even when its kinetics are calculated in another process.
+    """
+    ts = reaction.transitionState
+    tunneling = ts.tunneling
+    if not isinstance(tunneling, Eckart) or tunneling.frequency is not None:
+        return
+    tunneling.frequency = (ts.frequency.value_si, "cm^-1")
+    tunneling.E0_reac = (sum([reactant.conformer.E0.value_si
+                              for reactant in reaction.reactants]) * 0.001, "kJ/mol")
+    tunneling.E0_TS = (ts.conformer.E0.value_si * 0.001, "kJ/mol")
+    tunneling.E0_prod = (sum([product.conformer.E0.value_si
+                              for product in reaction.products]) * 0.001, "kJ/mol")
+
+
+def execute_kinetics_job(reaction):
+    """
+    Runs a KineticsJob for a CanTherm `reaction` and returns its kinetics.
+    This is a module level function so it can be sent to worker processes.
+    """
+    job = KineticsJob(reaction)
+    job.execute(outputFile=None, plot=False)
+    return reaction.kinetics
+
+
+def run_kinetics_batch(reactions, processes=None, **kwargs):
+    """
+    Calculates the kinetics of many reactions with CanTherm. The statmech of
+    each reactant and product is built once and shared by every reaction it
+    appears in, and the TST kinetics are then evaluated in `processes` worker
+    processes.
+
+    :params:
+    reactions: (list) The AutoTST_Reactions of interest, with finished calculations
+    processes: (int) The number of worker processes, one per CPU by default
+    kwargs: any other arguments (eg. scratch, model_chemistry) for AutoTST_CanTherm
+
+    :returns:
+    cantherms: (dict) The AutoTST_CanTherm of each reaction that succeeded,
+    keyed by reaction label, with its `kinetics_job` set
+    """
+    species_cache = {}
+    jobs = []
+    cantherms = {}
+    for reaction in reactions:
+        cantherm = AutoTST_CanTherm(reaction, species_cache=species_cache, **kwargs)
+        try:
+            if cantherm.has_rotors():
+                # Hindered rotors go through CanTherm's input files
+                cantherm.calculate_kinetics()
+                cantherm.set_reactants_and_products()
+                cantherms[reaction.label] = cantherm
+                continue
+            cantherm.kinetics_job = cantherm.get_kinetics_job()
+        except Exception as e:
+            logging.error("Couldn't set up CanTherm for {}:".format(reaction))
+            logging.exception(e)
+            continue
+        jobs.append(cantherm)
+
+    logging.info("Calculating kinetics for {} reactions sharing {} species".format(
+        len(jobs), len(species_cache)))
+
+    pool = multiprocessing.Pool(processes)
+    results = [(cantherm, pool.apply_async(execute_kinetics_job, (cantherm.kinetics_job.reaction,)))
+               for cantherm in jobs]
+    pool.close()
+
+    for cantherm, result in results:
+        try:
+            cantherm.kinetics_job.reaction.kinetics = result.get()
+        except Exception as e:
+            logging.error("CanTherm failed for {}:".format(cantherm.reaction))
+            logging.exception(e)
+            continue
+        cantherm.set_reactants_and_products()
+        cantherms[cantherm.reaction.label] = cantherm
+    pool.join()
+
+    return cantherms
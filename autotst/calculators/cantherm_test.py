@@ -0,0 +1,166 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+################################################################################
+#
+#   AutoTST - Automated Transition State Theory
+#
+#   Copyright (c) 2015-2018 Prof. Richard H. West (r.west@northeastern.edu)
+#
+#   Permission is hereby granted, free of charge, to any person obtaining a
+#   copy of this software and associated documentation files (the 'Software'),
+#   to deal in the Software without restriction, including without limitation
+#   the rights to use, copy, modify, merge, publish, distribute, sublicense,
+#   and/or sell copies of the Software, and to permit persons to whom the
+#   Software is furnished to do so, subject to the following conditions:
+#
+#   The above copyright notice and this permission notice shall be included in
+#   all copies or substantial portions of the Software.
+#
+#   THE SOFTWARE IS PROVIDED 'AS IS', WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#   IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#   FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#   AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#   LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+#   FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+#   DEALINGS IN THE SOFTWARE.
+#
+################################################################################
+
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from rmgpy.species import Species
+from rmgpy.cantherm import StatMechJob
+from rmgpy.statmech import NonlinearRotor, LinearRotor, HarmonicOscillator
+
+from autotst.calculators.cantherm import AutoTST_CanTherm
+
+MODEL_CHEMISTRY = "M06-2X/cc-pVTZ"
+FREQ_SCALE_FACTOR = 0.982
+
+# The parts of a Gaussian frequency job on a hydrogen atom that AutoTST and
+# CanTherm read. Gaussian prints no rotational constants or frequencies for an atom.
+H_ATOM_LOG = """ Entering Gaussian System, Link 0=g09
+ Entering Link 1 = C:\\G09W\\l1.exe PID=      1234.
+ #p m062x/cc-pvtz freq
+ Charge =  0 Multiplicity = 2
+ H                     0.        0.        0.
+ NAtoms=      1 NActive=      1 NUniq=      1 SFac= 1.00D+00 NAtFMM=   80 NAOKFM=F Big=F
+                          Input orientation:
+ ---------------------------------------------------------------------
+ Center     Atomic      Atomic             Coordinates (Angstroms)
+ Number     Number       Type             X           Y           Z
+ ---------------------------------------------------------------------
+      1          1           0        0.000000    0.000000    0.000000
+ ---------------------------------------------------------------------
+                         Standard orientation:
+ ---------------------------------------------------------------------
+ Center     Atomic      Atomic             Coordinates (Angstroms)
+ Number     Number       Type             X           Y           Z
+ ---------------------------------------------------------------------
+      1          1           0        0.000000    0.000000    0.000000
+ ---------------------------------------------------------------------
+ SCF Done:  E(UM062X) =  -0.498135055172     A.U. after    4 cycles
+ -------------------
+ - Thermochemistry -
+ -------------------
+ Temperature   298.150 Kelvin.  Pressure   1.00000 Atm.
+ Atom     1 has atomic number  1 and mass   1.00783
+ Molecular mass:     1.00783 amu.
+ Zero-point vibrational energy          0.0 (Joules/Mol)
+ Zero-point correction=                           0.000000 (Hartree/Particle)
+ Thermal correction to Energy=                    0.001416
+ Thermal correction to Enthalpy=                  0.002360
+ Thermal correction to Gibbs Free Energy=        -0.010654
+ Sum of electronic and zero-point Energies=             -0.498135
+ Sum of electronic and thermal Energies=                -0.496719
+ Sum of electronic and thermal Enthalpies=              -0.495775
+ Sum of electronic and thermal Free Energies=           -0.508789
+                     Q            Log10(Q)             Ln(Q)
+ Total Bot       0.512968D+05          4.710090         10.845410
+ Total V=0       0.512968D+05          4.710090         10.845410
+ Electronic      0.200000D+01          0.301030          0.693147
+ Translational   0.256484D+05          4.409060         10.152263
+ -------------------------------------------------------------------
+ Normal termination of Gaussian 09 at Mon Jan  1 00:00:00 2018.
+"""
+
+H_ATOM_INPUT = """#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+atoms = {
+    'H': 1,
+}
+
+bonds = {}
+
+linear = False
+
+externalSymmetry = 1
+
+spinMultiplicity = 2
+
+opticalIsomers = 1
+
+energy = {
+    '{0}': GaussianLog('H.log'),
+}
+
+geometry = GaussianLog('H.log')
+
+frequencies = GaussianLog('H.log')
+
+rotors = []
+""".replace("{0}", MODEL_CHEMISTRY)
+
+
+class TestGetConformer(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        with open(os.path.join(self.directory, "H.log"), "w") as f:
+            f.write(H_ATOM_LOG)
+        with open(os.path.join(self.directory, "H.py"), "w") as f:
+            f.write(H_ATOM_INPUT)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_atom(self):
+        "The conformer of an atom should match the one CanTherm reads from its input file"
+        cantherm = AutoTST_CanTherm(None, scratch=self.directory,
+                                    output_directory=self.directory,
+                                    model_chemistry=MODEL_CHEMISTRY,
+                                    freq_scale_factor=FREQ_SCALE_FACTOR)
+        qmData = cantherm.get_qm_data(os.path.join(self.directory, "H.log"))
+        conformer, imaginary = cantherm.get_conformer(qmData, {'H': 1}, {}, 1, 2)
+        self.assertIsNone(imaginary)
+        for mode in conformer.modes:
+            self.assertNotIsInstance(mode, (NonlinearRotor, LinearRotor, HarmonicOscillator))
+
+        species = Species(label="[H]")
+        job = StatMechJob(species, os.path.join(self.directory, "H.py"))
+        job.modelChemistry = MODEL_CHEMISTRY
+        job.frequencyScaleFactor = FREQ_SCALE_FACTOR
+        job.includeHinderedRotors = False
+        job.applyBondEnergyCorrections = False
+        job.load()
+        reference = species.conformer
+
+        self.assertEqual([type(mode) for mode in conformer.modes],
+                         [type(mode) for mode in reference.modes])
+        self.assertAlmostEqual(conformer.E0.value_si, reference.E0.value_si, delta=1.0)
+        self.assertEqual(conformer.spinMultiplicity, reference.spinMultiplicity)
+        for T in [298.15, 1000.0]:
+            self.assertAlmostEqual(conformer.getPartitionFunction(T) / reference.getPartitionFunction(T),
+                                   1.0, places=4)
+            self.assertAlmostEqual(conformer.getEntropy(T), reference.getEntropy(T), places=3)
+            self.assertAlmostEqual(conformer.getHeatCapacity(T), reference.getHeatCapacity(T), places=3)
+
+
+if __name__ == "__main__":
+    unittest.main(testRunner=unittest.TextTestRunner(verbosity=2))
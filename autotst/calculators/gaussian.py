@@ -28,8 +28,11 @@
 ################################################################################
 
 import os
+import shutil
 import itertools
 import logging
+import subprocess
+import threading
 import numpy as np
 
 import rmgpy
@@ -41,9 +44,12 @@ from autotst.reaction import AutoTST_Reaction, AutoTST_TS
 from autotst.molecule import AutoTST_Molecule
 from autotst.calculators.vibrational_analysis import Vibrational_Analysis
 from autotst.calculators.calculator import AutoTST_Calculator
+from autotst.calculators.result_cache import GaussianResultCache
+from autotst.calculators.registry import SpeciesRegistry
+from autotst.calculators.species_keys import get_inchikey
 
-from rdkit import Chem
 from cclib.io import ccread
+from autotst.calculators.log_parser import read_gaussian_log, read_irc_endpoints
 
 from ase.io.gaussian import read_gaussian, read_gaussian_out
 from ase.calculators.gaussian import Gaussian
@@ -68,6 +74,94 @@ def update_from_ase(autotst_obj, ase_object):
     return autotst_obj
 
 
+# Limits how many Gaussian jobs this process runs at once, see `set_max_jobs`
+job_semaphore = None
+
+
+def set_max_jobs(max_jobs=None):
+    """
+    A function to set the largest number of Gaussian jobs that may run at the
+    same time in this process. If max_jobs is None, there is no limit, and
+    jobs that `run_jobs` would run together are run one at a time instead.
+    """
+    global job_semaphore
+    if max_jobs:
+        job_semaphore = threading.BoundedSemaphore(max_jobs)
+    else:
+        job_semaphore = None
+
+
+def run_jobs(function, arguments):
+    """
+    A function that calls `function` with each tuple in `arguments` and
+    returns the results in the same order. If `set_max_jobs` has set a limit,
+    the calls run in threads and `job_semaphore` decides how many Gaussian jobs
+    actually run together; otherwise they run one after another.
+
+    An Exception raised by a call is logged and returned as its result.
+    """
+    results = [None] * len(arguments)
+
+    def run(index):
+        try:
+            results[index] = function(*arguments[index])
+        except Exception as e:
+            logging.exception(e)
+            results[index] = e
+
+    if job_semaphore is None:
+        for index in range(len(arguments)):
+            run(index)
+    else:
+        threads = [threading.Thread(target=run, args=(index,))
+                   for index in range(len(arguments))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    return results
+
+
+def run_calculator(calc, atoms):
+    """
+    A function that runs an ase file-based calculator on `atoms` inside the
+    calculator's own directory. Unlike `calc.calculate`, this never changes the
+    working directory of the process, so it is safe to call from threads.
+    """
+    calc.write_input(atoms)
+    command = calc.command.replace("PREFIX", calc.prefix)
+
+    semaphore = job_semaphore
+    if semaphore:
+        with semaphore:
+            errorcode = subprocess.call(command, shell=True, cwd=calc.directory)
+    else:
+        errorcode = subprocess.call(command, shell=True, cwd=calc.directory)
+    if errorcode:
+        raise RuntimeError("{0} in {1} returned an error: {2}".format(
+            calc.name, calc.directory, errorcode))
+
+
+def get_label_path(scratch, label):
+    """
+    A function to turn a calculator label into an absolute path in `scratch`,
+    which becomes the working directory of the job.
+    """
+    return os.path.join(os.path.abspath(os.path.expanduser(scratch)), label)
+
+
+def get_rotor_label(autotst_object, torsion):
+    """
+    A function that returns the label of the hindered rotor scan for `torsion`
+    of `autotst_object`, which is also the name of the scan's log file.
+    """
+    i, j, k, l = torsion.indices
+    if isinstance(autotst_object, AutoTST_Molecule):
+        label = get_inchikey(autotst_object.rmg_molecule.toSMILES())
+        return label + "_tor{}{}".format(j, k)
+    return autotst_object.label + "_tor_{}_{}".format(j, k)
+
+
 class AutoTST_Gaussian(AutoTST_Calculator):
 
     def __init__(self,
@@ -77,13 +171,19 @@ class AutoTST_Gaussian(AutoTST_Calculator):
                  scratch=".",
                  method="m062x",
                  basis="6-311+g(2df,2p)",
-                 save_directory="."):
+                 save_directory=".",
+                 cache_directory=None,
+                 registry=None):
         """
         A method to create all of the calculators needed for AutoTST
 
         :params:
         autotst_reaction: (AutoTST_Reaction) The reaction of interest
         scratch: (str) The directory that you would like to use for calculations
+        cache_directory: (str) A directory of finished calculations shared
+        between reactions. If None, no result cache is used.
+        registry: (SpeciesRegistry) A registry shared by a batch of reactions
+        so that each reactant and product is only calculated once
         """
 
         self.reaction = autotst_reaction
@@ -93,7 +193,11 @@ class AutoTST_Gaussian(AutoTST_Calculator):
         self.method = method
         self.basis = basis
         self.save_directory = save_directory
-        
+        if cache_directory:
+            self.result_cache = GaussianResultCache(cache_directory)
+        else:
+            self.result_cache = None
+        self.registry = registry
 
         if autotst_reaction:
             self.label = autotst_reaction.label
@@ -120,15 +224,11 @@ class AutoTST_Gaussian(AutoTST_Calculator):
 
         autotst_mol.rmg_molecule.updateMultiplicity()
 
-        # using this round about way of doing stuff because rmg's `toAugumentedInChIKey` method doesn't work on our cluster
-
-        smiles = autotst_mol.rmg_molecule.toSMILES()
-        label = Chem.rdinchi.InchiToInchiKey(
-            Chem.MolToInchi(Chem.MolFromSmiles(smiles))).strip("-N")
+        label = get_inchikey(autotst_mol.rmg_molecule.toSMILES())
 
         calc = Gaussian(mem=mem,
                         nprocshared=nprocshared,
-                        label=label,
+                        label=get_label_path(scratch, label),
                         scratch=scratch,
                         method=method,
                         basis=basis,
@@ -152,22 +252,17 @@ class AutoTST_Gaussian(AutoTST_Calculator):
             i, j, k, l = torsion.indices
             string += "D {} {} {} {} S 36 10.0".format(i+1, j+1, k+1, l+1)
 
+            label = get_rotor_label(autotst_object, torsion)
             if isinstance(autotst_object, AutoTST_Reaction):
-                label = autotst_object.label + "_tor_{}_{}".format(j, k)
                 mult = autotst_object.ts.rmg_ts.multiplicity
             elif isinstance(autotst_object, AutoTST_TS):
-                label = autotst_object.label + "_tor_{}_{}".format(j, k)
                 mult = autotst_object.rmg_ts.multiplicity
             elif isinstance(autotst_object, AutoTST_Molecule):
-                smiles = autotst_object.rmg_molecule.toSMILES()
-                label = Chem.rdinchi.InchiToInchiKey(
-                    Chem.MolToInchi(Chem.MolFromSmiles(smiles))).strip("-N")
-                label += "_tor{}{}".format(j, k)
                 mult = autotst_object.rmg_molecule.multiplicity
 
             calc = Gaussian(mem=mem,
                             nprocshared=nprocshared,
-                            label=label,
+                            label=get_label_path(scratch, label),
                             scratch=scratch,
                             method=method,
                             basis=basis,
@@ -189,11 +284,15 @@ class AutoTST_Gaussian(AutoTST_Calculator):
         for reactant in self.reaction.reactant_mols:
             calc = self.reactants_or_products_calc(
                 reactant, mem, nprocshared, scratch, method, basis)
+            if self.registry:
+                calc = self.registry.get_calculator(reactant, calc)
             self.reactant_calcs[reactant] = calc
 
         for product in self.reaction.product_mols:
             calc = self.reactants_or_products_calc(
                 product, mem, nprocshared, scratch, method, basis)
+            if self.registry:
+                calc = self.registry.get_calculator(product, calc)
             self.product_calcs[product] = calc
 
     def get_shell_calc(self, mem="5GB", nprocshared=20, scratch=".", method="m062x", basis="6-311+g(2df,2p)"):
@@ -216,7 +315,7 @@ class AutoTST_Gaussian(AutoTST_Calculator):
 
         calc = Gaussian(mem=mem,
                         nprocshared=nprocshared,
-                        label=label,
+                        label=get_label_path(scratch, label),
                         scratch=scratch,
                         method=method,
                         basis=basis,
@@ -247,7 +346,7 @@ class AutoTST_Gaussian(AutoTST_Calculator):
 
         calc = Gaussian(mem=mem,
                         nprocshared=nprocshared,
-                        label=label,
+                        label=get_label_path(scratch, label),
                         scratch=scratch,
                         method=method,
                         basis=basis,
@@ -267,7 +366,7 @@ class AutoTST_Gaussian(AutoTST_Calculator):
 
         calc = Gaussian(mem=mem,
                         nprocshared=nprocshared,
-                        label=label,
+                        label=get_label_path(scratch, label),
                         scratch=scratch,
                         method=method,
                         basis=basis,
@@ -286,7 +385,7 @@ class AutoTST_Gaussian(AutoTST_Calculator):
 
         calc = Gaussian(mem=mem,
                         nprocshared=nprocshared,
-                        label=label,
+                        label=get_label_path(scratch, label),
                         scratch=scratch,
                         method=method,
                         basis=basis,
@@ -299,7 +398,8 @@ class AutoTST_Gaussian(AutoTST_Calculator):
     def calculate(self, autotst_object, calc):
         """
         A method to perform a calculation given a calculator and an AutoTST
-        object. If the corresponding log file already exists, we will skip it
+        object. If the corresponding log file already exists, or an identical
+        job is found in the result cache, we will skip it
 
         :params:
         autotst_object: (AutoTST_Molecule, AutoTST_TS, AutoTST_Reaction) an
@@ -307,6 +407,34 @@ class AutoTST_Gaussian(AutoTST_Calculator):
         calc: (ase.calculators.calculator) the calculator that you want to run
         """
 
+        if not self.result_cache:
+            return self.run_calculation(autotst_object, calc)
+
+        # The key has to be found before the calculation updates the geometry
+        key = self.result_cache.get_key(autotst_object, calc)
+
+        old_log_path, new_log_path = self.get_log_paths(calc)
+
+        if not (os.path.exists(new_log_path) or os.path.exists(old_log_path)):
+            self.result_cache.fetch(key, new_log_path)
+
+        autotst_object, success = self.run_calculation(autotst_object, calc)
+
+        if success:
+            for log_path in [new_log_path, old_log_path]:
+                if os.path.exists(log_path):
+                    self.result_cache.store(key, log_path)
+                    break
+
+        return autotst_object, success
+
+    def run_calculation(self, autotst_object, calc):
+        """
+        A method that runs (or reads in the results of) a calculation for
+        `autotst_object` with `calc`. Use `calculate` rather than calling this
+        directly so that the result cache is checked first.
+        """
+
         def update_from_ase(autotst_obj, ase_object):
             """
             A function designed to update all objects based off of their ase objects
@@ -325,13 +453,7 @@ class AutoTST_Gaussian(AutoTST_Calculator):
 
             return autotst_obj
 
-        current_path = os.getcwd()
-        scratch_path = os.path.expanduser(
-            calc.scratch)
-
-        new_file_name = calc.label.replace(
-            "left", "(").replace("right", ")") + ".log"
-        old_file_name = calc.label + ".log"
+        old_path, new_path = self.get_log_paths(calc)
 
         if isinstance(autotst_object, AutoTST_Molecule):
             ase_object = autotst_object.ase_molecule
@@ -340,69 +462,51 @@ class AutoTST_Gaussian(AutoTST_Calculator):
         elif isinstance(autotst_object, AutoTST_TS):
             ase_object = autotst_object.ase_ts
 
-        os.chdir(scratch_path)
-
-        if os.path.exists(new_file_name):
+        if os.path.exists(new_path):
             # We found a finished file file... it should be fixed
             logging.info(
-                "Found previous file for {}, verifying it...".format(new_file_name))
-            complete, success = self.verify_output_file(new_file_name)
+                "Found previous file for {}, verifying it...".format(new_path))
+            complete, success = self.verify_output_file(new_path)
             if success:
                 logging.info("Old output file verified, reading it in...")
-                ase_object = read_gaussian_out(new_file_name)
+                ase_object = read_gaussian_out(new_path)
                 autotst_object = update_from_ase(autotst_object, ase_object)
-                os.chdir(current_path)
                 return autotst_object, True
 
             elif complete:
                 logging.info(
                     "Output file did not converge, attempting to run one last time...")
                 try:
-                    calc.calculate(ase_object)
+                    run_calculator(calc, ase_object)
                     ase_object = read_gaussian_out(
-                        old_file_name)
+                        old_path)
                     autotst_object = update_from_ase(
                         autotst_object, ase_object)
-                    os.chdir(current_path)
                     return autotst_object, True
 
                 except:  # TODO: add error for seg fault
-                    logging.info("{} failed... again...".format(new_file_name))
-                    os.chdir(current_path)
+                    logging.info("{} failed... again...".format(new_path))
                     return autotst_object, False
 
-            elif (new_file_name == old_file_name) and (not complete):
+            elif (new_path == old_path) and (not complete):
                 # The file names are identical and the job isn't complete yet
                 
                 logging.info(
                     "Job appears to be running for this calculation, waiting for it to complete...")
                 
-                from time import sleep
-
-                f = open(old_file_name)
-                lines = f.readlines()[:5]
-                for line in lines:
-                    if "Entering Link" in line:
-                        num = line.split()[-1][:-1]
-                scratch_file = "Gau-" + num + ".int"
-                while os.path.exists(scratch_file):
-                    sleep(60)
-                logging.info("Job complete, reading in results now by running calculate again...")
-
-                sleep(30) # waiting a lil while to make sure that the file is fixed... just in case...
+                self.wait_for_job(old_path)
                 try:
                     ase_object = read_gaussian_out(
-                        old_file_name)
+                        old_path)
                     autotst_object = update_from_ase(
                         autotst_object, ase_object)
-                    os.chdir(current_path)
                     return autotst_object, True
                 except IndexError:
                     logging.info("It appears that the previous log file wasn't finished... removing the files and rerunning")
-                    os.remove(old_file_name)
-                    os.remove(old_file_name.replace(".log", ".ase"))
-                    os.remove(old_file_name.replace(".log", ".com"))
-                    return self.calculate(autotst_object, calc)
+                    os.remove(old_path)
+                    os.remove(old_path[:-len(".log")] + ".ase")
+                    os.remove(old_path[:-len(".log")] + ".com")
+                    return self.run_calculation(autotst_object, calc)
 
             else:
                 logging.info(
@@ -410,37 +514,24 @@ class AutoTST_Gaussian(AutoTST_Calculator):
 
                 return autotst_object, False
 
-        elif os.path.exists(old_file_name):
-            complete, success = self.verify_output_file(old_file_name)
+        elif os.path.exists(old_path):
+            complete, success = self.verify_output_file(old_path)
 
             if not complete:
                 logging.info(
                     "Job appears to be running already, waiting for it to complete...")
                 
-                from time import sleep
-
-                f = open(old_file_name)
-                lines = f.readlines()[:5]
-                for line in lines:
-                    if "Entering Link" in line:
-                        num = line.split()[-1][:-1]
-                scratch_file = "Gau-" + num + ".int"
-                while os.path.exists(scratch_file):
-                    sleep(60)
-                logging.info("Job complete, reading in results now by running calculate again...")
+                self.wait_for_job(old_path)
 
-                sleep(30) # waiting a lil while to make sure that the file is fixed... just in case...
-
-                return self.calculate(autotst_object, calc)
+                return self.run_calculation(autotst_object, calc)
             
             else:
                 logging.info(
-                    "Found previous file for {}, verifying it...".format(old_file_name))
+                    "Found previous file for {}, verifying it...".format(old_path))
                 if success:
                     logging.info("Old output file verified, reading it in...")
-                    ase_object = read_gaussian_out(old_file_name)
+                    ase_object = read_gaussian_out(old_path)
                     autotst_object = update_from_ase(autotst_object, ase_object)
-                    os.chdir(current_path)
                     return autotst_object, True
                 else:
                     logging.info(
@@ -451,32 +542,58 @@ class AutoTST_Gaussian(AutoTST_Calculator):
         else:
             # File doesn't exist, running calculations
             logging.info(
-                "Starting calculation for {}...".format(new_file_name))
+                "Starting calculation for {}...".format(new_path))
             try:
-                calc.calculate(ase_object)
-                ase_object = read_gaussian_out(old_file_name)
+                run_calculator(calc, ase_object)
+                ase_object = read_gaussian_out(old_path)
                 autotst_object = update_from_ase(autotst_object, ase_object)
-                os.chdir(current_path)
                 return autotst_object, True
             except:  # TODO: add error for seg fault
                 # first calc failed, trying it once more
                 logging.info(
-                    "Failed first attempt for {}. Trying it once more...".format(new_file_name))
+                    "Failed first attempt for {}. Trying it once more...".format(new_path))
                 try:
-                    calc.calculate(ase_object)
-                    ase_object = read_gaussian_out(old_file_name)
+                    run_calculator(calc, ase_object)
+                    ase_object = read_gaussian_out(old_path)
                     autotst_object = update_from_ase(
                         autotst_object, ase_object)
-                    os.chdir(current_path)
                     return autotst_object, True
                 except:  # TODO: add error for seg fault
                     logging.info(
-                        "{} failed first and second attempt...".format(new_file_name))
-                    os.chdir(current_path)
+                        "{} failed first and second attempt...".format(new_path))
                     return autotst_object, False
 
+    def get_log_paths(self, calc):
+        """
+        Returns the absolute path of the log file for `calc` as Gaussian writes
+        it, and as it is named once `fix_io_file` has turned the `left` and
+        `right` text back into parentheses.
+        """
+        directory = os.path.abspath(os.path.expanduser(calc.directory))
+        old_path = os.path.join(directory, calc.prefix + ".log")
+        new_path = os.path.join(directory, calc.prefix.replace(
+            "left", "(").replace("right", ")") + ".log")
+        return old_path, new_path
+
+    def wait_for_job(self, path):
+        """
+        A method that blocks until the Gaussian job writing the log file at
+        `path` has finished, by watching for its scratch file to disappear.
+        """
+        from time import sleep
 
+        directory = os.path.dirname(path)
+        with open(path) as f:
+            lines = f.readlines()[:5]
+        for line in lines:
+            if "Entering Link" in line:
+                num = line.split()[-1][:-1]
+        scratch_file = os.path.join(directory, "Gau-" + num + ".int")
+        while os.path.exists(scratch_file):
+            sleep(60)
+        logging.info("Job complete, reading in results now by running calculate again...")
 
+        sleep(30) # waiting a lil while to make sure that the file is fixed... just in case...
 
     def verify_output_file(self, path):
         """
@@ -501,7 +618,14 @@ class AutoTST_Gaussian(AutoTST_Calculator):
         return verified
 
     def run_rotors(self, calculators, autotst_object):
+        """
+        A method to run the hindered rotor scan of every torsion of
+        `autotst_object` with `calculators` (see `get_rotor_calcs`). Scans
+        that fail verification are renamed to `-failed.log`.
 
+        Returns a dictionary of the log file of each scan that failed and why
+        (a message, or the exception that was raised).
+        """
         assert len(calculators) == len(
             autotst_object.torsions), "Incorrectly matched calculators to molecule..."
 
@@ -512,22 +636,52 @@ class AutoTST_Gaussian(AutoTST_Calculator):
         elif isinstance(autotst_object, AutoTST_TS):
             ase_object = autotst_object.ase_ts
 
-        for torsion in autotst_object.torsions:
+        def run_rotor(torsion):
+            "Runs the scan of `torsion`, and returns None if it succeeded or why it failed"
             i, j, k, l = torsion.indices
             calc = calculators[(j, k)]
+            path, _ = self.get_log_paths(calc)
+            failed_path = path.replace(".log", "-failed.log")
+            if os.path.exists(path):
+                logging.info("The rotor scan {} has already been run".format(path))
+                return None
+            if os.path.exists(failed_path):
+                logging.info("The rotor scan {} has already been run and failed".format(path))
+                return "The scan failed verification in an earlier run"
+
             try:
-                calc.calculate(ase_object)
-            except:
-                pass
+                run_calculator(calc, ase_object)
+            except Exception as e:
+                logging.error("The rotor scan {} failed:".format(path))
+                logging.exception(e)
+                if not os.path.exists(path):
+                    return e
 
-            path = os.path.join(calc.scratch, calc.label + ".log")
+            if not os.path.exists(path):
+                logging.info("The rotor scan {} did not produce a log file".format(path))
+                return "The scan did not produce a log file"
 
             if not (self.verify_rotor(path) and self.verify_output_file(path)):
                 logging.info(
                     "Could not verify the rotor, this file will not be included in calculations.")
-                logging.info("File {} renamed as {}...".format(
-                    path, path.replace(".log", "-failed.log")))
-                os.rename(path, path.replace(".log", "-failed.log"))
+                logging.info("File {} renamed as {}...".format(path, failed_path))
+                os.rename(path, failed_path)
+                return "The scan could not be verified"
+            return None
+
+        torsions = autotst_object.torsions
+        results = run_jobs(run_rotor, [(torsion,) for torsion in torsions])
+
+        failures = {}
+        for torsion, result in zip(torsions, results):
+            if result is not None:
+                i, j, k, l = torsion.indices
+                path, _ = self.get_log_paths(calculators[(j, k)])
+                failures[path] = result
+        if failures:
+            logging.warning("{0} of the {1} rotor scans of {2} failed".format(
+                len(failures), len(torsions), autotst_object))
+        return failures
 
     def verify_rotor(self, path):
         "This could be extrapolated to the general calculators class...?"
@@ -546,27 +700,106 @@ class AutoTST_Gaussian(AutoTST_Calculator):
         results.append(smallest)
 
         if ((results[0] - results[-1] < 1e-5) and # The energy difference is less than 1e-5 eV
-            (((parser.converged_geometries[0] - parser.converged_geometries[i]) ** 2).mean() < 0.01)): # the RMSE between initial and final geometries is less than 1%
+            (((parser.converged_geometries[0] - parser.converged_geometries[-1]) ** 2).mean() < 0.01)): # the RMSE between initial and final geometries is less than 1%
             return True
 
         else:
             return False
 
+    def run_hindered_rotors(self):
+        """
+        A method to run the hindered rotor scans of every reactant, product and
+        the TS, all at the same time if `set_max_jobs` has set a limit and one
+        after another otherwise. Scans that fail verification are renamed to
+        `-failed.log` so CanTherm leaves them out.
+
+        Returns a dictionary of the log file of each scan that failed and why
+        (see `run_rotors`).
+        """
+        autotst_objects = []
+        smiles = []
+        for mol in self.reaction.reactant_mols + self.reaction.product_mols:
+            if mol.smiles in smiles:
+                continue
+            smiles.append(mol.smiles)
+            autotst_objects.append(mol)
+        autotst_objects.append(self.reaction.ts)
+
+        arguments = []
+        for autotst_object in autotst_objects:
+            calculators = self.get_rotor_calcs(
+                autotst_object, self.mem, self.nprocshared, self.scratch, self.method, self.basis)
+            arguments.append((calculators, autotst_object))
+
+        failures = {}
+        for (calculators, autotst_object), result in zip(arguments, run_jobs(self.run_rotors, arguments)):
+            if isinstance(result, Exception):
+                # Every scan of this species or TS counts as failed
+                for calc in calculators.values():
+                    path, _ = self.get_log_paths(calc)
+                    failures[path] = result
+            else:
+                failures.update(result)
+        return failures
+
     def run_reactants_and_products(self):
         "A method to run the calculations for all reactants and products"
 
         bools = []
         for mol, calc in self.reactant_calcs.iteritems():
-            mol, b = self.calculate(mol, calc)
-            self.fix_io_file(calc)
-            bools.append(b)
+            bools.append(self.run_species(mol, calc))
 
         for mol, calc in self.product_calcs.iteritems():
+            bools.append(self.run_species(mol, calc))
+
+        return np.array(bools).all()
+
+    def run_species(self, mol, calc):
+        """
+        A method to run the calculation for a single reactant or product.
+
+        With a registry, only the first reaction to ask for a species runs it;
+        every other reaction waits for that job and copies its geometry. The
+        shared calculator may belong to a reaction with another scratch
+        directory, so its log file is then copied into this one's scratch,
+        where CanTherm looks for it.
+        """
+        if not self.registry:
             mol, b = self.calculate(mol, calc)
             self.fix_io_file(calc)
-            bools.append(b)
+            return b
 
-        return np.array(bools).all()
+        def job():
+            result, b = self.calculate(mol, calc)
+            self.fix_io_file(calc)
+            return result.ase_molecule.copy(), b
+
+        outcome = self.registry.run(mol, calc, job)
+        if outcome is None:
+            return False
+
+        ase_object, b = outcome
+        update_from_ase(mol, ase_object.copy())
+        if b:
+            self.copy_log_to_scratch(calc)
+        return b
+
+    def copy_log_to_scratch(self, calc):
+        """
+        A method that copies the log file of `calc` into this calculator's
+        scratch directory, if `calc` ran somewhere else and it isn't there yet.
+        """
+        _, log_path = self.get_log_paths(calc)
+        scratch_path = os.path.join(os.path.abspath(os.path.expanduser(self.scratch)),
+                                    os.path.basename(log_path))
+        if scratch_path == log_path or os.path.exists(scratch_path):
+            return
+        if not os.path.exists(log_path):
+            logging.info("The shared log file {} doesn't exist, so it can't be copied to {}".format(
+                log_path, self.scratch))
+            return
+        logging.info("Copying the shared log file {} to {}".format(log_path, self.scratch))
+        shutil.copy2(log_path, scratch_path)
 
     def run_shell(self):
         "A method to run the shell optimization with the reaction center frozen"
@@ -593,101 +826,67 @@ class AutoTST_Gaussian(AutoTST_Calculator):
         "A method to run the IRC calculation"
         logging.info("Running IRC calculation")
 
-        current_path = os.getcwd()
-        scratch_path = os.path.expanduser(
-            self.irc_calc.scratch)
-
-        new_file_name = self.irc_calc.label.replace(
-            "left", "(").replace("right", ")") + ".log"
-        old_file_name = self.irc_calc.label + ".log"
+        old_path, new_path = self.get_log_paths(self.irc_calc)
 
-        os.chdir(scratch_path)
-        if os.path.exists(new_file_name):
+        if os.path.exists(new_path):
             logging.info("It seems that an old IRC has been run, seeing if it's complete...")
-            if self.verify_output_file(new_file_name):
+            complete, success = self.verify_output_file(new_path)
+            if success:
                 logging.info("Previous IRC complete and resulted in Normal Termination, verifying it...")
-                os.chdir(current_path)
 
             else:
                 logging.info("Previous IRC was not successful or incomplete... Rerunning it...")
                 try:
-                    self.irc_calc.calculate(self.reaction.ts.ase_ts)
+                    run_calculator(self.irc_calc, self.reaction.ts.ase_ts)
                 except:
-                    # This normally fails because of an issue with ase's `read_results` method.
-                    os.chdir(current_path)
                     pass
                 logging.info("IRC calc complete!")
         else:
             logging.info("No previous IRC clac has been run, starting a new one...")
             try:
-                self.irc_calc.calculate(self.reaction.ts.ase_ts)
+                run_calculator(self.irc_calc, self.reaction.ts.ase_ts)
             except:
-                # This normally fails because of an issue with ase's `read_results` method.
-                os.chdir(current_path)
                 pass
             logging.info("IRC calc complete!")
 
     def validate_irc(self):  # TODO: need to add more verification here
         logging.info("Validating IRC file...")
-        irc_path = os.path.join(self.irc_calc.scratch,
-                                self.irc_calc.label + ".log")
+        irc_path, fixed_irc_path = self.get_log_paths(self.irc_calc)
         if not os.path.exists(irc_path):
             logging.info(
                 "It seems that the file was `fixed`, reading in the `fixed` version.")
-            irc_path = irc_path.replace("left", "(").replace("right", ")")
+            irc_path = fixed_irc_path
 
             if not os.path.exists(irc_path):
                 logging.info(
                     "It seems that the IRC claculation has not been run.")
                 return False
 
-        f = open(irc_path, "r")
-        file_lines = f.readlines()[-5:]
+        irc_parse = read_irc_endpoints(irc_path)
 
-        completed = False
-        for file_line in file_lines:
-            if " Normal termination" in file_line:
-                logging.info("IRC successfully ran")
-                completed = True
-        if completed == False:
+        if irc_parse.success:
+            logging.info("IRC successfully ran")
+        else:
             logging.info("IRC failed... could not be validated...")
             return False
 
-        pth1 = list()
-        steps = list()
-        with open(irc_path) as outputFile:
-            for line in outputFile:
-                line = line.strip()
-
-                if line.startswith('Point Number:'):
-                    if int(line.split()[2]) > 0:
-                        if int(line.split()[-1]) == 1:
-                            ptNum = int(line.split()[2])
-                            pth1.append(ptNum)
-                        else:
-                            pass
-                elif line.startswith('# OF STEPS ='):
-                    numStp = int(line.split()[-1])
-                    steps.append(numStp)
-        # This indexes the coordinate to be used from the parsing
-        if steps == []:
+        if irc_parse.irc_steps == []:
             logging.error('No steps taken in the IRC calculation!')
             return False
+        elif len(irc_parse.atomcoords) != 2:
+            logging.error('Could not find both ends of the IRC!')
+            return False
         else:
-            pth1End = sum(steps[:pth1[-1]])
             # Compare the reactants and products
-            ircParse = ccread(irc_path)
-            # cf. http://cclib.sourceforge.net/wiki/index.php/Using_cclib#Additional_information
-
-            atomcoords = ircParse.atomcoords
-            atomnos = ircParse.atomnos
+            atomcoords = irc_parse.atomcoords
+            atomnos = irc_parse.atomnos
             # Convert the IRC geometries into RMG molecules
             # We don't know which is reactant or product, so take the two at the end of the
             # paths and compare to the reactants and products
             mol1 = Molecule()
-            mol1.fromXYZ(atomnos, atomcoords[pth1End])
+            mol1.fromXYZ(atomnos, atomcoords[0])
             mol2 = Molecule()
-            mol2.fromXYZ(atomnos, atomcoords[-1])
+            mol2.fromXYZ(atomnos, atomcoords[1])
 
             testReaction = Reaction(
                 reactants=mol1.split(),
@@ -744,14 +943,16 @@ class AutoTST_Gaussian(AutoTST_Calculator):
         if not overall:
             return result
 
-        vib = Vibrational_Analysis(
-            reaction=self.reaction, scratch=self.scratch)
-        logging.info("Performing Vibrational Analysis...")
-        if vibrational_analysis and vib.validate_ts():
+        if vibrational_analysis:
+            vib = Vibrational_Analysis(
+                reaction=self.reaction, scratch=self.scratch)
+            logging.info("Performing Vibrational Analysis...")
+            validated = vib.validate_ts()
+        if vibrational_analysis and validated:
             logging.info(
                 "Vibrational analysis successful! Successfully arrived at a TS.")
             result = True
-        elif vibrational_analysis and not vib.validate_ts():
+        elif vibrational_analysis and not validated:
             logging.info(
                 "Could not validate via vibrational analysis... \nRunning IRC instead...")
             self.run_irc()
@@ -777,26 +978,16 @@ class AutoTST_Gaussian(AutoTST_Calculator):
         A method that removes the `left` and `right` text from a log, ase, and
         com files and turns it back into a smiles structure
         """
-        old_log_file = calc.label + ".log"
-        old_log_path = os.path.join(calc.scratch, old_log_file)
-        if os.path.exists(old_log_path):
-            new_log_path = old_log_path.replace(
-                "left", "(").replace("right", ")")
-            os.rename(old_log_path, new_log_path)
-
-        old_ase_file = calc.label + ".ase"
-        old_ase_path = os.path.join(calc.scratch, old_ase_file)
-        if os.path.exists(old_ase_path):
-            new_ase_path = old_ase_path.replace(
-                "left", "(").replace("right", ")")
-            os.rename(old_ase_path, new_ase_path)
-
-        old_com_file = calc.label + ".com"
-        old_com_path = os.path.join(calc.scratch, old_com_file)
-        if os.path.exists(old_com_path):
-            new_com_path = old_com_path.replace(
-                "left", "(").replace("right", ")")
-            os.rename(old_com_path, new_com_path)
+        directory = os.path.abspath(os.path.expanduser(calc.directory))
+        fixed_prefix = calc.prefix.replace("left", "(").replace("right", ")")
+        if fixed_prefix == calc.prefix:
+            return
+
+        for extension in [".log", ".ase", ".com"]:
+            old_path = os.path.join(directory, calc.prefix + extension)
+            if os.path.exists(old_path):
+                new_path = os.path.join(directory, fixed_prefix + extension)
+                os.rename(old_path, new_path)
 
     def fix_io_files(self):
         """
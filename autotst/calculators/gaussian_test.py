@@ -0,0 +1,130 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+################################################################################
+#
+#   AutoTST - Automated Transition State Theory
+#
+#   Copyright (c) 2015-2018 Prof. Richard H. West (r.west@northeastern.edu)
+#
+#   Permission is hereby granted, free of charge, to any person obtaining a
+#   copy of this software and associated documentation files (the 'Software'),
+#   to deal in the Software without restriction, including without limitation
+#   the rights to use, copy, modify, merge, publish, distribute, sublicense,
+#   and/or sell copies of the Software, and to permit persons to whom the
+#   Software is furnished to do so, subject to the following conditions:
+#
+#   The above copyright notice and this permission notice shall be included in
+#   all copies or substantial portions of the Software.
+#
+#   THE SOFTWARE IS PROVIDED 'AS IS', WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#   IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#   FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#   AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#   LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+#   FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+#   DEALINGS IN THE SOFTWARE.
+#
+################################################################################
+
+
+import os
+import time
+import shutil
+import tempfile
+import threading
+import unittest
+
+from autotst.molecule import AutoTST_Molecule
+from autotst.calculators.gaussian import AutoTST_Gaussian, run_jobs, set_max_jobs
+from autotst.calculators.registry import SpeciesRegistry
+from autotst.calculators.species_keys import get_inchikey
+
+
+class SpeciesGaussian(AutoTST_Gaussian):
+    """
+    An AutoTST_Gaussian that only has a scratch directory and a registry, and
+    writes a log file instead of running Gaussian
+    """
+
+    def __init__(self, scratch, registry):
+        self.scratch = scratch
+        self.registry = registry
+        self.calculations = 0
+
+    def calculate(self, autotst_object, calc):
+        self.calculations += 1
+        _, log_path = self.get_log_paths(calc)
+        with open(log_path, "w") as f:
+            f.write(" Normal termination of Gaussian 09\n")
+        return autotst_object, True
+
+
+class TestRunSpecies(unittest.TestCase):
+
+    def setUp(self):
+        self.directories = [tempfile.mkdtemp(), tempfile.mkdtemp()]
+
+    def tearDown(self):
+        for directory in self.directories:
+            shutil.rmtree(directory)
+
+    def test_shared_species(self):
+        "A species shared by reactions in two scratch directories should run once and be in both"
+        registry = SpeciesRegistry()
+        mol = AutoTST_Molecule("CC")
+        gaussians = [SpeciesGaussian(directory, registry) for directory in self.directories]
+        calcs = [registry.get_calculator(mol, gaussian.reactants_or_products_calc(mol, scratch=gaussian.scratch))
+                 for gaussian in gaussians]
+        self.assertIs(calcs[0], calcs[1])
+
+        # The second reaction runs the job with the first reaction's calculator
+        for gaussian, calc in reversed(zip(gaussians, calcs)):
+            self.assertTrue(gaussian.run_species(mol, calc))
+
+        self.assertEqual(sum(gaussian.calculations for gaussian in gaussians), 1)
+        for directory in self.directories:
+            log_path = os.path.join(directory, get_inchikey("CC") + ".log")
+            self.assertTrue(os.path.exists(log_path))
+
+
+class TestRunJobs(unittest.TestCase):
+
+    def setUp(self):
+        self.lock = threading.Lock()
+        self.running = 0
+        self.most_running = 0
+
+    def tearDown(self):
+        set_max_jobs(None)
+
+    def job(self, number):
+        with self.lock:
+            self.running += 1
+            self.most_running = max(self.most_running, self.running)
+        time.sleep(0.05)
+        with self.lock:
+            self.running -= 1
+        if number == 2:
+            raise ValueError("job 2 failed")
+        return number * 10
+
+    def test_without_limit(self):
+        "Without a job limit the jobs should run one at a time"
+        set_max_jobs(None)
+        results = run_jobs(self.job, [(number,) for number in range(4)])
+        self.assertEqual(self.most_running, 1)
+        self.assertEqual(results[:2] + results[3:], [0, 10, 30])
+        self.assertIsInstance(results[2], ValueError)
+
+    def test_with_limit(self):
+        "With a job limit the jobs should run in threads, and errors should be returned"
+        set_max_jobs(2)
+        results = run_jobs(self.job, [(number,) for number in range(4)])
+        self.assertGreater(self.most_running, 1)
+        self.assertEqual(results[:2] + results[3:], [0, 10, 30])
+        self.assertIsInstance(results[2], ValueError)
+
+
+if __name__ == "__main__":
+    unittest.main(testRunner=unittest.TextTestRunner(verbosity=2))
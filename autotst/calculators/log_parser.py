@@ -0,0 +1,346 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+################################################################################
+#
+#   AutoTST - Automated Transition State Theory
+#
+#   Copyright (c) 2015-2018 Prof. Richard H. West (r.west@northeastern.edu)
+#
+#   Permission is hereby granted, free of charge, to any person obtaining a
+#   copy of this software and associated documentation files (the 'Software'),
+#   to deal in the Software without restriction, including without limitation
+#   the rights to use, copy, modify, merge, publish, distribute, sublicense,
+#   and/or sell copies of the Software, and to permit persons to whom the
+#   Software is furnished to do so, subject to the following conditions:
+#
+#   The above copyright notice and this permission notice shall be included in
+#   all copies or substantial portions of the Software.
+#
+#   THE SOFTWARE IS PROVIDED 'AS IS', WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#   IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#   FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#   AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#   LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+#   FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+#   DEALINGS IN THE SOFTWARE.
+#
+################################################################################
+
+"""
+A single pass parser for the Gaussian log files that AutoTST produces.
+
+Everything that the post-processing steps need (geometries, energies,
+frequencies, normal mode displacements, IRC points and the termination status)
+is read in one sweep over the file, and the results are memoized per file so
+that `QMData`, `Vibrational_Analysis` and the IRC validation all share one
+parse.
+"""
+
+import os
+import logging
+import multiprocessing
+import numpy as np
+
+# Same conversion factor as cclib so energies match the old `ccread` results
+HARTREE_TO_EV = 27.21138505
+
+_log_cache = {}
+
+
+class GaussianLogData():
+    """
+    A container for the information parsed out of a Gaussian log file.
+
+    The attribute names follow cclib where there is an equivalent:
+
+    * atomnos (array): atomic numbers of the atoms
+    * atomcoords (array): every geometry in the file, in angstroms
+    * atommasses (array): atomic masses from the thermochemistry section
+    * scfenergies (array): every SCF energy in the file, in eV
+    * vibfreqs (array): the frequencies of the last frequency job, in cm^-1
+    * vibdisps (array): the normal mode displacements for `vibfreqs`
+    * rotconsts (array): every set of rotational constants in the file, in GHz
+    * zpve (float): the zero-point correction of the last frequency job, in Hartree
+    * mult (int) and charge (int): as given in the input section
+    * functional (str): the method used for the SCF, eg. `M062X`
+    * irc_points (list): (point number, path number) of each converged IRC point
+    * irc_steps (list): number of optimization steps taken for each IRC point
+    * termination (str): `normal`, `error` or None if the job hasn't finished
+    * pid (str): the process id of the Gaussian job that wrote the file
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.atomnos = np.array([])
+        self.atomcoords = np.array([])
+        self.atommasses = np.array([])
+        self.scfenergies = np.array([])
+        self.vibfreqs = np.array([])
+        self.vibdisps = np.array([])
+        self.rotconsts = np.array([])
+        self.zpve = None
+        self.mult = None
+        self.charge = None
+        self.functional = None
+        self.irc_points = []
+        self.irc_steps = []
+        self.termination = None
+        self.pid = None
+
+    def __repr__(self):
+        return '<Gaussian Log Data "{0}">'.format(self.path)
+
+    @property
+    def complete(self):
+        "True if the job has terminated, normally or not"
+        return self.termination is not None
+
+    @property
+    def success(self):
+        "True if the job ended in a Normal termination"
+        return self.termination == "normal"
+
+
+def read_orientation(log_file):
+    """
+    Reads the body of an `Input orientation:` or `Standard orientation:` block
+    and returns the atomic numbers and coordinates found in it.
+    """
+    for _ in range(4):  # dashes, two lines of column titles and more dashes
+        next(log_file)
+
+    numbers = []
+    coords = []
+    for line in log_file:
+        if line.startswith(" ---"):
+            break
+        split = line.split()
+        numbers.append(int(split[1]))
+        coords.append([float(value) for value in split[-3:]])
+
+    return numbers, coords
+
+
+def parse_gaussian_log(path):
+    """
+    A function that walks through a Gaussian log file exactly once and returns
+    a GaussianLogData object with everything AutoTST uses.
+    """
+    data = GaussianLogData(path)
+
+    numbers = []
+    input_coords = []
+    standard_coords = []
+    scfenergies = []
+    atommasses = []
+    vibfreqs = []
+    vibdisps = []
+    rotconsts = []
+
+    with open(path) as log_file:
+        for line in log_file:
+
+            if line.startswith(" Entering Gaussian System") or line.startswith(" Link1:"):
+                # A new job step is starting, so the previous termination doesn't count
+                data.termination = None
+
+            elif line.startswith(" Entering Link 1") and data.pid is None:
+                data.pid = line.split()[-1][:-1]
+
+            elif line.startswith(" Charge =") and "Multiplicity" in line:
+                split = line.split()
+                data.charge = int(split[2])
+                data.mult = int(split[5])
+
+            elif "Input orientation:" in line or "Z-Matrix orientation:" in line:
+                numbers, coords = read_orientation(log_file)
+                input_coords.append(coords)
+
+            elif "Standard orientation:" in line:
+                numbers, coords = read_orientation(log_file)
+                standard_coords.append(coords)
+
+            elif line.startswith(" SCF Done:"):
+                split = line.split()
+                method = split[2]
+                data.functional = method[method.index("(") + 2:method.rindex(")")]
+                scfenergies.append(float(split[4]) * HARTREE_TO_EV)
+
+            elif line.startswith(" Harmonic frequencies"):
+                # Only keep the frequencies from the last frequency job
+                vibfreqs = []
+                vibdisps = []
+
+            elif line.startswith(" Frequencies --"):
+                freqs = [float(value) for value in line.split("--")[1].split()]
+                vibfreqs.extend(freqs)
+
+                for line in log_file:
+                    if line.startswith("  Atom  AN"):
+                        break
+                displacements = [[] for _ in freqs]
+                for line in log_file:
+                    split = line.split()
+                    if len(split) != 2 + 3 * len(freqs):
+                        break
+                    for i in range(len(freqs)):
+                        displacements[i].append(
+                            [float(value) for value in split[2 + 3 * i:5 + 3 * i]])
+                vibdisps.extend(displacements)
+
+            elif line.startswith(" Rotational constants (GHZ):"):
+                constants = []
+                for value in line.split(":")[1].split():
+                    try:
+                        constants.append(float(value))
+                    except ValueError:  # printed as asterisks for linear molecules
+                        constants.append(0.0)
+                rotconsts.append(constants)
+
+            elif line.startswith(" Zero-point correction="):
+                data.zpve = float(line.split()[2])
+
+            elif line.startswith(" Atom ") and "has atomic number" in line:
+                split = line.split()
+                if int(split[1]) == 1:
+                    atommasses = []
+                atommasses.append(float(split[-1]))
+
+            elif line.lstrip().startswith("Point Number:"):
+                split = line.split()
+                data.irc_points.append((int(split[2]), int(split[-1])))
+
+            elif line.lstrip().startswith("# OF STEPS ="):
+                data.irc_steps.append(int(line.split()[-1]))
+
+            elif line.startswith(" Normal termination"):
+                data.termination = "normal"
+
+            elif line.startswith(" Error termination"):
+                data.termination = "error"
+
+    # Like cclib, prefer the standard orientation unless `nosymm` was used
+    if standard_coords:
+        data.atomcoords = np.array(standard_coords)
+    else:
+        data.atomcoords = np.array(input_coords)
+    data.atomnos = np.array(numbers)
+    data.atommasses = np.array(atommasses)
+    data.scfenergies = np.array(scfenergies)
+    data.vibfreqs = np.array(vibfreqs)
+    data.vibdisps = np.array(vibdisps)
+    data.rotconsts = np.array(rotconsts)
+
+    return data
+
+
+def read_gaussian_log(path):
+    """
+    Returns the GaussianLogData for `path`, parsing the file only if it hasn't
+    been parsed before or if it has changed on disk since it was parsed.
+    """
+    path = os.path.abspath(path)
+    stat = os.stat(path)
+    stamp = (stat.st_mtime, stat.st_size)
+
+    cached = _log_cache.get(path)
+    if cached and cached[0] == stamp:
+        return cached[1]
+
+    logging.info("Parsing Gaussian log file {}".format(path))
+    data = parse_gaussian_log(path)
+    _log_cache[path] = (stamp, data)
+    return data
+
+
+def read_irc_endpoints(path):
+    """
+    A function that streams through a Gaussian IRC log file and returns a
+    GaussianLogData in which `atomcoords` only holds the two endpoints of the
+    IRC: the last converged point of path 1 and the last geometry of path 2.
+
+    Only the latest geometry and the endpoints are ever kept in memory, so
+    this is much lighter than `parse_gaussian_log` on large IRC logs. The
+    result isn't memoized.
+    """
+    data = GaussianLogData(path)
+
+    numbers = []
+    latest = {"input": None, "standard": None}
+    path1_end = {"input": None, "standard": None}
+
+    with open(path) as log_file:
+        for line in log_file:
+
+            if line.startswith(" Entering Gaussian System") or line.startswith(" Link1:"):
+                data.termination = None
+
+            elif "Input orientation:" in line or "Z-Matrix orientation:" in line:
+                numbers, latest["input"] = read_orientation(log_file)
+
+            elif "Standard orientation:" in line:
+                numbers, latest["standard"] = read_orientation(log_file)
+
+            elif line.lstrip().startswith("Point Number:"):
+                split = line.split()
+                point, path_number = int(split[2]), int(split[-1])
+                data.irc_points.append((point, path_number))
+                if point > 0 and path_number == 1:
+                    # The geometry printed just before the summary is the converged point
+                    path1_end = dict(latest)
+
+            elif line.lstrip().startswith("# OF STEPS ="):
+                data.irc_steps.append(int(line.split()[-1]))
+
+            elif line.startswith(" Normal termination"):
+                data.termination = "normal"
+
+            elif line.startswith(" Error termination"):
+                data.termination = "error"
+
+    # Like `parse_gaussian_log`, prefer the standard orientation if there is one
+    if latest["standard"] is not None:
+        orientation = "standard"
+    else:
+        orientation = "input"
+    endpoints = [path1_end[orientation], latest[orientation]]
+    data.atomcoords = np.array([coords for coords in endpoints if coords is not None])
+    data.atomnos = np.array(numbers)
+
+    return data
+
+
+def read_gaussian_logs(paths, processes=None):
+    """
+    Returns the GaussianLogData of every file in `paths`. Files that aren't
+    memoized yet are parsed in `processes` worker processes (one per CPU by
+    default) and then memoized like `read_gaussian_log` would.
+    """
+    paths = [os.path.abspath(path) for path in paths]
+    stamps = {}
+    to_parse = []
+    for path in paths:
+        stat = os.stat(path)
+        stamps[path] = (stat.st_mtime, stat.st_size)
+        cached = _log_cache.get(path)
+        if not (cached and cached[0] == stamps[path]) and path not in to_parse:
+            to_parse.append(path)
+
+    if to_parse:
+        logging.info("Parsing {} Gaussian log files".format(len(to_parse)))
+        pool = multiprocessing.Pool(processes)
+        try:
+            parsed = pool.map(parse_gaussian_log, to_parse)
+        finally:
+            pool.close()
+            pool.join()
+        for path, data in zip(to_parse, parsed):
+            _log_cache[path] = (stamps[path], data)
+
+    return [_log_cache[path][1] for path in paths]
+
+
+def clear_log_cache():
+    "Forget every memoized log file"
+    _log_cache.clear()
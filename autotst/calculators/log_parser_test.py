@@ -0,0 +1,88 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+################################################################################
+#
+#   AutoTST - Automated Transition State Theory
+#
+#   Copyright (c) 2015-2018 Prof. Richard H. West (r.west@northeastern.edu)
+#
+#   Permission is hereby granted, free of charge, to any person obtaining a
+#   copy of this software and associated documentation files (the 'Software'),
+#   to deal in the Software without restriction, including without limitation
+#   the rights to use, copy, modify, merge, publish, distribute, sublicense,
+#   and/or sell copies of the Software, and to permit persons to whom the
+#   Software is furnished to do so, subject to the following conditions:
+#
+#   The above copyright notice and this permission notice shall be included in
+#   all copies or substantial portions of the Software.
+#
+#   THE SOFTWARE IS PROVIDED 'AS IS', WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#   IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#   FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#   AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#   LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+#   FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+#   DEALINGS IN THE SOFTWARE.
+#
+################################################################################
+
+import os
+import unittest
+import numpy as np
+from cclib.io import ccread
+
+from autotst import settings
+from autotst.calculators.log_parser import parse_gaussian_log, read_irc_endpoints
+
+EXAMPLE_DIRECTORY = os.path.join(os.path.dirname(settings["autotst_path"]), "examples",
+                                 "[CH]=CC=C+[O]O_OO+[CH]=C[C]=C", "gaussian_example")
+TS_LOG = os.path.join(EXAMPLE_DIRECTORY, "CC=C(C)C+[O]O_[CH2]C=C(C)C+OO.log")
+IRC_LOG = os.path.join(EXAMPLE_DIRECTORY, "CC=C(C)C+[O]O_[CH2]C=C(C)C+OO_irc.log")
+
+
+class TestLogParser(unittest.TestCase):
+
+    def test_parse_gaussian_log(self):
+        "The single pass parser should agree with cclib"
+        data = parse_gaussian_log(TS_LOG)
+        reference = ccread(TS_LOG)
+
+        self.assertTrue(data.success)
+        self.assertTrue(np.array_equal(data.atomnos, reference.atomnos))
+        self.assertTrue(np.allclose(data.atomcoords[-1], reference.atomcoords[-1]))
+        self.assertTrue(np.allclose(data.scfenergies, reference.scfenergies))
+        self.assertTrue(np.allclose(data.vibfreqs, reference.vibfreqs))
+        self.assertTrue(np.allclose(data.vibdisps, reference.vibdisps))
+        self.assertEqual(data.mult, reference.mult)
+
+    def test_read_irc_endpoints(self):
+        "The IRC endpoints should be the geometries that cclib gives for them"
+        data = read_irc_endpoints(IRC_LOG)
+        reference = ccread(IRC_LOG)
+
+        self.assertTrue(data.success)
+        self.assertEqual(data.atomcoords.shape, (2, len(reference.atomnos), 3))
+        self.assertTrue(np.array_equal(data.atomnos, reference.atomnos))
+
+        # The end of path 1 is found like `validate_irc` used to find it
+        path1 = [point for point, path in data.irc_points if point > 0 and path == 1]
+        path1_end = sum(data.irc_steps[:path1[-1]])
+        self.assertTrue(np.allclose(data.atomcoords[0], reference.atomcoords[path1_end]))
+        self.assertTrue(np.allclose(data.atomcoords[1], reference.atomcoords[-1]))
+
+    def test_irc_endpoints_match_full_parse(self):
+        "Streaming the IRC should give the same endpoints as the full parse"
+        endpoints = read_irc_endpoints(IRC_LOG)
+        data = parse_gaussian_log(IRC_LOG)
+
+        self.assertEqual(endpoints.irc_points, data.irc_points)
+        self.assertEqual(endpoints.irc_steps, data.irc_steps)
+        path1 = [point for point, path in data.irc_points if point > 0 and path == 1]
+        self.assertTrue(np.allclose(endpoints.atomcoords[0],
+                                    data.atomcoords[sum(data.irc_steps[:path1[-1]])]))
+        self.assertTrue(np.allclose(endpoints.atomcoords[1], data.atomcoords[-1]))
+
+
+if __name__ == "__main__":
+    unittest.main(testRunner=unittest.TextTestRunner(verbosity=2))
@@ -0,0 +1,120 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+################################################################################
+#
+#   AutoTST - Automated Transition State Theory
+#
+#   Copyright (c) 2015-2018 Prof. Richard H. West (r.west@northeastern.edu)
+#
+#   Permission is hereby granted, free of charge, to any person obtaining a
+#   copy of this software and associated documentation files (the 'Software'),
+#   to deal in the Software without restriction, including without limitation
+#   the rights to use, copy, modify, merge, publish, distribute, sublicense,
+#   and/or sell copies of the Software, and to permit persons to whom the
+#   Software is furnished to do so, subject to the following conditions:
+#
+#   The above copyright notice and this permission notice shall be included in
+#   all copies or substantial portions of the Software.
+#
+#   THE SOFTWARE IS PROVIDED 'AS IS', WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#   IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#   FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#   AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#   LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+#   FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+#   DEALINGS IN THE SOFTWARE.
+#
+################################################################################
+
+import logging
+import threading
+
+from autotst.calculators.result_cache import get_calculation_key
+
+
+def get_species_key(mol, calc):
+    """
+    A function that returns the key used to identify a reactant or product
+    calculation. It is the same key that GaussianResultCache files results
+    under (a hash of the species' canonical SMILES, charge, multiplicity,
+    method, basis and route keywords), so it doesn't depend on the label or
+    scratch directory of the calculation. Reactions with another scratch
+    directory than the calculation that ran get a copy of its log file (see
+    `AutoTST_Gaussian.run_species`).
+    """
+    return get_calculation_key(mol, calc)
+
+
+class SpeciesJob():
+    """
+    A container for a single species calculation that any number of reactions
+    can wait on.
+    """
+
+    def __init__(self, key):
+        self.key = key
+        self.result = None
+        self.finished = threading.Event()
+
+    def __repr__(self):
+        return '<Species Job "{0}">'.format(self.key)
+
+
+class SpeciesRegistry():
+    """
+    A registry of the reactant and product calculations for a batch of
+    reactions.
+
+    Reactions that share a species share one calculator, and exactly one job
+    is run for each species. Every other reaction that needs the species
+    waits for that job and then reuses its result.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.calculators = {}
+        self.jobs = {}
+
+    def __repr__(self):
+        return '<Species Registry with {0} species>'.format(len(self.calculators))
+
+    def get_calculator(self, mol, calc):
+        """
+        Returns the calculator registered for the same calculation as `calc`
+        on `mol`, registering `calc` if this is the first time it is seen.
+        """
+        key = get_species_key(mol, calc)
+        with self.lock:
+            if key not in self.calculators:
+                self.calculators[key] = calc
+            return self.calculators[key]
+
+    def run(self, mol, calc, function):
+        """
+        Calls `function` for the calculation `calc` on `mol` if no other
+        reaction has, otherwise waits for the job that did and returns its
+        result.
+
+        Returns None if the job that ran raised an error.
+        """
+        key = get_species_key(mol, calc)
+        with self.lock:
+            job = self.jobs.get(key)
+            owner = job is None
+            if owner:
+                job = SpeciesJob(key)
+                self.jobs[key] = job
+
+        if owner:
+            try:
+                job.result = function()
+            finally:
+                job.finished.set()
+        else:
+            if not job.finished.is_set():
+                logging.info(
+                    "Calculation for {} is being run for another reaction, waiting for it...".format(calc.label))
+            job.finished.wait()
+
+        return job.result
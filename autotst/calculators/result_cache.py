@@ -0,0 +1,165 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+################################################################################
+#
+#   AutoTST - Automated Transition State Theory
+#
+#   Copyright (c) 2015-2018 Prof. Richard H. West (r.west@northeastern.edu)
+#
+#   Permission is hereby granted, free of charge, to any person obtaining a
+#   copy of this software and associated documentation files (the 'Software'),
+#   to deal in the Software without restriction, including without limitation
+#   the rights to use, copy, modify, merge, publish, distribute, sublicense,
+#   and/or sell copies of the Software, and to permit persons to whom the
+#   Software is furnished to do so, subject to the following conditions:
+#
+#   The above copyright notice and this permission notice shall be included in
+#   all copies or substantial portions of the Software.
+#
+#   THE SOFTWARE IS PROVIDED 'AS IS', WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#   IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#   FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#   AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#   LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+#   FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+#   DEALINGS IN THE SOFTWARE.
+#
+################################################################################
+
+import os
+import shutil
+import hashlib
+import logging
+import tempfile
+
+from autotst.reaction import AutoTST_Reaction, AutoTST_TS
+from autotst.molecule import AutoTST_Molecule
+
+
+def get_structure_string(autotst_object):
+    """
+    A function that returns a canonical string describing the starting
+    structure of a calculation.
+
+    Species are identified by their canonical SMILES, so the same species is
+    recognised no matter which reaction (or embedding) it came from. Transition
+    states have no such identifier, so their starting geometry is used instead.
+    """
+    if isinstance(autotst_object, AutoTST_Molecule):
+        return "smiles {}".format(autotst_object.rmg_molecule.toSMILES())
+
+    if isinstance(autotst_object, AutoTST_Reaction):
+        ase_object = autotst_object.ts.ase_ts
+    elif isinstance(autotst_object, AutoTST_TS):
+        ase_object = autotst_object.ase_ts
+
+    lines = ["geometry"]
+    for number, position in zip(ase_object.numbers, ase_object.positions):
+        lines.append("{0:d} {1:.4f} {2:.4f} {3:.4f}".format(
+            number, position[0], position[1], position[2]).replace("-0.0000", "0.0000"))
+    return "\n".join(lines)
+
+
+def get_calculation_key(autotst_object, calc):
+    """
+    A function that returns the hash that identifies a calculation: a hash of
+    the structure, charge, multiplicity, method, basis and route keywords.
+
+    :params:
+    autotst_object: (AutoTST_Molecule, AutoTST_TS, AutoTST_Reaction) the
+    object that the calculation will be run on
+    calc: (ase.calculators.calculator) the calculator for the job
+    """
+    parameters = calc.parameters
+    fields = [
+        get_structure_string(autotst_object),
+        "charge {}".format(parameters.get("charge", 0)),
+        "multiplicity {}".format(parameters.get("multiplicity", 1)),
+        "method {}".format(parameters.get("method", "")).lower(),
+        "basis {}".format(parameters.get("basis", "")).lower(),
+        "extra {}".format(parameters.get("extra", "")).lower(),
+        "addsec {}".format(parameters.get("addsec", "")),
+    ]
+    return hashlib.sha1("\n".join(fields).encode("utf-8")).hexdigest()
+
+
+class GaussianResultCache():
+    """
+    A content addressed store of finished Gaussian log files.
+
+    Each log is filed under a hash of the structure, charge, multiplicity,
+    method, basis and route keywords of the job that produced it, so a job is
+    only ever run once no matter what label or scratch directory it is run with.
+    """
+
+    def __init__(self, directory):
+        """
+        directory: (str) where the cached log files are (or will be) kept
+        """
+        self.directory = os.path.abspath(os.path.expanduser(directory))
+        if not os.path.exists(self.directory):
+            os.makedirs(self.directory)
+
+    def __repr__(self):
+        return '<Gaussian Result Cache "{0}">'.format(self.directory)
+
+    def get_key(self, autotst_object, calc):
+        """
+        A method to get the hash that identifies a calculation
+
+        :params:
+        autotst_object: (AutoTST_Molecule, AutoTST_TS, AutoTST_Reaction) the
+        object that the calculation will be run on
+        calc: (ase.calculators.calculator) the calculator for the job
+        """
+        return get_calculation_key(autotst_object, calc)
+
+    def get_path(self, key):
+        "Returns the location of the log file for `key` in the cache"
+        return os.path.join(self.directory, key[:2], key + ".log")
+
+    def contains(self, key):
+        "Returns True if there is a cached result for `key`"
+        return os.path.exists(self.get_path(key))
+
+    def fetch(self, key, destination):
+        """
+        Copies the cached log file for `key` to `destination`.
+
+        Returns True if there was a cached result, False otherwise.
+        """
+        path = self.get_path(key)
+        if not os.path.exists(path):
+            return False
+
+        logging.info("Found cached result {0}, copying it to {1}".format(
+            path, destination))
+        shutil.copyfile(path, destination)
+        return True
+
+    def store(self, key, log_path):
+        """
+        Adds the (successful) log file at `log_path` to the cache under `key`.
+        The file is written to a temporary name and then renamed so that
+        concurrent writers never leave a partial file behind.
+        """
+        path = self.get_path(key)
+        if os.path.exists(path):
+            return path
+
+        directory = os.path.dirname(path)
+        if not os.path.exists(directory):
+            try:
+                os.makedirs(directory)
+            except OSError:  # Another process made it first
+                pass
+
+        handle, temporary_path = tempfile.mkstemp(
+            suffix=".log", dir=directory)
+        os.close(handle)
+        shutil.copyfile(log_path, temporary_path)
+        os.rename(temporary_path, path)
+        logging.info("Stored {0} in the result cache as {1}".format(
+            log_path, path))
+        return path
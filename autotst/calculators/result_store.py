@@ -0,0 +1,422 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+################################################################################
+#
+#   AutoTST - Automated Transition State Theory
+#
+#   Copyright (c) 2015-2018 Prof. Richard H. West (r.west@northeastern.edu)
+#
+#   Permission is hereby granted, free of charge, to any person obtaining a
+#   copy of this software and associated documentation files (the 'Software'),
+#   to deal in the Software without restriction, including without limitation
+#   the rights to use, copy, modify, merge, publish, distribute, sublicense,
+#   and/or sell copies of the Software, and to permit persons to whom the
+#   Software is furnished to do so, subject to the following conditions:
+#
+#   The above copyright notice and this permission notice shall be included in
+#   all copies or substantial portions of the Software.
+#
+#   THE SOFTWARE IS PROVIDED 'AS IS', WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#   IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#   FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#   AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#   LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+#   FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+#   DEALINGS IN THE SOFTWARE.
+#
+################################################################################
+
+"""
+An indexed store for the TS and kinetics results of AutoTST.
+
+Results used to be written as one `.ts` or `.kinetics` Python file per
+reaction, and finding one meant probing every ordering of the reaction label
+on disk and then `exec`-ing the file. Here they are rows in an SQLite database
+keyed by a canonical reaction identifier, so a lookup is a single index probe
+and a result is only deserialized when it is actually asked for.
+
+Results are stored as JSON: the fields of the QMData for a TS, and the
+species and fitted Arrhenius parameters for kinetics. Nothing in the store is
+ever executed; `exec` is only used to import old style result files.
+"""
+
+import os
+import csv
+import json
+import logging
+import sqlite3
+import threading
+
+import numpy
+
+from autotst.base import QMData
+from rmgpy.molecule import Molecule
+from rmgpy.species import Species, TransitionState
+from rmgpy.reaction import Reaction
+from rmgpy.kinetics import Arrhenius, Eckart
+from rmgpy.statmech import Conformer, IdealGasTranslation, NonlinearRotor, HarmonicOscillator, LinearRotor
+
+RESULT_STORE_NAME = "autotst_results.db"
+
+EXPORT_COLUMNS = [
+    "key", "label", "A", "A_units", "n", "Ea (kJ/mol)", "T0 (K)", "Tmin (K)",
+    "Tmax (K)", "kinetics_method", "ts_method", "ts_label", "comment", "store"]
+
+# The names that old style `.ts` and `.kinetics` files may use when they are imported
+ts_context = {
+    '__builtins__': None,
+    'True': True,
+    'False': False,
+    'QMData': QMData,
+    'array': numpy.array,
+    'int32': numpy.int32,
+}
+
+kinetics_context = {
+    '__builtins__': None,
+    'True': True,
+    'False': False,
+    'Reaction': Reaction,
+    'Species': Species,
+    'TransitionState': TransitionState,
+    'Arrhenius': Arrhenius,
+    'Eckart': Eckart,
+    'Conformer': Conformer,
+    'IdealGasTranslation': IdealGasTranslation,
+    'NonlinearRotor': NonlinearRotor,
+    'HarmonicOscillator': HarmonicOscillator,
+    'LinearRotor': LinearRotor,
+    'array': numpy.array,
+    'int32': numpy.int32,
+    'Molecule': Molecule
+}
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def get_result_store(directory):
+    """
+    Returns the ResultStore kept in `directory`, reusing the instance if the
+    store has already been opened in this process.
+    """
+    path = os.path.abspath(os.path.join(
+        os.path.expanduser(directory), RESULT_STORE_NAME))
+    with _stores_lock:
+        if path not in _stores:
+            _stores[path] = ResultStore(path)
+        return _stores[path]
+
+
+class ResultStore():
+    """
+    An SQLite database of TS and kinetics results, indexed by reaction key.
+
+    A new connection is opened for every operation, so one store can be used
+    from many threads, and several processes can write to the same file.
+    """
+
+    def __init__(self, path):
+        """
+        path: (str) the location of the database file
+        """
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+
+        connection = self.connect()
+        with connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS ts ("
+                "key TEXT PRIMARY KEY, label TEXT, method TEXT, qmdata TEXT)")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS kinetics ("
+                "key TEXT PRIMARY KEY, label TEXT, method TEXT, reaction TEXT)")
+        connection.close()
+
+    def __repr__(self):
+        return '<AutoTST Result Store "{0}">'.format(self.path)
+
+    def connect(self):
+        "Opens a new connection, waiting for up to a minute for other writers"
+        return sqlite3.connect(self.path, timeout=60)
+
+    def execute(self, query, parameters=()):
+        "Runs `query` in its own transaction and returns all rows it selects"
+        connection = self.connect()
+        try:
+            with connection:
+                rows = connection.execute(query, parameters).fetchall()
+        finally:
+            connection.close()
+        return rows
+
+    def save_ts(self, key, label, method, qmData):
+        "Saves the TS data for the reaction `key`, replacing any older result"
+        self.execute("INSERT OR REPLACE INTO ts VALUES (?, ?, ?, ?)",
+                     (key, label, method, to_json(get_qmdata_dict(qmData))))
+
+    def save_kinetics(self, key, label, method, reaction):
+        """
+        Saves the kinetics for the reaction `key`, replacing any older result.
+
+        Only Arrhenius kinetics can be stored, so nothing is saved if the
+        `reaction` has any other kinetics. Returns True if it was saved.
+        """
+        data = get_reaction_dict(reaction)
+        if data['kinetics'] is None:
+            logging.error('Not saving the kinetics for "{0}" as they '
+                          'are not Arrhenius'.format(key))
+            return False
+        self.execute("INSERT OR REPLACE INTO kinetics VALUES (?, ?, ?, ?)",
+                     (key, label, method, to_json(data)))
+        return True
+
+    def has_ts(self, key):
+        "Returns True if there is TS data for the reaction `key`"
+        return bool(self.execute("SELECT 1 FROM ts WHERE key = ?", (key,)))
+
+    def has_kinetics(self, key):
+        "Returns True if there are kinetics for the reaction `key`"
+        return bool(self.execute("SELECT 1 FROM kinetics WHERE key = ?", (key,)))
+
+    def get_ts(self, key):
+        """
+        Returns a dictionary with the rxnLabel, method and qmData saved for the
+        reaction `key`, or None if there is no (valid) result.
+        """
+        rows = self.execute(
+            "SELECT label, method, qmdata FROM ts WHERE key = ?", (key,))
+        if not rows:
+            return None
+        label, method, qmdata = rows[0]
+        try:
+            qmData = get_qmdata(json.loads(qmdata))
+        except (ValueError, KeyError, TypeError), e:
+            logging.error('The ts data for "{0}" was invalid:'.format(key))
+            logging.exception(e)
+            return None
+        return {'rxnLabel': label, 'method': method, 'qmData': qmData}
+
+    def get_kinetics(self, key):
+        """
+        Returns a dictionary with the method and reaction saved for the
+        reaction `key`, or None if there is no (valid) result.
+        """
+        rows = self.execute(
+            "SELECT label, method, reaction FROM kinetics WHERE key = ?", (key,))
+        if not rows:
+            return None
+        label, method, reaction = rows[0]
+        try:
+            reaction = get_reaction(json.loads(reaction))
+        except (ValueError, KeyError, TypeError), e:
+            logging.error('The kinetics for "{0}" were invalid:'.format(key))
+            logging.exception(e)
+            return None
+        if reaction.kinetics is None:
+            logging.error('The kinetics for "{0}" were missing'.format(key))
+            return None
+        return {'rxnLabel': label, 'method': method, 'reaction': reaction}
+
+    def get_kinetics_keys(self):
+        "Returns the keys of every reaction with kinetics in the store"
+        return [row[0] for row in self.execute("SELECT key FROM kinetics")]
+
+    def export_kinetics(self, path, keys=None):
+        """
+        Writes the kinetics in the store, together with the TS method and
+        where they came from, to a single tab separated table at `path`.
+
+        The rows are streamed from one query, so the whole store never has to
+        be held in memory. If `keys` is given, only those reactions are
+        exported. Returns the number of reactions written.
+        """
+        if keys is not None:
+            keys = set(keys)
+
+        count = 0
+        connection = self.connect()
+        try:
+            rows = connection.execute(
+                "SELECT kinetics.key, kinetics.label, kinetics.method, "
+                "kinetics.reaction, ts.method, ts.label "
+                "FROM kinetics LEFT JOIN ts ON kinetics.key = ts.key "
+                "ORDER BY kinetics.key")
+            with open(path, 'w') as export_file:
+                writer = csv.writer(export_file, delimiter="\t", lineterminator="\n")
+                writer.writerow(EXPORT_COLUMNS)
+                for key, label, method, reaction, ts_method, ts_label in rows:
+                    if keys is not None and key not in keys:
+                        continue
+                    try:
+                        kinetics = json.loads(reaction)['kinetics']
+                    except (ValueError, KeyError, TypeError), e:
+                        logging.error('The kinetics for "{0}" were invalid:'.format(key))
+                        logging.exception(e)
+                        continue
+                    if kinetics is None:
+                        logging.error('The kinetics for "{0}" were missing'.format(key))
+                        continue
+                    writer.writerow([key, label] +
+                                    get_arrhenius_columns(kinetics) +
+                                    [method, ts_method or "", ts_label or "",
+                                     kinetics.get("comment", ""),
+                                     self.path])
+                    count += 1
+        finally:
+            connection.close()
+
+        logging.info("Exported kinetics for {} reactions to {}".format(count, path))
+        return count
+
+
+def to_json(data):
+    "Returns `data` as JSON, with any numpy arrays and numbers as plain lists and numbers"
+    def default(value):
+        if isinstance(value, numpy.ndarray):
+            return value.tolist()
+        if isinstance(value, numpy.generic):
+            return value.item()
+        raise TypeError("{0!r} can't be stored as JSON".format(value))
+    return json.dumps(data, default=default, sort_keys=True)
+
+
+def get_qmdata_dict(qmData):
+    "Returns the fields of `qmData` as a dictionary that can be stored as JSON"
+    return {
+        'groundStateDegeneracy': qmData.groundStateDegeneracy,
+        'numberOfAtoms': qmData.numberOfAtoms,
+        'stericEnergy': qmData.stericEnergy,
+        'molecularMass': qmData.molecularMass,
+        'energy': qmData.energy,
+        'atomicNumbers': qmData.atomicNumbers,
+        'rotationalConstants': qmData.rotationalConstants,
+        'atomCoords': qmData.atomCoords,
+        'frequencies': qmData.frequencies,
+        'zeroPointEnergy': qmData.zeroPointEnergy,
+        'source': qmData.source,
+        'method': qmData.method,
+        'label': qmData.label,
+    }
+
+
+def get_qmdata(data):
+    "Rebuilds the QMData that `get_qmdata_dict` returned `data` for"
+    def quantity(name):
+        value, units = data[name]
+        return (value, units)
+
+    def array_quantity(name):
+        value, units = data[name]
+        return (numpy.array(value), units)
+
+    return QMData(groundStateDegeneracy=data['groundStateDegeneracy'],
+                  numberOfAtoms=data['numberOfAtoms'],
+                  stericEnergy=data['stericEnergy'],
+                  molecularMass=quantity('molecularMass'),
+                  energy=quantity('energy'),
+                  atomicNumbers=numpy.array(data['atomicNumbers']),
+                  rotationalConstants=array_quantity('rotationalConstants'),
+                  atomCoords=array_quantity('atomCoords'),
+                  frequencies=array_quantity('frequencies'),
+                  zeroPointEnergy=quantity('zeroPointEnergy'),
+                  source=data['source'],
+                  method=data['method'],
+                  label=data['label'])
+
+
+def get_species_dict(species):
+    "Returns the label and SMILES of a reactant or product"
+    if isinstance(species, Molecule):
+        return {'label': species.toSMILES(), 'smiles': species.toSMILES()}
+    smiles = None
+    if species.molecule:
+        smiles = species.molecule[0].toSMILES()
+    return {'label': species.label, 'smiles': smiles}
+
+
+def get_species(data):
+    "Rebuilds the Species that `get_species_dict` returned `data` for"
+    if data['smiles']:
+        return Species(label=data['label'], molecule=[Molecule(SMILES=data['smiles'])])
+    return Species(label=data['label'])
+
+
+def get_arrhenius_dict(kinetics):
+    """
+    Returns the parameters of an Arrhenius `kinetics` as a dictionary, or None
+    if the kinetics are of any other type.
+    """
+    if not isinstance(kinetics, Arrhenius):
+        logging.warning("Only Arrhenius kinetics are stored, not {0!r}".format(kinetics))
+        return None
+    data = {
+        'A': (kinetics.A.value, kinetics.A.units),
+        'n': kinetics.n.value_si,
+        'Ea': kinetics.Ea.value_si,  # J/mol
+        'T0': kinetics.T0.value_si,
+        'Tmin': None,
+        'Tmax': None,
+        'comment': kinetics.comment or "",
+    }
+    for name in ['Tmin', 'Tmax']:
+        T = getattr(kinetics, name)
+        if T is not None:
+            data[name] = T.value_si
+    return data
+
+
+def get_arrhenius(data):
+    "Rebuilds the Arrhenius kinetics that `get_arrhenius_dict` returned `data` for"
+    if data is None:
+        return None
+    kinetics = Arrhenius(A=tuple(data['A']),
+                         n=data['n'],
+                         Ea=(data['Ea'], "J/mol"),
+                         T0=(data['T0'], "K"),
+                         comment=data['comment'])
+    if data['Tmin'] is not None:
+        kinetics.Tmin = (data['Tmin'], "K")
+    if data['Tmax'] is not None:
+        kinetics.Tmax = (data['Tmax'], "K")
+    return kinetics
+
+
+def get_reaction_dict(reaction):
+    "Returns the label, species and kinetics of `reaction` as a dictionary"
+    return {
+        'label': reaction.label,
+        'reactants': [get_species_dict(species) for species in reaction.reactants],
+        'products': [get_species_dict(species) for species in reaction.products],
+        'kinetics': get_arrhenius_dict(reaction.kinetics),
+    }
+
+
+def get_reaction(data):
+    "Rebuilds the Reaction that `get_reaction_dict` returned `data` for"
+    return Reaction(label=data['label'],
+                    reactants=[get_species(species) for species in data['reactants']],
+                    products=[get_species(species) for species in data['products']],
+                    kinetics=get_arrhenius(data['kinetics']))
+
+
+def get_arrhenius_columns(kinetics):
+    """
+    Returns the A, A units, n, Ea, T0, Tmin and Tmax columns of an export for
+    `kinetics`, the stored dictionary of Arrhenius parameters. Anything that
+    isn't a modified Arrhenius expression is left blank.
+    """
+    if not kinetics:
+        return [""] * 7
+
+    A, A_units = kinetics['A']
+    columns = [A, A_units, kinetics['n'], kinetics['Ea'] / 1000., kinetics['T0']]
+    for name in ['Tmin', 'Tmax']:
+        if kinetics[name] is None:
+            columns.append("")
+        else:
+            columns.append(kinetics[name])
+    return columns
@@ -0,0 +1,165 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+################################################################################
+#
+#   AutoTST - Automated Transition State Theory
+#
+#   Copyright (c) 2015-2018 Prof. Richard H. West (r.west@northeastern.edu)
+#
+#   Permission is hereby granted, free of charge, to any person obtaining a
+#   copy of this software and associated documentation files (the 'Software'),
+#   to deal in the Software without restriction, including without limitation
+#   the rights to use, copy, modify, merge, publish, distribute, sublicense,
+#   and/or sell copies of the Software, and to permit persons to whom the
+#   Software is furnished to do so, subject to the following conditions:
+#
+#   The above copyright notice and this permission notice shall be included in
+#   all copies or substantial portions of the Software.
+#
+#   THE SOFTWARE IS PROVIDED 'AS IS', WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#   IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#   FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#   AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#   LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+#   FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+#   DEALINGS IN THE SOFTWARE.
+#
+################################################################################
+
+import os
+import csv
+import json
+import shutil
+import tempfile
+import unittest
+import numpy as np
+
+from rmgpy.molecule import Molecule
+from rmgpy.species import Species
+from rmgpy.reaction import Reaction
+from rmgpy.kinetics import Arrhenius
+
+from autotst.base import QMData
+from autotst.calculators.result_store import ResultStore, RESULT_STORE_NAME, EXPORT_COLUMNS
+from autotst.calculators.calculator import AutoTST_Calculator
+
+
+class TestResultStore(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.store = ResultStore(os.path.join(self.directory, RESULT_STORE_NAME))
+
+        self.qmData = QMData(groundStateDegeneracy=2,
+                             numberOfAtoms=3,
+                             molecularMass=(33.0, "amu"),
+                             energy=(-4096.5, "eV/molecule"),
+                             atomicNumbers=np.array([8, 8, 1]),
+                             rotationalConstants=(np.array([20.1, 1.1, 1.0]), "cm^-1"),
+                             atomCoords=(np.array([[0., 0., 0.], [1.3, 0., 0.], [1.6, 0.9, 0.]]), "angstrom"),
+                             frequencies=(np.array([-1500., 1100., 3500.]), "cm^-1"),
+                             zeroPointEnergy=(0.4, "eV/molecule"),
+                             method="M062X")
+
+        kinetics = Arrhenius(A=(1.2e6, "cm^3/(mol*s)"), n=1.8, Ea=(25.0, "kJ/mol"), T0=(1, "K"),
+                             Tmin=(300, "K"), Tmax=(2000, "K"), comment="Fitted by CanTherm")
+        self.reaction = Reaction(label="C+[OH]_[CH3]+O",
+                                 reactants=[Species(label="C", molecule=[Molecule(SMILES="C")]),
+                                            Species(label="[OH]", molecule=[Molecule(SMILES="[OH]")])],
+                                 products=[Species(label="[CH3]", molecule=[Molecule(SMILES="[CH3]")]),
+                                           Species(label="O", molecule=[Molecule(SMILES="O")])],
+                                 kinetics=kinetics)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_ts_round_trip(self):
+        "TS data should come back out of the store as it went in"
+        self.assertFalse(self.store.has_ts("key"))
+        self.store.save_ts("key", "C+[OH]_[CH3]+O", "m062x/6-311+g(2df,2p)", self.qmData)
+        self.assertTrue(self.store.has_ts("key"))
+
+        result = self.store.get_ts("key")
+        self.assertEqual(result["rxnLabel"], "C+[OH]_[CH3]+O")
+        self.assertEqual(result["method"], "m062x/6-311+g(2df,2p)")
+        qmData = result["qmData"]
+        self.assertEqual(qmData.groundStateDegeneracy, 2)
+        self.assertEqual(qmData.energy, self.qmData.energy)
+        self.assertTrue(np.array_equal(qmData.atomicNumbers, self.qmData.atomicNumbers))
+        self.assertTrue(np.allclose(qmData.atomCoords[0], self.qmData.atomCoords[0]))
+        self.assertTrue(np.allclose(qmData.frequencies[0], self.qmData.frequencies[0]))
+        self.assertEqual(qmData.method, "M062X")
+
+    def test_kinetics_round_trip(self):
+        "Kinetics should come back out of the store as they went in"
+        self.store.save_kinetics("key", "C+[OH]_[CH3]+O", "m062x", self.reaction)
+
+        result = self.store.get_kinetics("key")
+        reaction = result["reaction"]
+        self.assertEqual(result["method"], "m062x")
+        self.assertEqual([species.label for species in reaction.reactants], ["C", "[OH]"])
+        self.assertTrue(reaction.reactants[0].molecule[0].isIsomorphic(Molecule(SMILES="C")))
+        self.assertTrue(reaction.kinetics.isIdenticalTo(self.reaction.kinetics))
+        self.assertEqual(self.store.get_kinetics_keys(), ["key"])
+
+    def test_stored_as_json(self):
+        "The store should only hold data, never code"
+        self.store.save_ts("key", "C+[OH]_[CH3]+O", "m062x", self.qmData)
+        self.store.save_kinetics("key", "C+[OH]_[CH3]+O", "m062x", self.reaction)
+        qmdata, = self.store.execute("SELECT qmdata FROM ts")[0]
+        reaction, = self.store.execute("SELECT reaction FROM kinetics")[0]
+        self.assertEqual(json.loads(qmdata)["method"], "M062X")
+        self.assertAlmostEqual(json.loads(reaction)["kinetics"]["Ea"], 25000.0)
+
+    def test_export_kinetics(self):
+        "Every reaction should be exported as one row of the table"
+        self.store.save_ts("key1", "C+[OH]_[CH3]+O", "ts method", self.qmData)
+        self.store.save_kinetics("key1", "C+[OH]_[CH3]+O", "m062x", self.reaction)
+        self.store.save_kinetics("key2", "CC+[OH]_[CH2]C+O", "m062x", self.reaction)
+
+        path = os.path.join(self.directory, "kinetics.tsv")
+        self.assertEqual(self.store.export_kinetics(path), 2)
+        self.assertEqual(self.store.export_kinetics(path, keys=["key1"]), 1)
+
+        with open(path) as export_file:
+            rows = list(csv.DictReader(export_file, delimiter="\t"))
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(sorted(rows[0].keys()), sorted(EXPORT_COLUMNS))
+        self.assertAlmostEqual(float(rows[0]["Ea (kJ/mol)"]), 25.0)
+        self.assertAlmostEqual(float(rows[0]["n"]), 1.8)
+        self.assertEqual(rows[0]["ts_method"], "ts method")
+
+    def test_non_arrhenius_kinetics(self):
+        "Reactions without Arrhenius kinetics should never be stored or returned"
+        self.reaction.kinetics = None
+        self.assertFalse(self.store.save_kinetics("key", "C+[OH]_[CH3]+O", "m062x", self.reaction))
+        self.assertFalse(self.store.has_kinetics("key"))
+
+        # as written by an older version of the store
+        self.store.execute("INSERT INTO kinetics VALUES (?, ?, ?, ?)",
+                           ("key", "C+[OH]_[CH3]+O", "m062x",
+                            json.dumps({"label": "C+[OH]_[CH3]+O", "reactants": [],
+                                        "products": [], "kinetics": None})))
+        self.assertIsNone(self.store.get_kinetics("key"))
+        path = os.path.join(self.directory, "kinetics.tsv")
+        self.assertEqual(self.store.export_kinetics(path), 0)
+
+    def test_non_arrhenius_legacy_file(self):
+        "A .kinetics file without Arrhenius kinetics should not be imported"
+        with open(os.path.join(self.directory, "C+[OH]_[CH3]+O.kinetics"), "w") as kinetics_file:
+            kinetics_file.write('method = "m062x"\n')
+            kinetics_file.write('reaction = Reaction(label="C+[OH]_[CH3]+O", '
+                                'reactants=[Species(label="C", molecule=[Molecule(SMILES="C")]), '
+                                'Species(label="[OH]", molecule=[Molecule(SMILES="[OH]")])], '
+                                'products=[Species(label="[CH3]", molecule=[Molecule(SMILES="[CH3]")]), '
+                                'Species(label="O", molecule=[Molecule(SMILES="O")])])\n')
+
+        calculator = AutoTST_Calculator(save_directory=self.directory)
+        calculator.label = "C+[OH]_[CH3]+O"
+        self.assertIsNone(calculator.read_kinetics_file())
+        self.assertEqual(calculator.result_store.get_kinetics_keys(), [])
+
+
+if __name__ == "__main__":
+    unittest.main(testRunner=unittest.TextTestRunner(verbosity=2))
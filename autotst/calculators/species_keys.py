@@ -0,0 +1,128 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+################################################################################
+#
+#   AutoTST - Automated Transition State Theory
+#
+#   Copyright (c) 2015-2018 Prof. Richard H. West (r.west@northeastern.edu)
+#
+#   Permission is hereby granted, free of charge, to any person obtaining a
+#   copy of this software and associated documentation files (the 'Software'),
+#   to deal in the Software without restriction, including without limitation
+#   the rights to use, copy, modify, merge, publish, distribute, sublicense,
+#   and/or sell copies of the Software, and to permit persons to whom the
+#   Software is furnished to do so, subject to the following conditions:
+#
+#   The above copyright notice and this permission notice shall be included in
+#   all copies or substantial portions of the Software.
+#
+#   THE SOFTWARE IS PROVIDED 'AS IS', WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#   IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#   FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#   AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#   LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+#   FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+#   DEALINGS IN THE SOFTWARE.
+#
+################################################################################
+
+"""
+A memoized service that turns the SMILES of a species into its identifiers:
+the canonical SMILES that AutoTST uses in reaction keys, and the InChIKey that
+Gaussian and CanTherm files are named after.
+
+Generating an InChI is slow, and the same few species appear in many
+reactions, so each SMILES is only worked out once per process. If a file is
+given with `set_species_keys_file`, the identifiers are also kept there
+between runs.
+"""
+
+import os
+import logging
+import threading
+
+from rdkit import Chem
+from rmgpy.molecule import Molecule
+
+
+class SpeciesKeys():
+    """
+    A cache of the identifiers of species, keyed by SMILES. If `path` is
+    given, known identifiers are read from it and new ones are appended to it
+    as tab separated lines of SMILES, canonical SMILES and InChIKey.
+    """
+
+    def __init__(self, path=None):
+        self.path = path
+        self.keys = {}
+        self.lock = threading.Lock()
+        if path and os.path.exists(path):
+            self.load()
+
+    def __repr__(self):
+        return '<AutoTST Species Keys "{0}">'.format(self.path)
+
+    def load(self):
+        "Reads the identifiers saved in `self.path`"
+        with open(self.path) as keys_file:
+            for line in keys_file:
+                split = line.rstrip("\n").split("\t")
+                if len(split) != 3:
+                    continue
+                smiles, canonical_smiles, inchikey = split
+                self.keys[smiles] = (canonical_smiles, inchikey)
+        logging.info("Loaded {} species keys from {}".format(
+            len(self.keys), self.path))
+
+    def get(self, smiles):
+        "Returns the canonical SMILES and InChIKey of the species `smiles`"
+        try:
+            return self.keys[smiles]
+        except KeyError:
+            pass
+
+        canonical_smiles = Molecule(SMILES=smiles).toSMILES()
+        # using this round about way of doing stuff because rmg's `toAugumentedInChIKey` method doesn't work on our cluster
+        inchikey = Chem.rdinchi.InchiToInchiKey(
+            Chem.MolToInchi(Chem.MolFromSmiles(smiles))).strip("-N")
+
+        with self.lock:
+            if smiles not in self.keys:
+                self.keys[smiles] = (canonical_smiles, inchikey)
+                if self.path:
+                    with open(self.path, "a") as keys_file:
+                        keys_file.write("{0}\t{1}\t{2}\n".format(
+                            smiles, canonical_smiles, inchikey))
+        return self.keys[smiles]
+
+    def get_canonical_smiles(self, smiles):
+        "Returns the canonical SMILES of the species `smiles`"
+        return self.get(smiles)[0]
+
+    def get_inchikey(self, smiles):
+        "Returns the InChIKey of the species `smiles`"
+        return self.get(smiles)[1]
+
+
+species_keys = SpeciesKeys()
+
+
+def set_species_keys_file(path):
+    """
+    A function to keep the species identifiers of this process in the file
+    `path`, loading any that are already there.
+    """
+    global species_keys
+    species_keys = SpeciesKeys(path)
+    return species_keys
+
+
+def get_canonical_smiles(smiles):
+    "Returns the canonical SMILES of the species `smiles`"
+    return species_keys.get_canonical_smiles(smiles)
+
+
+def get_inchikey(smiles):
+    "Returns the InChIKey of the species `smiles`"
+    return species_keys.get_inchikey(smiles)
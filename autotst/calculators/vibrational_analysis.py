@@ -33,15 +33,52 @@ import pandas as pd
 import numpy as np
 
 from autotst.reaction import AutoTST_Reaction
-from cclib.io import ccread
+from autotst.calculators.log_parser import read_gaussian_log, read_gaussian_logs
 
 
 def percent_change(original, new):
-    "A function to calculate the percent change between two values"
+    "A function to calculate the percent change between two values (or arrays of values)"
     percent_change = (abs(new - original) / original) * 100
     return percent_change
 
 
+def get_distances(positions, indices):
+    """
+    A function to calculate the distances between every pair of atoms in
+    `indices` (an array of shape (n, 2)) at once.
+    """
+    return np.linalg.norm(positions[indices[:, 1]] - positions[indices[:, 0]], axis=1)
+
+
+def get_angles(positions, indices):
+    """
+    A function to calculate every angle i-j-k in `indices` (an array of shape
+    (n, 3)) at once, in degrees, like `ase.Atoms.get_angle`.
+    """
+    v1 = positions[indices[:, 0]] - positions[indices[:, 1]]
+    v2 = positions[indices[:, 2]] - positions[indices[:, 1]]
+    cosines = (v1 * v2).sum(axis=1) / (np.linalg.norm(v1, axis=1) * np.linalg.norm(v2, axis=1))
+    return np.degrees(np.arccos(np.clip(cosines, -1, 1)))
+
+
+def get_dihedrals(positions, indices):
+    """
+    A function to calculate every dihedral i-j-k-l in `indices` (an array of
+    shape (n, 4)) at once, in degrees between 0 and 360, like
+    `ase.Atoms.get_dihedral`.
+    """
+    a = positions[indices[:, 1]] - positions[indices[:, 0]]
+    b = positions[indices[:, 2]] - positions[indices[:, 1]]
+    c = positions[indices[:, 3]] - positions[indices[:, 2]]
+    bxa = np.cross(b, a)
+    bxa /= np.linalg.norm(bxa, axis=1)[:, np.newaxis]
+    cxb = np.cross(c, b)
+    cxb /= np.linalg.norm(cxb, axis=1)[:, np.newaxis]
+    angles = np.arccos(np.clip((bxa * cxb).sum(axis=1), -1, 1))
+    angles = np.where((bxa * c).sum(axis=1) > 0, 2 * np.pi - angles, angles)
+    return np.degrees(angles)
+
+
 class Vibrational_Analysis():
     """
     A class that allows one to perform vibrational analysis. It takes an
@@ -50,13 +87,19 @@ class Vibrational_Analysis():
     displacement from the imaginary frequency.
     """
 
-    def __init__(self, reaction, scratch="."):
+    def __init__(self, reaction, scratch=".", geometry_types=None):
         """
         reaction: (AutoTST_Reaction) a reaction that proives the connectivity
         and label name for this analysis
+        geometry_types: (list) the types of geometry ("Bond", "Ang" and "Tor")
+        that are used to decide if we have arrived at a TS, by default only
+        bonds
         """
+        if geometry_types is None:
+            geometry_types = ["Bond"]
         self.reaction = reaction
         self.scratch = scratch
+        self.geometry_types = geometry_types
 
     def __repr__(self):
         return '<AutoTST Vibrational Analysis "{0}">'.format(self.reaction.label)
@@ -71,27 +114,34 @@ class Vibrational_Analysis():
     def parse_vibrations(self):
         """
         This method obtains the vibrations from the log file of interest using
-        cclib. It then creates a zipped list with the vibrational frequencies
-        and their corresponding displacements.
+        the shared log parser. It then creates a zipped list with the vibrational
+        frequencies and their corresponding displacements.
         """
 
         assert os.path.exists(self.log_file)
 
-        log_file_info = ccread(self.log_file)
-        self.vibrations = zip(log_file_info.vibfreqs, log_file_info.vibdisps)
+        self.log_data = read_gaussian_log(self.log_file)
+        self.vibrations = zip(self.log_data.vibfreqs, self.log_data.vibdisps)
 
         return self.vibrations
 
-    def obtain_geometries(self, reaction):
+    def obtain_geometries(self, reaction, log_data=None):
         """
         This method obtains the previbrational geometry (the geometry returned
         by a quantum optimizer), and the postvibrational geometry.
+
+        If the parsed log file `log_data` is given and its final geometry has
+        as many atoms as the TS, that geometry is used, since it is in the
+        same orientation as the displacements. Otherwise the geometry of the
+        reaction's TS is used.
         """
 
         assert isinstance(reaction, AutoTST_Reaction)
 
         self.before_geometry = reaction.ts.ase_ts.copy()
-        self.post_geometry = reaction.ts.ase_ts.copy()
+        if log_data is not None and len(log_data.atomcoords) and len(log_data.atomcoords[-1]) == len(self.before_geometry):
+            self.before_geometry.set_positions(log_data.atomcoords[-1])
+        self.post_geometry = self.before_geometry.copy()
 
         for vib, displacements in self.vibrations:
             if vib < 0:  # Finding the imaginary frequency
@@ -108,52 +158,75 @@ class Vibrational_Analysis():
 
         This returns a dataframe with the type of geometry, the indicies in it,
         if it is close to the reaction center, and the percent change of that
-        geometry.
+        geometry. Each type of geometry is measured for all of its indices at
+        once with numpy.
+
+        Bonds are compared by their relative change. Angles and dihedrals are
+        compared by their absolute change as a percentage of 180 and 360
+        degrees, since an angle near zero would otherwise blow up.
         """
 
+        before = self.before_geometry.get_positions()
+        after = self.post_geometry.get_positions()
+
         results = []
-        """
-        for torsion in reaction.ts.torsions:
-            i,j,k,l = torsion.indices
-            before = self.before_geometry.get_dihedral(i,j,k,l)
-            after = self.post_geometry.get_dihedral(i,j,k,l)
-            results.append(["Tor", torsion.indices, torsion.reaction_center, percent_change(before, after)])
-
-        for angle in reaction.ts.angles:
-            i,j,k = angle.indices
-            before = self.before_geometry.get_angle(i,j,k)
-            after = self.post_geometry.get_angle(i,j,k)
-            results.append(["Ang", angle.indices, angle.reaction_center, percent_change(before, after)])
-        """
-        for bond in reaction.ts.bonds:
-            i, j = bond.indices
-            before = self.before_geometry.get_distance(i, j)
-            after = self.post_geometry.get_distance(i, j)
-            results.append(
-                ["Bond", bond.indices, bond.reaction_center, percent_change(before, after)])
+        for geometry_type, geometries, measure in [
+                ("Bond", reaction.ts.bonds, get_distances),
+                ("Ang", reaction.ts.angles, get_angles),
+                ("Tor", reaction.ts.torsions, get_dihedrals)]:
+            if not geometries:
+                continue
+            indices = np.array([geometry.indices for geometry in geometries])
+            before_values = measure(before, indices)
+            after_values = measure(after, indices)
+            if geometry_type == "Bond":
+                changes = percent_change(before_values, after_values)
+            elif geometry_type == "Ang":
+                changes = abs(after_values - before_values) / 180. * 100
+            else:
+                # Take the change the short way round the circle
+                changes = abs(after_values - before_values)
+                changes = np.minimum(changes, 360 - changes) / 360. * 100
+            for geometry, change in zip(geometries, changes):
+                results.append(
+                    [geometry_type, geometry.indices, geometry.reaction_center, change])
 
         results = pd.DataFrame(results)
         results.columns = ["type", "index", "center", "percent_change"]
 
         self.percent_changes = results
 
-    def validate_ts(self):
+    def get_validation_metrics(self):
         """
-        A method designed to run the above and return a bool that states if we
-        have arrived at a TS. We say we have arrived at a TS if the average
-        change of geometries in the reaction center is one order of magnitude
-        geater elsewhere.
+        A method that runs the above and returns the mean percent change of
+        the `geometry_types` in the reaction center and elsewhere.
         """
 
-        self.get_log_file(self.scratch, self.reaction)
+        if not hasattr(self, "log_file"):
+            self.get_log_file(self.scratch, self.reaction)
 
         self.parse_vibrations()
 
-        self.obtain_geometries(self.reaction)
+        self.obtain_geometries(self.reaction, log_data=self.log_data)
 
         self.obtain_percent_changes(self.reaction)
 
-        if (np.log10(((self.percent_changes[self.percent_changes.center == "Yes"].mean()))) > np.log10(((self.percent_changes[self.percent_changes.center != "Yes"].mean()))) + 1).all():
+        changes = self.percent_changes[self.percent_changes.type.isin(
+            self.geometry_types)]
+        return (changes[changes.center == "Yes"].percent_change.mean(),
+                changes[changes.center != "Yes"].percent_change.mean())
+
+    def validate_ts(self):
+        """
+        A method designed to run the above and return a bool that states if we
+        have arrived at a TS. We say we have arrived at a TS if the average
+        change of geometries in the reaction center is one order of magnitude
+        geater elsewhere. Only the `geometry_types` are taken into account.
+        """
+
+        center, other = self.get_validation_metrics()
+
+        if np.log10(center) > np.log10(other) + 1:
             logging.info("Vibrational analysis was successful")
             return True
 
@@ -161,3 +234,54 @@ class Vibrational_Analysis():
             logging.info(
                 "Cannot reasonably say that we have arrived at a TS through vibrational analysis.\nRunning an IRC calc.")
             return False
+
+
+def validate_ts_batch(reactions, log_files=None, scratch=".", processes=None, geometry_types=None):
+    """
+    A function that validates many TSs through vibrational analysis. The log
+    files are parsed in parallel, and the results are returned as a table.
+
+    :params:
+    reactions: (list) The AutoTST_Reactions of interest
+    log_files: (list) The log file of each TS, by default `<label>.log` in scratch
+    scratch: (str) The directory the log files are in
+    processes: (int) The number of processes used to parse the log files
+    geometry_types: (list) The types of geometry used in the criterion, by
+    default only bonds
+
+    :returns:
+    results: (DataFrame) The label, log file, number of imaginary frequencies,
+    the imaginary frequency, the mean percent change in the reaction center and
+    elsewhere, and if the TS was validated
+    """
+    if log_files is None:
+        log_files = [os.path.join(scratch, reaction.label + ".log")
+                     for reaction in reactions]
+
+    read_gaussian_logs([log_file for log_file in log_files if os.path.exists(log_file)],
+                       processes=processes)
+
+    results = []
+    for reaction, log_file in zip(reactions, log_files):
+        vib = Vibrational_Analysis(
+            reaction, scratch=scratch, geometry_types=geometry_types)
+        vib.log_file = log_file
+        try:
+            center, other = vib.get_validation_metrics()
+        except Exception as e:
+            logging.error("Couldn't validate {}:".format(reaction))
+            logging.exception(e)
+            results.append([reaction.label, log_file, 0, np.nan, np.nan, np.nan, False])
+            continue
+
+        imaginary = vib.log_data.vibfreqs[vib.log_data.vibfreqs < 0]
+        if len(imaginary):
+            frequency = imaginary[0]
+        else:
+            frequency = np.nan
+        results.append([reaction.label, log_file, len(imaginary), frequency, center, other,
+                        bool(np.log10(center) > np.log10(other) + 1)])
+
+    return pd.DataFrame(results, columns=[
+        "label", "log_file", "imaginary_count", "imaginary_frequency",
+        "center_change", "other_change", "validated"])
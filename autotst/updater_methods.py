@@ -15,13 +15,15 @@ import re
 import rmgpy
 from rmgpy.quantity import constants
 from rmgpy.kinetics import Arrhenius, ArrheniusEP, KineticsData
-from autotst.database import *
+from autotst.base import *
 from rmgpy.species import Species
 from rmgpy.data.rmg import RMGDatabase
 
 from collections import defaultdict, OrderedDict
 import pandas as pd
 import itertools
+import time
+import scipy.sparse
 
 
 def get_unknown_species(reactions, known_species):
@@ -223,7 +225,7 @@ def update_known_reactions(path, reactions, known_species, method='', shortDesc=
     Returns database object of both old and new reactions, just the old reactions, and just the new reactions
     """
     # Loading reactions database
-    from autotst.database import TransitionStateDepository, DistanceData
+    from autotst.base import TransitionStateDepository, DistanceData
     r_db = TransitionStateDepository()
     local_context = {'DistanceData': DistanceData}
     r_db.load(path, local_context=local_context)
@@ -464,6 +466,48 @@ def save_all_individual_databases(instances):
         database.save_database()
     return
 
+
+def benchmark_TS_Database(instances, folds=5, seed=0):
+    """
+    Expects dict of family:TS_Updater instance, eg. from TS_Database_Update
+
+    Times a full refit of each family's group values and cross-validates it
+    with TS_Updater.cross_validate (leave-one-out if folds is None)
+
+    Returns a DataFrame with a row per family and distance key, with the
+    number of training reactions, the fit times (s), the throughput
+    (training reactions fitted per second) and the cross-validated errors (A)
+    """
+    results = []
+    for family in sorted(instances):
+        updater = instances[family]
+
+        start = time.time()
+        updater.adjust_distances()
+        updater.set_entry_data()
+        fit_time = time.time() - start
+
+        errors, fold_times = updater.cross_validate(folds=folds, seed=seed)
+        for key in errors.columns[1:]:
+            results.append({
+                'family': family,
+                'key': key,
+                'reactions': len(updater.training_set),
+                'folds': len(fold_times),
+                'fit_time': fit_time,
+                'fold_time': numpy.mean(fold_times),
+                'throughput': len(updater.training_set) / fit_time,
+                'mean_absolute_error': errors[key].abs().mean(),
+                'rms_error': numpy.sqrt((errors[key]**2).mean()),
+                'max_error': errors[key].abs().max(),
+            })
+        logging.info("Cross-validated {} over {} folds".format(
+            family, len(fold_times)))
+
+    columns = ['family', 'key', 'reactions', 'folds', 'fit_time', 'fold_time', 'throughput',
+               'mean_absolute_error', 'rms_error', 'max_error']
+    return pd.DataFrame(results, columns=columns)
+
 ######################################################
 
 
@@ -490,8 +534,12 @@ class TS_Updater:
     self.groupUncertainties     : Uncertainty in the optimized TS geometry for that node/entry
     self.groupValues            : Optimized TS geometry for that node/entry
 
-    self.A                      : Binary Matrix of groups involved in specific reaction, is of size (all combinations of those relavent groups for all reactions) by (relavant groups + 1)
+    self.A                      : Sparse (CSR) Binary Matrix of groups involved in specific reaction, is of size (all combinations of those relavent groups for all reactions) by (relavant groups + 1)
     self.b                      : Ax=b, x is unknown, b is distance data and is of size (all combinations of relavent groups for all reactions) by (3 distances)
+    self.node_columns           : Dict organized by {node: its column in A}, the family component is the last column
+    self.T, self.G, self.d      : Sparse (CSR) Binary Matrices, one row per training reaction, of its template groups (T) and of those groups and their ancestors (G), and its distances (d). The residuals are T x - d
+    self.x                      : The fitted group values, one row per column of A
+    self.ci, self.counts        : The confidence interval and number of distances for each column of A
     """
 
     def __init__(self, family, rmg_database, path=None):
@@ -516,7 +564,7 @@ class TS_Updater:
         """
         Loads Database, sets it as class attribute, sets training_set from database
         """
-        from autotst.database import DistanceData, TransitionStateDepository, TSGroups, TransitionStates
+        from autotst.base import DistanceData, TransitionStateDepository, TSGroups, TransitionStates
         ts_database = TransitionStates()
         #path = os.path.join(os.path.expandvars("$RMGpy"), "..", "AutoTST", "database", self.family)
         path = self.path
@@ -563,6 +611,32 @@ class TS_Updater:
         logging.info("Tree size: {}".format(len(all_entries)))
         return
 
+    def get_reaction_template(self, reaction):
+        """
+        Finds the groups (the template) that directly match the reactants of
+        `reaction`, one for each top node
+        """
+        reactant_groups = []  # The groups that represent each reactant - also known as the templat
+
+        for top_node in self.top_nodes:
+
+            for reactant in reaction.reactants:
+                if isinstance(reactant, rmgpy.species.Species):
+                    reactant = reactant.molecule[0]
+
+                atoms = list(reactant.getLabeledAtoms().itervalues())
+                assert atoms is not None
+
+                temp_group = self.database.groups.descendTree(
+                    reactant, atoms, root=top_node)
+                if temp_group is not None:  # Temp_group will only be found using one of the two top_nodes
+                    reactant_group = temp_group
+                    break
+
+            reactant_groups.append(reactant_group)
+
+        return reactant_groups
+
     def set_group_info(self):
         """
         Sets useful group info that is used by further class methods
@@ -574,53 +648,16 @@ class TS_Updater:
         all_reactant_groups = {}
 
         for reaction, distance_data in self.training_set:
-            reactant_groups = []  # The groups that represent each reactant - also known as the templat
-
-            for top_node in self.top_nodes:
-
-                for reactant in reaction.reactants:
-                    if isinstance(reactant, rmgpy.species.Species):
-                        reactant = reactant.molecule[0]
-
-                    atoms = list(reactant.getLabeledAtoms().itervalues())
-                    assert atoms is not None
-
-                    #temp_group = self.database.groups.descendTree(reactant, atoms, root=top_node)
-                    temp_group = self.database.groups.descendTree(
-                        reactant, atoms, root=top_node)
-                    if temp_group is not None:  # Temp_group will only be found using one of the two top_nodes
-                        reactant_group = temp_group
-                        break
-
-                reactant_groups.append(reactant_group)
-                direct_groups.append(reactant_group)
+            reactant_groups = self.get_reaction_template(reaction)
+            direct_groups.extend(reactant_groups)
 
             # storing the templates by reaction
             all_reactant_groups[reaction] = reactant_groups
 
-        direct_groups = list(set(direct_groups))
-        direct_groups.sort(key=lambda x: x.index)
-
-        all_ancestors = {}  # Key is group, value is its itself and all its ancestors
-        for direct_group in direct_groups:
-            ancestors = [direct_group] + \
-                self.database.groups.ancestors(direct_group)
-            for ancestor in ancestors:
-                if ancestor in all_ancestors.keys():
-                    continue
-                else:
-                    all_ancestors[ancestor] = [ancestor] + \
-                        self.database.groups.ancestors(ancestor)
-
-        # We need a list of unique nodes that are directly involved in a reaction or the ancestor of a group that is
-        nodes_to_update = [
-            group for group in all_ancestors if group not in self.top_nodes]
-        nodes_to_update.sort(key=lambda x: x.index)
-
-        # Group info that is needed to simplify following methods
-        self.direct_groups = direct_groups
-        self.nodes_to_update = nodes_to_update
-        self.group_ancestors = all_ancestors
+        self.direct_groups = []
+        self.nodes_to_update = []
+        self.group_ancestors = {}
+        self.add_groups(direct_groups)
         self.reaction_templates = all_reactant_groups
 
         logging.info('Nodes to Update: {}'.format(len(self.nodes_to_update)))
@@ -628,6 +665,33 @@ class TS_Updater:
             len(self.reaction_templates)))
         return
 
+    def add_groups(self, direct_groups):
+        """
+        Adds `direct_groups` and their ancestors to the group info, and returns
+        the nodes that weren't in self.nodes_to_update before
+        """
+        new_nodes = []
+        for direct_group in direct_groups:
+            ancestors = [direct_group] + \
+                self.database.groups.ancestors(direct_group)
+            for ancestor in ancestors:
+                if ancestor in self.group_ancestors:
+                    continue
+                self.group_ancestors[ancestor] = [ancestor] + \
+                    self.database.groups.ancestors(ancestor)
+                # We need a list of unique nodes that are directly involved in a reaction or the ancestor of a group that is
+                if ancestor not in self.top_nodes:
+                    new_nodes.append(ancestor)
+
+        self.direct_groups = list(set(self.direct_groups + direct_groups))
+        self.direct_groups.sort(key=lambda x: x.index)
+        self.nodes_to_update = self.nodes_to_update + new_nodes
+        self.nodes_to_update.sort(key=lambda x: x.index)
+        # Column of each node in A, the family component is the last column
+        self.node_columns = {node: i for i,
+                             node in enumerate(self.nodes_to_update)}
+        return new_nodes
+
     def initialize_entry_attributes(self):
         """
         Attributes of each entry, initializing to size of all_entries
@@ -643,35 +707,19 @@ class TS_Updater:
             self.groupValues[entry] = []
         return
 
-    def adjust_distances(self):
+    def get_rows(self, training_data):
         """
-        Creating A and b of Ax=b, where b is distance data and x are groups involved
-        A is optimized group contributions (found next in self.set_entry_data)
+        Creates the rows of A and b (of Ax=b) for `training_data`, a list of
+        (reaction, distances) like self.training_set. A is a sparse (CSR)
+        matrix, since each row only has a handful of ones.
         """
-        def getAllCombinations(nodeLists):
-            """
-            From base.py:
-            Generate a list of all possible combinations of items in the list of
-            lists `nodeLists`. Each combination takes one item from each list
-            contained within `nodeLists`. The order of items in the returned lists
-            reflects the order of lists in `nodeLists`. For example, if `nodeLists` was
-            [[A, B, C], [N], [X, Y]], the returned combinations would be
-            [[A, N, X], [A, N, Y], [B, N, X], [B, N, Y], [C, N, X], [C, N, Y]].
-            """
-
-            items = [[]]
-            for nodeList in nodeLists:
-                items = [item + [node] for node in nodeList for item in items]
-
-            return items
-        ###################
-
         distance_keys = sorted(self.training_set[0][1].keys())
         # distance_keys are ['d12', 'd13', 'd23']
 
-        A = []
+        rows = []
+        columns = []
         b = []
-        for reaction, distance_data in self.training_set:
+        for reaction, distance_data in training_data:
             template = self.reaction_templates[reaction]
             distances_list = [distance_data[key] for key in distance_keys]
 
@@ -686,20 +734,142 @@ class TS_Updater:
             # rel_comb is just all combinations of reactant1 and its ancestors with reactant2 and its ancestors
 
             for combination in relavent_combinations:
-                Arow = [
-                    1 if group in combination else 0 for group in self.nodes_to_update]
-                Arow.append(1)  # For use in finding the family component
-                # Arow is a binary vector of len(groupList)+1 representing contributing groups to this reaction's distance data
-                A.append(Arow)
-                b.append(distances_list)
+                # The columns of the contributing groups to this reaction's distance data
+                row_columns = set([len(self.nodes_to_update)])  # For use in finding the family component
                 for group in combination:
                     if isinstance(group, str):
                         assert False, "Discrepancy between versions of RMG_Database and this one"
-
+                    if group in self.node_columns:
+                        row_columns.add(self.node_columns[group])
                     self.groupComments[group].add('{0!s}'.format(template))
+                rows.extend([len(b)] * len(row_columns))
+                columns.extend(row_columns)
+                b.append(distances_list)
 
-        self.A = numpy.array(A)
-        self.b = numpy.array(b)
+        A = scipy.sparse.csr_matrix((numpy.ones(len(rows)), (rows, columns)),
+                                    shape=(len(b), len(self.nodes_to_update) + 1))
+        return A, numpy.array(b)
+
+    def get_template_rows(self, training_data):
+        """
+        Creates one row per reaction in `training_data` of the sparse (CSR)
+        matrices used to find the residuals and uncertainties of the fit:
+        the columns of the reaction's template groups (T) and of those groups
+        and their ancestors (G), both with the family component. Also returns
+        the reactions' distances (d), so that the residuals are T x - d.
+        """
+        distance_keys = sorted(self.training_set[0][1].keys())
+        family_column = len(self.nodes_to_update)
+
+        template_rows = []
+        template_columns = []
+        ancestor_rows = []
+        ancestor_columns = []
+        d = []
+        for index, (reaction, distance_data) in enumerate(training_data):
+            for group in self.reaction_templates[reaction]:
+                if group in self.node_columns:
+                    template_rows.append(index)
+                    template_columns.append(self.node_columns[group])
+                for ancestor in self.group_ancestors[group]:
+                    if ancestor in self.node_columns:
+                        ancestor_rows.append(index)
+                        ancestor_columns.append(self.node_columns[ancestor])
+            template_rows.append(index)
+            template_columns.append(family_column)
+            ancestor_rows.append(index)
+            ancestor_columns.append(family_column)
+            d.append([distance_data[key] for key in distance_keys])
+
+        shape = (len(training_data), len(self.nodes_to_update) + 1)
+        T = scipy.sparse.csr_matrix(
+            (numpy.ones(len(template_rows)), (template_rows, template_columns)), shape=shape)
+        G = scipy.sparse.csr_matrix(
+            (numpy.ones(len(ancestor_rows)), (ancestor_rows, ancestor_columns)), shape=shape)
+        return T, G, numpy.array(d, numpy.float64)
+
+    def adjust_distances(self):
+        """
+        Creating A and b of Ax=b, where b is distance data and x are groups involved
+        A is optimized group contributions (found next in self.set_entry_data)
+        """
+        self.A, self.b = self.get_rows(self.training_set)
+        self.T, self.G, self.d = self.get_template_rows(self.training_set)
+        return
+
+    def get_residuals(self):
+        """
+        Returns the difference between the fitted and the training distances
+        for every reaction in the training set, as an array of shape
+        (reactions, distance keys)
+        """
+        return self.T.dot(self.x) - self.d
+
+    def set_uncertainties(self):
+        """
+        Finds the confidence intervals of all the groups from the residuals of
+        the training reactions they appear in
+        """
+        size = len(self.nodes_to_update) + 1
+        self.ci = numpy.zeros((size, self.x.shape[1]))
+
+        variance_sums = self.G.T.dot(self.get_residuals()**2)
+        self.counts = numpy.rint(
+            self.G.T.dot(numpy.ones(self.G.shape[0]))).astype(numpy.int)
+
+        for j, count in enumerate(self.counts):
+            if count > 2:
+                stdev = numpy.sqrt(variance_sums[j] / (count - 1))
+                self.ci[j] = scipy.stats.t.ppf(0.975, count - 1) * stdev
+            else:
+                self.ci[j] = numpy.nan
+        return
+
+    def update_entries(self):
+        """
+        Stores the fitted values (self.x) and confidence intervals (self.ci)
+        on the entries of the tree
+        """
+        distance_keys = sorted(self.training_set[0][1].keys())
+
+        for entry in self.all_entries:
+            if entry == self.top_nodes[0]:
+                index = -1
+            elif entry in self.node_columns:
+                index = self.node_columns[entry]
+            else:
+                self.groupValues[entry] = None
+                self.groupUncertainties[entry] = None
+                self.groupCounts[entry] = None
+                entry.data = DistanceData()
+                entry.longDesc = ''
+                continue
+
+            self.groupValues[entry] = list(self.x[index])
+            self.groupUncertainties[entry] = list(self.ci[index])
+            self.groupCounts[entry] = [self.counts[index]] * len(distance_keys)
+
+            if not any(numpy.isnan(self.ci[index])):
+                # should be entry.data.* (e.g. entry.data.uncertainties)
+                uncertainties = self.ci[index]
+                uncertaintyType = '+|-'
+            else:
+                uncertainties = {}
+            # should be entry.*
+            shortDesc = "Fitted to {0} distances.\n".format(self.counts[index])
+            longDesc = "\n".join(self.groupComments[entry])
+            distances_dict = {key: distance for key, distance in zip(
+                distance_keys, self.x[index])}
+            uncertainties_dict = {key: distance for key, distance in zip(
+                distance_keys, uncertainties)}
+
+            entry.data = DistanceData(
+                distances=distances_dict, uncertainties=uncertainties_dict)
+            entry.shortDesc = shortDesc
+            entry.longDesc = longDesc
+
+        # Estimates made with the old values are out of date
+        self.database.groups.clearDistanceCache()
         return
 
     def set_entry_data(self):
@@ -713,93 +883,122 @@ class TS_Updater:
         Groups M, N, and the family component must add together to get as close to that geometry as possible
         M and N are optimized based off of all reactionas they are involved with, and the family component is optimized over all reactions of that family
         """
-        import scipy.stats
-
-        distance_keys = sorted(self.training_set[0][1].keys())
-        # distance_keys are ['d12', 'd13', 'd23']
-
-        x, residuals, rank, s = numpy.linalg.lstsq(self.A, self.b)
-        for i, distance_key in enumerate(distance_keys):
-            # Determine error in each group
-            variance_sums = numpy.zeros(
-                len(self.nodes_to_update)+1, numpy.float64)
-            stdev = numpy.zeros(len(self.nodes_to_update)+1, numpy.float64)
-            counts = numpy.zeros(len(self.nodes_to_update)+1, numpy.int)
-
-            for reaction, distances in self.training_set:
-                template = self.reaction_templates[reaction]
+        self.x = solveSparseLeastSquares(self.A, self.b)
+        self.set_uncertainties()
+        self.update_entries()
+        logging.info("Finished Updating Entries for {}\n".format(self.family))
+        return
 
-                distances_list = [distances[key] for key in distance_keys]
-                d = numpy.float64(distances_list[i])
-                # dm found by manually summing residuals
-                dm = x[-1, i] + sum([x[self.nodes_to_update.index(group), i]
-                                     for group in template])
+    def add_training_data(self, training_data):
+        """
+        Adds `training_data`, a list of (reaction, distances) like
+        self.training_set, and updates the fit without starting from scratch.
+
+        Only the new reactions are matched to the tree, and their rows are
+        appended to the sparse A and b. LSQR then only solves for the change to
+        the previous fit.
+        The fitted values and confidence intervals of every group are updated,
+        since the new rows can move the fit of any of them.
+        """
+        for reaction, distances in training_data:
+            self.reaction_templates[reaction] = self.get_reaction_template(
+                reaction)
+
+        old_nodes = list(self.nodes_to_update)
+        new_nodes = self.add_groups([group for reaction, distances in training_data
+                                     for group in self.reaction_templates[reaction]])
+        if new_nodes:
+            self.expand_columns(old_nodes)
+
+        A, b = self.get_rows(training_data)
+        self.A = scipy.sparse.vstack([self.A, A]).tocsr()
+        self.b = numpy.vstack([self.b, b])
+        T, G, d = self.get_template_rows(training_data)
+        self.T = scipy.sparse.vstack([self.T, T]).tocsr()
+        self.G = scipy.sparse.vstack([self.G, G]).tocsr()
+        self.d = numpy.vstack([self.d, d])
+        self.training_set.extend(training_data)
+
+        # Start from the previous fit, which the new rows only move a little
+        self.x = solveSparseLeastSquares(self.A, self.b, x0=self.x)
+
+        self.set_uncertainties()
+        self.update_entries()
+
+        logging.info("Added {} reactions ({} new nodes) to {}".format(
+            len(training_data), len(new_nodes), self.family))
+        return
 
-                variance = (dm - d)**2
+    def expand_columns(self, old_nodes):
+        """
+        Makes room in A, T, G and the fitted values for nodes that were added
+        to self.nodes_to_update after `old_nodes`
+        """
+        size = len(self.nodes_to_update) + 1
+        positions = numpy.array(
+            [self.node_columns[node] for node in old_nodes] + [size - 1])
+
+        for attribute in ['A', 'T', 'G']:
+            matrix = getattr(self, attribute).tocoo()
+            setattr(self, attribute, scipy.sparse.csr_matrix(
+                (matrix.data, (matrix.row, positions[matrix.col])),
+                shape=(matrix.shape[0], size)))
+
+        x = numpy.zeros((size, self.x.shape[1]))
+        x[positions] = self.x
+        self.x = x
+        return
 
-                for group in template:
+    def cross_validate(self, folds=5, seed=0):
+        """
+        k-fold cross-validation of the group additivity fit, or leave-one-out
+        if folds is None. The training reactions are shuffled (with `seed`)
+        into folds; each fold is fitted without its reactions, whose distances
+        are then estimated from that fit like estimateDistancesUsingGroupAdditivity
+        does: the family component plus, for each template group, the group
+        or its nearest ancestor that the fold could fit.
+
+        The folds reuse the rows of self.A and self.b instead of rebuilding them.
+        The fitted values of the entries aren't changed.
+
+        Returns a DataFrame with a row per training reaction, with its fold and
+        the estimated minus the training value of each distance key, and the
+        time in seconds that each fold took to fit
+        """
+        distance_keys = sorted(self.training_set[0][1].keys())
+        size = len(self.training_set)
+        if folds is None or folds > size:
+            folds = size
+        reaction_folds = numpy.random.RandomState(seed).permutation(size) % folds
+
+        # get_rows adds one row per combination of the template groups and their ancestors
+        row_counts = [numpy.prod([len(self.group_ancestors[group]) for group in self.reaction_templates[reaction]])
+                      for reaction, distances in self.training_set]
+        row_folds = numpy.repeat(reaction_folds, row_counts)
+        assert len(row_folds) == self.A.shape[0], "A is out of date, call adjust_distances()"
+
+        estimates = numpy.zeros((size, len(distance_keys)))
+        fold_times = []
+        for fold in range(folds):
+            start = time.time()
+            A = self.A[row_folds != fold]
+            x = solveSparseLeastSquares(A, self.b[row_folds != fold])
+            fold_times.append(time.time() - start)
+
+            fitted = numpy.diff(A.tocsc().indptr) > 0
+            for index in numpy.nonzero(reaction_folds == fold)[0]:
+                estimate = x[-1].copy()
+                for group in self.reaction_templates[self.training_set[index][0]]:
                     for ancestor in self.group_ancestors[group]:
-                        if ancestor not in self.top_nodes:
-                            ind = self.nodes_to_update.index(ancestor)
-                            variance_sums[ind] += variance
-                            counts[ind] += 1
-                variance_sums[-1] += variance
-                counts[-1] += 1
-
-            ci = numpy.zeros(len(counts))
-
-            for j, count in enumerate(counts):
-                if count > 2:
-                    stdev[j] = numpy.sqrt(variance_sums[j] / (count - 1))
-                    ci[j] = scipy.stats.t.ppf(0.975, count - 1) * stdev[j]
-                else:
-                    stdev[j] = None
-                    ci[j] = None
-
-            # Update dictionaries of fitted group values and uncertainties
-            for entry in self.all_entries:
-                if entry == self.top_nodes[0]:
-                    self.groupValues[entry].append(x[-1, i])
-                    self.groupUncertainties[entry].append(ci[-1])
-                    self.groupCounts[entry].append(counts[-1])
-                elif entry.label in [group.label for group in self.nodes_to_update]:
-                    index = self.nodes_to_update.index(entry)
-
-                    self.groupValues[entry].append(x[index, i])
-                    self.groupUncertainties[entry].append(ci[index])
-                    self.groupCounts[entry].append(counts[index])
-                else:
-                    self.groupValues[entry] = None
-                    self.groupUncertainties[entry] = None
-                    self.groupCounts[entry] = None
-
-            for entry in self.all_entries:
-                if self.groupValues[entry] is not None:
-                    if not any(numpy.isnan(numpy.array(self.groupUncertainties[entry]))):
-                        # should be entry.data.* (e.g. entry.data.uncertainties)
-                        uncertainties = numpy.array(
-                            self.groupUncertainties[entry])
-                        uncertaintyType = '+|-'
-                    else:
-                        uncertainties = {}
-                    # should be entry.*
-                    shortDesc = "Fitted to {0} distances.\n".format(
-                        self.groupCounts[entry][0])
-                    longDesc = "\n".join(self.groupComments[entry])
-                    distances_dict = {key: distance for key, distance in zip(
-                        distance_keys, self.groupValues[entry])}
-                    uncertainties_dict = {key: distance for key, distance in zip(
-                        distance_keys, uncertainties)}
-
-                    entry.data = DistanceData(
-                        distances=distances_dict, uncertainties=uncertainties_dict)
-                    entry.shortDesc = shortDesc
-                    entry.longDesc = longDesc
-                else:
-                    entry.data = DistanceData()
-                    entry.longDesc = ''
-        logging.info("Finished Updating Entries for {}\n".format(self.family))
-        return
+                        column = self.node_columns.get(ancestor)
+                        if column is not None and fitted[column]:
+                            estimate += x[column]
+                            break
+                estimates[index] = estimate
+
+        errors = pd.DataFrame(estimates - self.d, columns=distance_keys)
+        errors.insert(0, 'fold', reaction_folds)
+        return errors, fold_times
 
     def save_database(self, path=None):
         """
@@ -0,0 +1,175 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+################################################################################
+#
+#   AutoTST - Automated Transition State Theory
+#
+#   Copyright (c) 2015-2018 Prof. Richard H. West (r.west@northeastern.edu)
+#
+#   Permission is hereby granted, free of charge, to any person obtaining a
+#   copy of this software and associated documentation files (the 'Software'),
+#   to deal in the Software without restriction, including without limitation
+#   the rights to use, copy, modify, merge, publish, distribute, sublicense,
+#   and/or sell copies of the Software, and to permit persons to whom the
+#   Software is furnished to do so, subject to the following conditions:
+#
+#   The above copyright notice and this permission notice shall be included in
+#   all copies or substantial portions of the Software.
+#
+#   THE SOFTWARE IS PROVIDED 'AS IS', WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#   IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#   FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#   AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#   LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+#   FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+#   DEALINGS IN THE SOFTWARE.
+#
+################################################################################
+
+
+import unittest
+import numpy
+
+from rmgpy.data.base import Entry
+from autotst.base import DistanceData, TSGroups, TransitionStates
+from autotst.updater_methods import TS_Updater
+
+DISTANCE_KEYS = ['d12', 'd13', 'd23']
+
+
+def make_groups():
+    """
+    Makes a small two-tree TSGroups: each top node has four children, each with
+    three children of their own. Returns the groups and the leaves of each tree.
+    """
+    groups = TSGroups(label='synthetic')
+    leaves = []
+    index = 0
+    for top_label in ['X', 'Y']:
+        top = Entry(index=index, label=top_label, data=DistanceData())
+        groups.entries[top_label] = top
+        groups.top.append(top)
+        index += 1
+        tree_leaves = []
+        for i in range(4):
+            child = Entry(index=index, label='{0}{1}'.format(top_label, i),
+                          parent=top, data=DistanceData())
+            top.children.append(child)
+            groups.entries[child.label] = child
+            index += 1
+            for j in range(3):
+                leaf = Entry(index=index, label='{0}{1}{2}'.format(top_label, i, j),
+                             parent=child, data=DistanceData())
+                child.children.append(leaf)
+                groups.entries[leaf.label] = leaf
+                tree_leaves.append(leaf)
+                index += 1
+        leaves.append(tree_leaves)
+    return groups, leaves
+
+
+def make_training_data(leaves, count, seed):
+    """
+    Makes `count` reactions with a random template from `leaves` and noisy
+    distances. Returns the training data and the template of each reaction.
+    """
+    random = numpy.random.RandomState(seed)
+    training_data = []
+    templates = {}
+    for n in range(count):
+        reaction = 'reaction{0}_{1}'.format(seed, n)
+        templates[reaction] = [tree_leaves[random.randint(len(tree_leaves))]
+                               for tree_leaves in leaves]
+        distances = {key: value for key, value in zip(
+            DISTANCE_KEYS, [1.0, 2.0, 1.5] + random.rand(3))}
+        training_data.append((reaction, distances))
+    return training_data, templates
+
+
+class SyntheticUpdater(TS_Updater):
+    """
+    A TS_Updater of a synthetic tree, which is given the template of each
+    reaction instead of matching the reactants to the tree
+    """
+
+    def __init__(self, groups, training_set, templates):
+        self.family = 'synthetic'
+        self.database = TransitionStates()
+        self.database.groups = groups
+        self.training_set = list(training_set)
+        self.templates = templates
+
+        self.update_indices()
+        self.set_group_info()
+        self.initialize_entry_attributes()
+        self.adjust_distances()
+        self.set_entry_data()
+
+    def get_reaction_template(self, reaction):
+        return self.templates[reaction]
+
+
+class TestTSUpdater(unittest.TestCase):
+
+    def setUp(self):
+        self.groups, self.leaves = make_groups()
+
+    def test_add_training_data(self):
+        "Adding training data should give the same fit as refitting from scratch"
+        first, templates = make_training_data(
+            [tree_leaves[:6] for tree_leaves in self.leaves], 25, seed=0)
+        second, second_templates = make_training_data(self.leaves, 15, seed=1)
+        templates.update(second_templates)
+
+        updater = SyntheticUpdater(self.groups, first, templates)
+        updater.add_training_data(second)
+
+        full_groups, leaves = make_groups()
+        full_templates = {reaction: [full_groups.entries[group.label] for group in template]
+                          for reaction, template in templates.iteritems()}
+        full = SyntheticUpdater(full_groups, first + second, full_templates)
+
+        self.assertEqual([node.label for node in updater.nodes_to_update],
+                         [node.label for node in full.nodes_to_update])
+        self.assertTrue(numpy.allclose(updater.x, full.x, atol=1e-6))
+        self.assertTrue(numpy.allclose(updater.ci, full.ci, atol=1e-6, equal_nan=True))
+        self.assertEqual(list(updater.counts), list(full.counts))
+        for entry in updater.all_entries:
+            full_entry = full_groups.entries[entry.label]
+            self.assertEqual(entry.data.distances.keys(), full_entry.data.distances.keys())
+            for key, distance in entry.data.distances.iteritems():
+                self.assertAlmostEqual(distance, full_entry.data.distances[key], places=6)
+
+    def test_cross_validate(self):
+        "Each fold should be estimated like a fit without its reactions would estimate it"
+        training_data, templates = make_training_data(self.leaves, 30, seed=2)
+        updater = SyntheticUpdater(self.groups, training_data, templates)
+        x = updater.x.copy()
+
+        errors, fold_times = updater.cross_validate(folds=5)
+        self.assertEqual(len(errors), len(training_data))
+        self.assertEqual(sorted(set(errors.fold)), range(5))
+        self.assertEqual(len(fold_times), 5)
+        self.assertFalse(errors[DISTANCE_KEYS].isnull().values.any())
+        self.assertTrue(numpy.array_equal(updater.x, x))
+
+        # Refit without the first fold, and estimate its reactions from the tree
+        in_fold = errors.fold.values == 0
+        groups, leaves = make_groups()
+        refit_templates = {reaction: [groups.entries[group.label] for group in template]
+                           for reaction, template in templates.iteritems()}
+        SyntheticUpdater(groups, [data for data, test in zip(training_data, in_fold) if not test],
+                         refit_templates)
+        for (reaction, distances), test, (index, row) in zip(training_data, in_fold, errors.iterrows()):
+            if not test:
+                continue
+            estimate = groups.estimateDistancesForTemplate(
+                [group.label for group in templates[reaction]])
+            for key in DISTANCE_KEYS:
+                self.assertAlmostEqual(
+                    estimate.distances[key] - distances[key], row[key], places=6)
+
+
+if __name__ == "__main__":
+    unittest.main(testRunner=unittest.TextTestRunner(verbosity=2))
@@ -0,0 +1,251 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+################################################################################
+#
+#   AutoTST - Automated Transition State Theory
+#
+#   Copyright (c) 2015-2018 Prof. Richard H. West (r.west@northeastern.edu)
+#
+#   Permission is hereby granted, free of charge, to any person obtaining a
+#   copy of this software and associated documentation files (the 'Software'),
+#   to deal in the Software without restriction, including without limitation
+#   the rights to use, copy, modify, merge, publish, distribute, sublicense,
+#   and/or sell copies of the Software, and to permit persons to whom the
+#   Software is furnished to do so, subject to the following conditions:
+#
+#   The above copyright notice and this permission notice shall be included in
+#   all copies or substantial portions of the Software.
+#
+#   THE SOFTWARE IS PROVIDED 'AS IS', WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#   IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#   FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#   AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#   LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+#   FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+#   DEALINGS IN THE SOFTWARE.
+#
+################################################################################
+
+"""
+Functions to push reactions through the whole AutoTST workflow: reading any
+cached kinetics, the Gaussian optimizations, CanTherm and saving the kinetics.
+
+`run_reaction` does this for a single reaction, exactly like
+`examples/.../gaussian_example.py`. `submit_reaction` runs it in the
+background and `run_reactions` drives a whole mechanism from one process,
+with a global limit on the number of Gaussian jobs running at once and one
+batch of CanTherm kinetics at the end.
+`export_kinetics` writes the results for a batch out to a single table.
+"""
+
+import logging
+import threading
+import multiprocessing
+from multiprocessing.pool import ThreadPool
+
+from autotst.calculators.gaussian import AutoTST_Gaussian, set_max_jobs
+from autotst.calculators.cantherm import AutoTST_CanTherm, run_kinetics_batch
+from autotst.calculators.registry import SpeciesRegistry
+from autotst.calculators.calculator import get_reaction_key
+from autotst.calculators.result_store import get_result_store
+
+_pool = None
+_pool_workers = None
+_pool_lock = threading.Lock()
+
+
+def run_calculations(reaction,
+                     scratch=".",
+                     save_directory=".",
+                     cache_directory=None,
+                     registry=None,
+                     vibrational_analysis=False,
+                     hindered_rotors=False,
+                     **kwargs):
+    """
+    A function that runs the Gaussian stage of AutoTST for a reaction, unless
+    kinetics have already been saved for it.
+
+    :params:
+    reaction: (AutoTST_Reaction) The reaction of interest
+    scratch: (str) The directory to use for the calculations
+    save_directory: (str) The directory where kinetics are saved
+    cache_directory: (str) A result cache shared between reactions
+    registry: (SpeciesRegistry) A registry shared between reactions
+    vibrational_analysis: (bool) Use vibrational analysis instead of an IRC
+    hindered_rotors: (bool) Also run the hindered rotor scans, which CanTherm
+    then picks up
+    kwargs: any other arguments (eg. mem, nprocshared, method, basis) for
+    AutoTST_Gaussian
+
+    :returns:
+    tst_calculators: (AutoTST_Gaussian) The finished calculators, or None if
+    the calculations failed
+    kinetics: (rmgpy.reaction.Reaction) The saved kinetics, or None
+    """
+    tst_calculators = AutoTST_Gaussian(reaction,
+                                       scratch=scratch,
+                                       save_directory=save_directory,
+                                       cache_directory=cache_directory,
+                                       registry=registry,
+                                       **kwargs)
+
+    kinetics = tst_calculators.read_kinetics_file()
+    if kinetics:
+        logging.info("We have previously loaded kinetics for {}:".format(reaction))
+        logging.info("{0!r}".format(kinetics['reaction']))
+        return tst_calculators, kinetics['reaction']
+
+    gaussian_results = tst_calculators.run_all(
+        vibrational_analysis=vibrational_analysis)
+    if not gaussian_results:
+        logging.info("Failed gaussian for {}... :(".format(reaction))
+        return None, None
+
+    if hindered_rotors:
+        failures = tst_calculators.run_hindered_rotors()
+        for path, reason in failures.iteritems():
+            logging.info("Leaving the rotor scan {0} out of CanTherm: {1}".format(path, reason))
+
+    return tst_calculators, None
+
+
+def run_reaction(reaction, scratch=".", **kwargs):
+    """
+    A function that runs every stage of AutoTST for a reaction and returns the
+    kinetics, or None if the reaction failed.
+
+    :params:
+    reaction: (AutoTST_Reaction) The reaction of interest
+    scratch: (str) The directory to use for the calculations
+    kwargs: any other arguments for `run_calculations`
+
+    :returns:
+    kinetics: (rmgpy.reaction.Reaction) The reaction with its kinetics
+    """
+    tst_calculators, kinetics = run_calculations(
+        reaction, scratch=scratch, **kwargs)
+    if kinetics or not tst_calculators:
+        return kinetics
+
+    cantherm = AutoTST_CanTherm(
+        tst_calculators.reaction, scratch=scratch, output_directory=scratch)
+    cantherm.calculate_kinetics()
+    cantherm.set_reactants_and_products()
+
+    logging.info("The kinetics of intrest are as follows:")
+    logging.info("{0!r}".format(cantherm.kinetics_job.reaction))
+
+    tst_calculators.save_kinetics(
+        tst_calculators.method, cantherm.kinetics_job.reaction)
+
+    return cantherm.kinetics_job.reaction
+
+
+def get_pool(max_workers=None):
+    """
+    Returns the thread pool that reactions are run on, creating it with
+    `max_workers` threads (one per CPU if None) the first time it is needed.
+    Asking for a different number of threads replaces the pool with a new
+    one; reactions already submitted to the old pool still finish.
+    """
+    global _pool, _pool_workers
+    with _pool_lock:
+        if _pool is not None and max_workers and max_workers != _pool_workers:
+            logging.info("Replacing the pool of {0} threads with one of {1}".format(
+                _pool_workers, max_workers))
+            _pool.close()
+            _pool = None
+        if _pool is None:
+            _pool = ThreadPool(max_workers)
+            _pool_workers = max_workers or multiprocessing.cpu_count()
+        return _pool
+
+
+def get_default_max_jobs(nprocshared=20):
+    """
+    Returns how many Gaussian jobs with `nprocshared` processors each fit on
+    the CPUs of this machine at once, and at least one.
+    """
+    return max(1, multiprocessing.cpu_count() // nprocshared)
+
+
+def submit_reaction(reaction, **kwargs):
+    """
+    A function that starts `run_reaction` for `reaction` in the background.
+    Returns an AsyncResult; call `.get()` on it to wait for the kinetics.
+    """
+    return get_pool().apply_async(run_reaction, (reaction,), kwargs)
+
+
+def run_reactions(reactions, max_workers=None, max_jobs=None, processes=None, **kwargs):
+    """
+    A function that runs every reaction in `reactions` and returns a
+    dictionary of their kinetics, keyed by reaction label.
+
+    The Gaussian calculations for all the reactions run concurrently, and share
+    a SpeciesRegistry (unless one is passed in) so each reactant and product is
+    only calculated once. CanTherm is then run for all of the reactions as one
+    batch, so the statmech of shared species is also only worked out once.
+
+    :params:
+    reactions: (list) The AutoTST_Reactions of interest
+    max_workers: (int) The number of reactions to work on at once
+    max_jobs: (int) The number of Gaussian jobs allowed to run at once, by
+    default as many as fit on the CPUs (see `get_default_max_jobs`)
+    processes: (int) The number of processes used to calculate kinetics
+    kwargs: any other arguments for `run_calculations`
+    """
+    if not max_jobs:
+        max_jobs = get_default_max_jobs(kwargs.get("nprocshared", 20))
+    set_max_jobs(max_jobs)
+    if kwargs.get("registry") is None:
+        kwargs["registry"] = SpeciesRegistry()
+
+    pool = get_pool(max_workers)
+    results = [(reaction, pool.apply_async(run_calculations, (reaction,), kwargs))
+               for reaction in reactions]
+
+    kinetics = {}
+    calculators = []
+    for reaction, result in results:
+        try:
+            tst_calculators, kinetics[reaction.label] = result.get()
+        except Exception as e:
+            logging.error("{} failed:".format(reaction))
+            logging.exception(e)
+            kinetics[reaction.label] = None
+            continue
+        if tst_calculators and not kinetics[reaction.label]:
+            calculators.append(tst_calculators)
+
+    scratch = kwargs.get("scratch", ".")
+    cantherms = run_kinetics_batch([tst_calculators.reaction for tst_calculators in calculators],
+                                   processes=processes,
+                                   scratch=scratch,
+                                   output_directory=scratch)
+
+    for tst_calculators in calculators:
+        cantherm = cantherms.get(tst_calculators.reaction.label)
+        if cantherm is None:
+            continue
+        tst_calculators.save_kinetics(
+            tst_calculators.method, cantherm.kinetics_job.reaction)
+        kinetics[tst_calculators.reaction.label] = cantherm.kinetics_job.reaction
+
+    return kinetics
+
+
+def export_kinetics(reactions, path, save_directory="."):
+    """
+    A function that writes the saved kinetics of every reaction in `reactions`
+    to a single table at `path`, and returns the number of reactions written.
+
+    :params:
+    reactions: (list) The AutoTST_Reactions of interest
+    path: (str) The file to write the table to
+    save_directory: (str) The directory where kinetics were saved
+    """
+    keys = [get_reaction_key(reaction.label) for reaction in reactions]
+    return get_result_store(save_directory).export_kinetics(path, keys=keys)
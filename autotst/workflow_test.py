@@ -0,0 +1,57 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+################################################################################
+#
+#   AutoTST - Automated Transition State Theory
+#
+#   Copyright (c) 2015-2018 Prof. Richard H. West (r.west@northeastern.edu)
+#
+#   Permission is hereby granted, free of charge, to any person obtaining a
+#   copy of this software and associated documentation files (the 'Software'),
+#   to deal in the Software without restriction, including without limitation
+#   the rights to use, copy, modify, merge, publish, distribute, sublicense,
+#   and/or sell copies of the Software, and to permit persons to whom the
+#   Software is furnished to do so, subject to the following conditions:
+#
+#   The above copyright notice and this permission notice shall be included in
+#   all copies or substantial portions of the Software.
+#
+#   THE SOFTWARE IS PROVIDED 'AS IS', WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#   IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#   FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#   AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#   LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+#   FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+#   DEALINGS IN THE SOFTWARE.
+#
+################################################################################
+
+
+import unittest
+import multiprocessing
+
+from autotst.workflow import get_pool, get_default_max_jobs
+
+
+class TestWorkflow(unittest.TestCase):
+
+    def test_get_pool(self):
+        "The pool should be reused unless a different number of threads is asked for"
+        pool = get_pool(2)
+        self.assertIs(get_pool(2), pool)
+        self.assertIs(get_pool(), pool)
+
+        other = get_pool(3)
+        self.assertIsNot(other, pool)
+        self.assertEqual(len(other._pool), 3)
+        self.assertEqual(other.apply_async(sum, ([1, 2],)).get(), 3)
+
+    def test_default_max_jobs(self):
+        "The default job limit should fit the jobs on the CPUs, and never be zero"
+        self.assertEqual(get_default_max_jobs(1), multiprocessing.cpu_count())
+        self.assertEqual(get_default_max_jobs(multiprocessing.cpu_count() + 1), 1)
+
+
+if __name__ == "__main__":
+    unittest.main(testRunner=unittest.TextTestRunner(verbosity=2))